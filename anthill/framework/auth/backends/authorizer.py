@@ -21,6 +21,7 @@ from anthill.framework.auth.backends.exceptions import UnauthorizedException
 from .abcs import (
     BasePermission, BasePermissionVerifier, BaseAuthorizer, BaseAuthorizingRealm)
 import itertools
+import functools
 import logging
 import json
 import collections
@@ -86,9 +87,17 @@ class Permission(BasePermission):
             except StopIteration:
                 raise ValueError("Permission cannot identify required parts from string")
         else:
+            # Storage returns parts as `action` and `target` lists
             self.domain = {parts.get('domain', self.WILDCARD_TOKEN)}
-            self.actions = set(parts.get('actions', self.WILDCARD_TOKEN))
-            self.targets = set(parts.get('targets', self.WILDCARD_TOKEN))
+            self.actions = self._part(parts, 'actions', 'action')
+            self.targets = self._part(parts, 'targets', 'target')
+
+    def _part(self, parts, *names):
+        for name in names:
+            value = parts.get(name)
+            if value:
+                return {value} if isinstance(value, str) else set(value)
+        return {self.WILDCARD_TOKEN}
 
     def partify(self, wildcard_perm):
         return [set(a.strip() for a in y.split(self.SUBPART_DIVIDER_TOKEN))
@@ -108,7 +117,7 @@ class Permission(BasePermission):
                 return False
 
         if self.targets != {self.WILDCARD_TOKEN}:
-            if not self.actions >= permission.actions:
+            if not self.targets >= permission.targets:
                 return False
 
         return True
@@ -121,7 +130,79 @@ class Permission(BasePermission):
         return domain
 
 
+@functools.lru_cache(maxsize=1024)
+def parse_permission(wildcard_perm):
+    """
+    Returns tuple of domain, actions and targets of permission string.
+    Results are cached, because the same permissions are checked again and again.
+    """
+    perm = Permission(wildcard_perm=wildcard_perm)
+    return next(iter(perm.domain)), frozenset(perm.actions), frozenset(perm.targets)
+
+
+class CompiledPermissions:
+    """
+    Set of assigned permissions compiled to a trie of
+    domain -> action -> targets with wildcards support.
+
+    Required permission is permitted if every its action on every target
+    is granted by some of assigned permissions.
+    """
+    WILDCARD_TOKEN = Permission.WILDCARD_TOKEN
+
+    def __init__(self):
+        self._trie = {}
+
+    def __len__(self):
+        return sum(len(targets) for actions in self._trie.values()
+                   for targets in actions.values())
+
+    def add(self, permission):
+        for domain in permission.domain:
+            actions = self._trie.setdefault(domain, {})
+            for action in permission.actions:
+                actions.setdefault(action, set()).update(permission.targets)
+
+    def _is_granted(self, domain, action, target):
+        wildcard = self.WILDCARD_TOKEN
+        for d in (domain, wildcard):
+            actions = self._trie.get(d)
+            if not actions:
+                continue
+            for a in (action, wildcard):
+                targets = actions.get(a)
+                if targets and (wildcard in targets or target in targets):
+                    return True
+        return False
+
+    def implies(self, wildcard_perm):
+        domain, actions, targets = parse_permission(wildcard_perm)
+        return all(self._is_granted(domain, action, target)
+                   for action in actions for target in targets)
+
+
 class DefaultPermissionVerifier(BasePermissionVerifier):
+    # noinspection PyMethodMayBeStatic
+    def compile(self, serialized_perms):
+        """
+        Compiles permissions from the json blobs of permission parts.
+        :type serialized_perms: list of json blobs
+        :returns: CompiledPermissions
+        """
+        compiled = CompiledPermissions()
+        for blob in serialized_perms:
+            if not blob:
+                continue
+            if isinstance(blob, bytes):
+                blob = blob.decode('utf-8')
+            for parts in json.loads(blob):
+                compiled.add(Permission(parts=parts))
+        return compiled
+
+    # noinspection PyMethodMayBeStatic
+    def is_permitted_from_compiled(self, required, compiled):
+        return compiled.implies(required)
+
     def is_permitted_from_str(self, required, assigned):
         required_perm = Permission(wildcard_perm=required)
         for perm_str in assigned:
@@ -132,7 +213,9 @@ class DefaultPermissionVerifier(BasePermissionVerifier):
 
     def is_permitted_from_json(self, required, assigned):
         required = Permission(wildcard_perm=required)
-        the_parts = json.loads(assigned.decode('utf-8'))
+        if isinstance(assigned, bytes):
+            assigned = assigned.decode('utf-8')
+        the_parts = json.loads(assigned)
         for parts in the_parts:
             assigned_perm = Permission(parts=parts)
             if assigned_perm.implies(required):
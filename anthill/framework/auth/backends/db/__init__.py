@@ -3,7 +3,8 @@ from anthill.framework.auth.backends.authorizer import DefaultAuthorizer
 from anthill.framework.auth.backends.realm import DatastoreRealm
 from anthill.framework.auth.backends.db.storage import AlchemyStore
 from anthill.framework.core.exceptions import ObjectDoesNotExist
-from anthill.framework.utils.asynchronous import as_future
+from anthill.framework.auth.hashers import amake_password
+from anthill.framework.utils.asynchronous import as_future, thread_pool_exec
 
 
 UserModel = get_user_model()
@@ -37,17 +38,16 @@ class ModelBackend(BaseModelBackend):
     """Authenticates against settings.AUTH_USER_MODEL."""
     datastore_class = AlchemyStore
 
-    @as_future
-    def authenticate(self, request, username=None, password=None, **kwargs):
+    async def authenticate(self, request, username=None, password=None, **kwargs):
         if username is None:
             username = kwargs.get(UserModel.USERNAME_FIELD)
-        user = UserModel.query.filter_by(username=username).first()
+        user = await thread_pool_exec(UserModel.query.filter_by(username=username).first)
         if user is None:
             # Run the default password hasher once to reduce the timing
             # difference between an existing and a nonexistent user.
-            UserModel(username=None, email=None).set_password(password)
+            await amake_password(password)
         else:
-            if user.check_password(password) and self.can_authenticate(user):
+            if await user.acheck_password(password) and self.can_authenticate(user):
                 return user
 
     # noinspection PyMethodMayBeStatic
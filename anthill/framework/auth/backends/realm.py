@@ -15,19 +15,98 @@ specific language governing permissions and limitations
 under the License.
 """
 
-from anthill.framework.auth.backends.authorizer import DefaultPermissionVerifier, Permission
+from anthill.framework.auth.backends.authorizer import DefaultPermissionVerifier
 from anthill.framework.auth.backends.db.storage import AlchemyStore
+from anthill.framework.auth.backends.db.models import (
+    UserMixin, Role, Permission, Domain, Action, Resource)
 from anthill.framework.core.cache import cache
+from anthill.framework.utils.datastructures import LRUCache
 from .abcs import BaseAuthorizingRealm
+from collections import namedtuple
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
 from uuid import uuid4
+import itertools
 import logging
 import functools
+import threading
+import time
 
 
 logger = logging.getLogger('anthill.application')
 
 
 DEFAULT_CACHE_TIMEOUT = 300  # 5min
+# How often compiled authorization info is checked to be up to date.
+DEFAULT_VERSION_CHECK_INTERVAL = 30
+AUTHORIZATION_VERSION_KEY = 'anthill.framework.auth.authorization.version'
+
+AuthorizationInfo = namedtuple('AuthorizationInfo', ['version', 'roles', 'permissions'])
+
+
+def _version_keys(identifier):
+    # Global version is changed with roles and permissions,
+    # identifier version is changed explicitly.
+    return [AUTHORIZATION_VERSION_KEY, ':'.join([AUTHORIZATION_VERSION_KEY, identifier])]
+
+
+def get_authorization_version(identifier):
+    """
+    Version of authorization info of the identifier is shared between
+    processes and changes every time roles or permissions are changed.
+    """
+    keys = _version_keys(identifier)
+    versions = cache.get_many(keys)
+    return '.'.join(str(versions.get(key, 0)) for key in keys)
+
+
+def invalidate_authorization_info(identifiers=None):
+    """
+    Changes authorization version of the identifiers, or of all of them
+    if identifiers are not given. Compiled authorization info is rebuilt
+    in all processes within `DEFAULT_VERSION_CHECK_INTERVAL`.
+    """
+    if identifiers is None:
+        keys = [AUTHORIZATION_VERSION_KEY]
+    else:
+        keys = [_version_keys(identifier)[1] for identifier in identifiers]
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+_AUTHORIZATION_MODELS = (Role, Permission, Domain, Action, Resource)
+
+
+def _is_authorization_changed(session):
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _AUTHORIZATION_MODELS):
+            return True
+        if isinstance(obj, UserMixin) and sa_inspect(obj).attrs.roles.history.has_changes():
+            return True
+    return False
+
+
+@event.listens_for(Session, 'after_flush')
+def _authorization_after_flush(session, flush_context):
+    if _is_authorization_changed(session):
+        session.info['authorization_changed'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _authorization_after_commit(session):
+    # Version is changed only after commit, so other processes
+    # don't rebuild authorization info from uncommitted data.
+    if session.info.pop('authorization_changed', False):
+        invalidate_authorization_info()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _authorization_after_rollback(session, previous_transaction):
+    if not session.is_active:
+        session.info.pop('authorization_changed', None)
 
 
 def cached(key, timeout=DEFAULT_CACHE_TIMEOUT):
@@ -51,27 +130,84 @@ class DatastoreRealm(BaseAuthorizingRealm):
     def __init__(self,
                  name='datastore_realm_' + str(uuid4()),
                  storage=AlchemyStore(),
-                 permission_verifier=DefaultPermissionVerifier()):
+                 permission_verifier=DefaultPermissionVerifier(),
+                 version_check_interval=DEFAULT_VERSION_CHECK_INTERVAL,
+                 max_compiled=10000):
         self.name = name
         self.storage = storage
         self.permission_verifier = permission_verifier
+        self.version_check_interval = version_check_interval
+        # identifier -> (AuthorizationInfo, time of the last version check)
+        self._compiled = LRUCache(max_size=max_compiled, timeout=DEFAULT_CACHE_TIMEOUT)
+        self._compiled_lock = threading.Lock()
+
+    def get_authorization_version(self, identifier):
+        if not self.storage.allow_caching:
+            return None
+        return get_authorization_version(identifier)
 
     def clear_cached_authorization_info(self, identifiers):
-        pass
+        """
+        Should be called when roles or permissions of identifiers are changed.
+        Compiled info is rebuilt in all processes within `version_check_interval`.
+        """
+        identifiers = list(identifiers)
+        for identifier in identifiers:
+            with self._compiled_lock:
+                self._compiled.delete(identifier)
+        if self.storage.allow_caching:
+            invalidate_authorization_info(identifiers)
 
     def do_clear_cache(self, identifiers):
         """
         :type identifiers: SimpleRealmCollection
         """
-        pass
+        self.clear_cached_authorization_info(identifiers)
 
-    def get_authzd_permissions(self, identifier, perm_domain):
+    def get_authorization_info(self, identifier):
         """
-        :type identifier: str
-        :type perm_domain: str
-        :returns: a list of relevant json blobs, each a list of permission dicts
+        Returns roles and compiled permissions of the identifier.
+        They are built once per version of authorization info.
         """
-        cache_key = ':'.join([self.name, 'authorization', 'permissions', identifier])
+        now = time.monotonic()
+        with self._compiled_lock:
+            cached_info = self._compiled.get(identifier)
+        if cached_info is not None:
+            info, checked_at = cached_info
+            if now - checked_at < self.version_check_interval:
+                return info
+            if info.version is not None and info.version == self.get_authorization_version(identifier):
+                with self._compiled_lock:
+                    self._compiled.set(identifier, (info, now))
+                return info
+
+        version = self.get_authorization_version(identifier)
+        try:
+            permissions = self._query_permissions(identifier, version)
+        except ValueError:
+            permissions = {}
+        try:
+            roles = self._query_roles(identifier, version)
+        except ValueError:
+            roles = []
+        info = AuthorizationInfo(
+            version=version,
+            roles=frozenset(roles),
+            permissions=self.permission_verifier.compile(permissions.values()))
+        with self._compiled_lock:
+            self._compiled.set(identifier, (info, now))
+        return info
+
+    def _cache_key(self, kind, identifier, version):
+        return ':'.join([self.name, 'authorization', kind, identifier, str(version)])
+
+    def _query_permissions(self, identifier, version=None):
+        """
+        :returns: a dict: {'domain': json blob of lists of dicts}
+        """
+        if version is None:
+            version = self.get_authorization_version(identifier)
+        cache_key = self._cache_key('permissions', identifier, version)
 
         def query_permissions(self_):
             msg = ("Could not obtain cached permissions for [{0}]. "
@@ -87,8 +223,16 @@ class DatastoreRealm(BaseAuthorizingRealm):
             return permissions
 
         if self.storage.allow_caching:
-            query_permissions = cached(cache_key, timeout=300)(query_permissions)
-        queried_permissions = query_permissions(self)
+            query_permissions = cached(cache_key, timeout=DEFAULT_CACHE_TIMEOUT)(query_permissions)
+        return query_permissions(self)
+
+    def get_authzd_permissions(self, identifier, perm_domain):
+        """
+        :type identifier: str
+        :type perm_domain: str
+        :returns: a list of relevant json blobs, each a list of permission dicts
+        """
+        queried_permissions = self._query_permissions(identifier)
 
         related_perms = [
             queried_permissions.get('*'),
@@ -97,8 +241,10 @@ class DatastoreRealm(BaseAuthorizingRealm):
 
         return related_perms
 
-    def get_authzd_roles(self, identifier):
-        cache_key = ':'.join([self.name, 'authorization', 'roles', identifier])
+    def _query_roles(self, identifier, version=None):
+        if version is None:
+            version = self.get_authorization_version(identifier)
+        cache_key = self._cache_key('roles', identifier, version)
 
         def query_roles(self_):
             msg = ("Could not obtain cached roles for [{0}]. "
@@ -113,10 +259,11 @@ class DatastoreRealm(BaseAuthorizingRealm):
             return roles_
 
         if self.storage.allow_caching:
-            query_roles = cached(cache_key, timeout=300)(query_roles)
-        roles = query_roles(self)
+            query_roles = cached(cache_key, timeout=DEFAULT_CACHE_TIMEOUT)(query_roles)
+        return query_roles(self)
 
-        return set(roles)
+    def get_authzd_roles(self, identifier):
+        return set(self._query_roles(identifier))
 
     def is_permitted(self, identifier, permission_s):
         """
@@ -129,16 +276,11 @@ class DatastoreRealm(BaseAuthorizingRealm):
         :type permission_s: list of string(s)
         :yields: tuple(Permission, Boolean)
         """
-        for required in permission_s:
-            domain = Permission.get_domain(required)
+        compiled = self.get_authorization_info(identifier).permissions
 
-            # assigned is a list of json blobs:
-            assigned = self.get_authzd_permissions(identifier, domain)
-
-            is_permitted = False
-            for perms_blob in assigned:
-                is_permitted = self.permission_verifier.\
-                    is_permitted_from_json(required, perms_blob)
+        for required in permission_s:
+            is_permitted = self.permission_verifier.\
+                is_permitted_from_compiled(required, compiled)
 
             yield (required, is_permitted)
 
@@ -153,7 +295,7 @@ class DatastoreRealm(BaseAuthorizingRealm):
         :yields: tuple(role, Boolean)
         """
         # assigned_role_s is a set
-        assigned_role_s = self.get_authzd_roles(identifier)
+        assigned_role_s = self.get_authorization_info(identifier).roles
 
         if not assigned_role_s:
             logger.warning(
@@ -2,10 +2,13 @@ from anthill.framework.db import db
 from anthill.framework.utils import timezone
 from anthill.framework.utils.crypto import salted_hmac
 from anthill.framework.auth import password_validation
-from anthill.framework.auth.hashers import make_password, check_password
+from anthill.framework.auth.hashers import (
+    make_password, check_password, amake_password, acheck_password)
+from anthill.framework.utils.asynchronous import thread_pool_exec
 from anthill.framework.auth.backends.db.models import UserMixin
 from anthill.framework.core.mail.asynchronous import send_mail
 from sqlalchemy_utils.types import EmailType, PhoneNumberType
+from sqlalchemy import inspect as sa_inspect
 
 
 class BaseAbstractUser(db.Model):
@@ -64,8 +67,40 @@ class BaseAbstractUser(db.Model):
 
         return check_password(raw_password, self.password, setter=setter)
 
+    async def aset_password(self, raw_password):
+        self.password = await amake_password(raw_password)
+        self._password = raw_password
+
+    async def acheck_password(self, raw_password):
+        """
+        Asynchronous version of `check_password`.
+        Password is checked in the password hashing pool.
+        """
+
+        async def setter(raw_password):
+            await self.aset_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            await thread_pool_exec(self.save)
+
+        return await acheck_password(raw_password, self.password, setter=setter)
+
+    # Changes of these fields revoke cached authentication of the user.
+    REVOKE_AUTH_FIELDS = ('password', 'is_active')
+
+    def _is_auth_changed(self):
+        state = sa_inspect(self)
+        if state.transient or state.pending:
+            return False
+        return any(state.attrs[name].history.has_changes()
+                   for name in self.REVOKE_AUTH_FIELDS if name in state.attrs)
+
     def save(self, *args, **kwargs):
+        from anthill.framework.auth.token.jwt.cache import revoke_user_threadsafe
+        auth_changed = self._is_auth_changed()
         super().save(*args, **kwargs)
+        if auth_changed:
+            revoke_user_threadsafe(self.get_username())
         if self._password is not None:
             password_validation.password_changed(self._password, self)
             self._password = None
@@ -13,6 +13,7 @@ from anthill.framework.handlers.base import (
 from anthill.framework.handlers.edit import FormHandler
 from anthill.framework.auth.forms import AuthenticationForm
 from anthill.framework.auth.models import AnonymousUser
+from anthill.framework.auth.token.jwt.cache import revoke_user
 from anthill.framework.auth.log import get_user_logger, ApplicationLogger
 from anthill.framework.conf import settings
 
@@ -34,6 +35,7 @@ class UserHandlerMixin:
         Return the user model instance associated with the given session.
         If no user is retrieved, return an instance of `AnonymousUser`.
         """
+        await self.aload_session()
         user = None
         try:
             user_id = _get_user_session_key(self)
@@ -115,6 +117,7 @@ class LoginHandlerMixin:
 class LogoutHandlerMixin:
     async def logout(self):
         if not isinstance(self.current_user, (AnonymousUser, type(None))):
+            await revoke_user(self.current_user.get_username())
             self.session.flush()
             # noinspection PyAttributeOutsideInit
             self.current_user = AnonymousUser()
@@ -1,10 +1,18 @@
 import base64
 import binascii
+import copy
 import functools
 import hashlib
 import importlib
+import inspect
+import math
+import time
 import warnings
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from tornado.ioloop import IOLoop
+from tornado.process import cpu_count
 
 from anthill.framework.conf import settings
 from anthill.framework.core.exceptions import ImproperlyConfigured
@@ -39,6 +47,18 @@ def check_password(password, encoded, setter=None, preferred='default'):
     if password is None or not is_password_usable(encoded):
         return False
 
+    is_correct, must_update = _verify_password(password, encoded, preferred)
+
+    if setter and is_correct and must_update:
+        setter(password)
+    return is_correct
+
+
+def _verify_password(password, encoded, preferred='default'):
+    """
+    Return tuple of whether the raw password matches the encoded one
+    and whether the encoded password must be updated.
+    """
     preferred = get_hasher(preferred)
     hasher = identify_hasher(encoded)
 
@@ -53,9 +73,7 @@ def check_password(password, encoded, setter=None, preferred='default'):
     if not is_correct and not hasher_changed and must_update:
         hasher.harden_runtime(password, encoded)
 
-    if setter and is_correct and must_update:
-        setter(password)
-    return is_correct
+    return is_correct, must_update
 
 
 def make_password(password, salt=None, hasher='default'):
@@ -74,6 +92,135 @@ def make_password(password, salt=None, hasher='default'):
     return hasher.encode(password, salt)
 
 
+class PasswordHashingBusy(Exception):
+    """Raised when password hashing queue is full."""
+
+
+class PasswordHashingPool:
+    """
+    Dedicated pool for password hashing.
+
+    Hashing is slow by design, so it doesn't share workers with
+    `ThreadPoolExecution` and the number of pending jobs is limited:
+    when `max_queue_size` jobs are waiting for a worker,
+    new ones are rejected with `PasswordHashingBusy`.
+    """
+
+    def __init__(self, max_workers=None, max_queue_size=None, use_processes=None):
+        self._max_workers = max_workers
+        self._max_queue_size = max_queue_size
+        self._use_processes = use_processes
+        self._executor = None
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @property
+    def max_workers(self):
+        if self._max_workers is None:
+            return getattr(settings, 'PASSWORD_HASHING_WORKERS', None) or cpu_count() or 1
+        return self._max_workers
+
+    @property
+    def max_queue_size(self):
+        if self._max_queue_size is None:
+            return getattr(settings, 'PASSWORD_HASHING_QUEUE_SIZE', 100)
+        return self._max_queue_size
+
+    @property
+    def use_processes(self):
+        if self._use_processes is None:
+            return getattr(settings, 'PASSWORD_HASHING_PROCESSES', False)
+        return self._use_processes
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._executor = executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    @property
+    def queue_size(self):
+        """Number of jobs waiting for a free worker."""
+        return max(0, self.pending - self.max_workers)
+
+    async def submit(self, func, *args):
+        if self.max_queue_size and self.queue_size >= self.max_queue_size:
+            self.rejected += 1
+            raise PasswordHashingBusy('Password hashing queue is full')
+        self.pending += 1
+        self.submitted += 1
+        start = time.monotonic()
+        try:
+            result = await IOLoop.current().run_in_executor(self.executor, func, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self.pending -= 1
+            elapsed = time.monotonic() - start
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+
+    def metrics(self):
+        finished = self.completed + self.failed
+        return {
+            'workers': self.max_workers,
+            'pending': self.pending,
+            'queue_size': self.queue_size,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'avg_time': self.total_time / finished if finished else 0.0,
+            'max_time': self.max_time,
+        }
+
+
+hashing_pool = PasswordHashingPool()
+
+
+async def acheck_password(password, encoded, setter=None, preferred='default'):
+    """
+    Asynchronous version of `check_password`.
+    Password is checked in the password hashing pool, setter may be a coroutine.
+    """
+    if password is None or not is_password_usable(encoded):
+        return False
+
+    is_correct, must_update = await hashing_pool.submit(
+        _verify_password, password, encoded, preferred)
+
+    if setter and is_correct and must_update:
+        result = setter(password)
+        if inspect.isawaitable(result):
+            await result
+    return is_correct
+
+
+async def amake_password(password, salt=None, hasher='default'):
+    """
+    Asynchronous version of `make_password`.
+    Password is hashed in the password hashing pool.
+    """
+    if password is None:
+        return make_password(password)
+    return await hashing_pool.submit(make_password, password, salt, hasher)
+
+
 @functools.lru_cache()
 def get_hashers():
     hashers = []
@@ -83,6 +230,9 @@ def get_hashers():
         if not getattr(hasher, 'algorithm'):
             raise ImproperlyConfigured("hasher doesn't specify an "
                                        "algorithm name: %s" % hasher_path)
+        params = getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(hasher.algorithm, {})
+        for name, value in params.items():
+            setattr(hasher, name, value)
         hashers.append(hasher)
     return hashers
 
@@ -93,7 +243,7 @@ def get_hashers_by_algorithm():
 
 
 def reset_hashers(**kwargs):
-    if kwargs['setting'] == 'PASSWORD_HASHERS':
+    if kwargs['setting'] in ('PASSWORD_HASHERS', 'PASSWORD_HASHER_PARAMS'):
         get_hashers.cache_clear()
         get_hashers_by_algorithm.cache_clear()
 
@@ -160,6 +310,8 @@ class BasePasswordHasher:
     """
     algorithm = None
     library = None
+    # Name of the work factor attribute, None if hasher has no work factor.
+    cost_attribute = None
 
     def _load_library(self):
         if self.library is not None:
@@ -218,6 +370,27 @@ class BasePasswordHasher:
         """
         warnings.warn('subclasses of BasePasswordHasher should provide a harden_runtime() method')
 
+    def _measure(self, cost, password='calibration'):
+        """Return time of password encoding with the given work factor."""
+        hasher = copy.copy(self)
+        setattr(hasher, self.cost_attribute, cost)
+        salt = hasher.salt()
+        start = time.perf_counter()
+        hasher.encode(password, salt)
+        return time.perf_counter() - start
+
+    def calibrate(self, target_time):
+        """
+        Return work factor so that password encoding takes about
+        `target_time` seconds on the current hardware.
+        Work factor is considered to be linear.
+        """
+        if self.cost_attribute is None:
+            return None
+        cost = getattr(self, self.cost_attribute)
+        elapsed = self._measure(cost)
+        return max(1, int(round(cost * target_time / elapsed)))
+
 
 class PBKDF2PasswordHasher(BasePasswordHasher):
     """
@@ -230,6 +403,11 @@ class PBKDF2PasswordHasher(BasePasswordHasher):
     algorithm = "pbkdf2_sha256"
     iterations = 100000
     digest = hashlib.sha256
+    cost_attribute = 'iterations'
+
+    def calibrate(self, target_time):
+        iterations = super().calibrate(target_time)
+        return max(1000, int(round(iterations, -3)))
 
     def encode(self, password, salt, iterations=None):
         assert password is not None
@@ -291,6 +469,7 @@ class Argon2PasswordHasher(BasePasswordHasher):
     time_cost = 2
     memory_cost = 512
     parallelism = 2
+    cost_attribute = 'time_cost'
 
     def encode(self, password, salt):
         argon2 = self._load_library()
@@ -391,6 +570,13 @@ class BCryptSHA256PasswordHasher(BasePasswordHasher):
     digest = hashlib.sha256
     library = ("bcrypt", "bcrypt")
     rounds = 12
+    cost_attribute = 'rounds'
+
+    def calibrate(self, target_time):
+        # Every round doubles the work.
+        elapsed = self._measure(self.rounds)
+        rounds = self.rounds + math.log2(target_time / elapsed)
+        return min(31, max(4, int(round(rounds))))
 
     def salt(self):
         bcrypt = self._load_library()
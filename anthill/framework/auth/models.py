@@ -36,5 +36,11 @@ class AnonymousUser:
     def check_password(self, raw_password):
         raise NotImplementedError("Anthill doesn't provide a DB representation for AnonymousUser.")
 
+    async def aset_password(self, raw_password):
+        raise NotImplementedError("Anthill doesn't provide a DB representation for AnonymousUser.")
+
+    async def acheck_password(self, raw_password):
+        raise NotImplementedError("Anthill doesn't provide a DB representation for AnonymousUser.")
+
     def get_username(self):
         return self.username
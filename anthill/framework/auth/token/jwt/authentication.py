@@ -1,11 +1,13 @@
 from anthill.framework.auth import authenticate, get_user_model
 from anthill.framework.utils.encoding import smart_text
 from anthill.framework.utils.translation import translate as _
-from anthill.framework.utils.asynchronous import as_future
+from anthill.framework.utils.asynchronous import as_future, thread_pool_exec
 from anthill.framework.auth.token import exceptions
 from anthill.framework.auth.token.authentication import (
     get_authorization_header, BaseAuthentication)
 from anthill.framework.auth.token.jwt.settings import token_settings
+from anthill.framework.auth.token.jwt.utils import jwt_get_issue_time_from_payload
+from anthill.framework.auth.token.jwt.cache import user_cache, revocation_channel
 import jwt
 
 
@@ -28,7 +30,7 @@ class BaseJSONWebTokenAuthentication(BaseAuthentication):
             return None
 
         try:
-            payload = jwt_decode_handler(jwt_value)
+            payload = await self.decode(jwt_value)
         except jwt.ExpiredSignature:
             msg = _('Signature has expired.')
             raise exceptions.AuthenticationFailed(msg)
@@ -42,9 +44,46 @@ class BaseJSONWebTokenAuthentication(BaseAuthentication):
 
         return user, payload
 
+    # noinspection PyMethodMayBeStatic
+    async def decode(self, jwt_value):
+        """
+        Verifies the token. Per user secret key is loaded from database,
+        so in that case decoding is done in thread pool.
+        """
+        if token_settings.JWT_GET_USER_SECRET_KEY and not token_settings.JWT_PUBLIC_KEY:
+            return await thread_pool_exec(jwt_decode_handler, jwt_value)
+        return jwt_decode_handler(jwt_value)
+
+    # noinspection PyMethodMayBeStatic
+    async def get_user(self, username):
+        # noinspection PyPep8Naming
+        User = get_user_model()
+
+        def load():
+            user = User.query.filter_by(username=username).first()
+            if user is not None:
+                # User is cached and used outside of the thread's session,
+                # so it must not be expired or refreshed by that session.
+                User.query.session.expunge(user)
+            return user
+
+        return await thread_pool_exec(load)
+
+    # noinspection PyMethodMayBeStatic
+    def attach_user(self, user):
+        """
+        Cached user is detached and shared between requests, so every request
+        gets its own copy attached to the current session with no query.
+        Relationships of the copy are loaded lazily as usual.
+        """
+        # noinspection PyPep8Naming
+        User = get_user_model()
+        return User.query.session.merge(user, load=False)
+
     async def authenticate_credentials(self, payload):
         """
         Returns an active user that matches the payload's user id and email.
+        Users are cached for a short time by username and token issue time.
         """
         username = jwt_get_username_from_payload(payload)
 
@@ -52,12 +91,18 @@ class BaseJSONWebTokenAuthentication(BaseAuthentication):
             msg = _('Invalid payload.')
             raise exceptions.AuthenticationFailed(msg)
 
-        # noinspection PyPep8Naming
-        User = get_user_model()
-        user = User.query.filter_by(username=username).first()
+        issued_at = jwt_get_issue_time_from_payload(payload)
+        user = user_cache.get_user(username, issued_at)
         if user is None:
-            msg = _('Invalid signature.')
-            raise exceptions.AuthenticationFailed(msg)
+            revocation_channel.start()
+            user = await self.get_user(username)
+            if user is None:
+                msg = _('Invalid signature.')
+                raise exceptions.AuthenticationFailed(msg)
+            if revocation_channel.can_cache:
+                user_cache.set_user(username, issued_at, user)
+
+        user = self.attach_user(user)
 
         if not user.is_active:
             msg = _('User account is disabled.')
@@ -0,0 +1,135 @@
+"""
+In-process cache of users resolved from tokens.
+
+Users are cached for a short time keyed by username and token issue time.
+Revocation event evicts cached user in all processes
+subscribed to the revocation channel:
+
+    from anthill.framework.auth.token.jwt.cache import revoke_user
+
+    await revoke_user(user.username)
+
+`revoke_user_threadsafe` may be called from any thread, e.g. on model save.
+"""
+from anthill.framework.core.cache import caches
+from anthill.framework.utils.datastructures import LRUCache
+from anthill.framework.auth.token.jwt.settings import token_settings
+from tornado.ioloop import IOLoop
+from tornado import gen
+import logging
+
+__all__ = [
+    'UserCache', 'RevocationChannel', 'user_cache', 'revocation_channel',
+    'revoke_user', 'revoke_user_threadsafe'
+]
+
+logger = logging.getLogger('anthill.application')
+
+
+class UserCache(LRUCache):
+    def __init__(self, max_size=None, timeout=None):
+        super().__init__(
+            max_size=max_size or token_settings.JWT_USER_CACHE_SIZE,
+            timeout=timeout or token_settings.JWT_USER_CACHE_TTL)
+
+    def get_user(self, username, issued_at):
+        return self.get((username, issued_at))
+
+    def set_user(self, username, issued_at, user):
+        if self.timeout:
+            self.set((username, issued_at), user)
+
+    def evict_user(self, username):
+        for key in [key for key in self._data if key[0] == username]:
+            self.delete(key)
+
+
+class RevocationChannel:
+    """
+    Broadcasts revocation events between processes
+    with redis pub/sub of the cache backend.
+    Events are handled only locally if the cache backend
+    has no asynchronous redis client.
+    """
+    retry_interval = 1
+
+    def __init__(self, cache, name=None, cache_alias=None):
+        self.cache = cache
+        self.name = name or token_settings.JWT_REVOCATION_CHANNEL
+        self.cache_alias = cache_alias or token_settings.JWT_REVOCATION_CACHE_ALIAS
+        self._listening = False
+        self._loop = None
+        self.subscribed = False
+
+    @property
+    def async_client(self):
+        return getattr(caches[self.cache_alias], 'async_client', None)
+
+    @property
+    def can_cache(self):
+        """
+        Users may be cached only if revocation events are received,
+        or if there is no other processes to send them.
+        """
+        return self.subscribed or self.async_client is None
+
+    async def publish(self, username):
+        self.cache.evict_user(username)
+        if self.async_client is None:
+            return
+        client = await self.async_client.get_client(write=True)
+        await client.publish(self.name, username)
+
+    def publish_threadsafe(self, username):
+        """
+        Version of `publish` safe to call from any thread.
+        Event is published by the IOLoop if there is one, so it never blocks.
+        """
+        loop = IOLoop.current(instance=False) or self._loop
+        if loop is not None:
+            loop.add_callback(self.publish, username)
+            return
+        # No IOLoop in process, e.g. in management command.
+        cache = caches[self.cache_alias]
+        if getattr(cache, 'async_client', None) is None:
+            return
+        cache.client.get_client(write=True).publish(self.name, username)
+
+    def start(self):
+        """Start listening to revocation events, if not started yet."""
+        if self._loop is None:
+            self._loop = IOLoop.current()
+        if self._listening or self.async_client is None:
+            return
+        self._listening = True
+        IOLoop.current().spawn_callback(self._listen)
+
+    async def _listen(self):
+        while True:
+            try:
+                client = await self.async_client.get_client(write=True)
+                channel, = await client.subscribe(self.name)
+                self.subscribed = True
+                while await channel.wait_message():
+                    username = await channel.get(encoding='utf-8')
+                    self.cache.evict_user(username)
+            except Exception as e:
+                logger.error('Token revocation channel error: %s' % e)
+            # Events could be missed while not subscribed.
+            self.subscribed = False
+            self.cache.clear()
+            await gen.sleep(self.retry_interval)
+
+
+user_cache = UserCache()
+revocation_channel = RevocationChannel(user_cache)
+
+
+async def revoke_user(username):
+    """Evict cached user in all processes."""
+    await revocation_channel.publish(username)
+
+
+def revoke_user_threadsafe(username):
+    """Evict cached user in all processes, may be called from any thread."""
+    revocation_channel.publish_threadsafe(username)
@@ -3,7 +3,7 @@ from anthill.framework.auth.token.settings import TokenSettings
 import datetime
 
 
-USER_SETTINGS = getattr(settings, 'JWT_AUTHENTICATION', None)
+USER_SETTINGS = getattr(settings, 'JWT_AUTHENTICATION', {})
 
 
 DEFAULTS = {
@@ -32,6 +32,13 @@ DEFAULTS = {
 
     'JWT_AUTH_HEADER_PREFIX': 'JWT',
     'JWT_AUTH_COOKIE': None,
+
+    # In-process cache of authenticated users, 0 ttl disables caching.
+    'JWT_USER_CACHE_TTL': 30,
+    'JWT_USER_CACHE_SIZE': 10000,
+    # Revocation events are sent using redis pub/sub of the cache.
+    'JWT_REVOCATION_CACHE_ALIAS': 'default',
+    'JWT_REVOCATION_CHANNEL': 'anthill.jwt.revocation',
 }
 
 # List of settings that may be in string import notation.
@@ -1,5 +1,7 @@
+import functools
 import jwt
 import uuid
+from jwt.algorithms import get_default_algorithms
 import warnings
 
 from anthill.framework.auth import get_user_model
@@ -7,7 +9,7 @@ from anthill.framework.auth import get_user_model
 from calendar import timegm
 from datetime import datetime
 
-from anthill.framework.auth.token.jwt.settings import settings as token_settings
+from anthill.framework.auth.token.jwt.settings import token_settings
 
 
 def get_username_field():
@@ -110,16 +112,29 @@ def jwt_encode_handler(payload):
     ).decode('utf-8')
 
 
+def jwt_get_issue_time_from_payload(payload):
+    """Returns time the token was issued at, expiration time if unknown."""
+    return payload.get('iat') or payload.get('orig_iat') or payload.get('exp')
+
+
+@functools.lru_cache(maxsize=128)
+def jwt_get_verification_key(key, algorithm):
+    """Returns key prepared for the algorithm, so it is parsed only once."""
+    return get_default_algorithms()[algorithm].prepare_key(key)
+
+
 def jwt_decode_handler(token):
     options = {
         'verify_exp': token_settings.JWT_VERIFY_EXPIRATION,
     }
-    # get user from token, BEFORE verification, to get user secret key
-    unverified_payload = jwt.decode(token, None, False)
-    secret_key = jwt_get_secret_key(unverified_payload)
+    key = token_settings.JWT_PUBLIC_KEY
+    if not key:
+        # get user from token, BEFORE verification, to get user secret key
+        unverified_payload = jwt.decode(token, None, False)
+        key = jwt_get_secret_key(unverified_payload)
     return jwt.decode(
         token,
-        token_settings.JWT_PUBLIC_KEY or secret_key,
+        jwt_get_verification_key(key, token_settings.JWT_ALGORITHM),
         token_settings.JWT_VERIFY,
         options=options,
         leeway=token_settings.JWT_LEEWAY,
@@ -205,6 +205,18 @@ PASSWORD_HASHERS = [
     'anthill.framework.auth.hashers.BCryptPasswordHasher',
 ]
 
+# Work factors of password hashers by algorithm, e.g.
+# {'pbkdf2_sha256': {'iterations': 150000}}.
+# Use `calibrate_hashers` command to pick them for the current hardware.
+PASSWORD_HASHER_PARAMS = {}
+
+# Password hashing pool. Number of workers defaults to number of cpus.
+PASSWORD_HASHING_WORKERS = None
+# Max number of hashing jobs waiting for a worker, 0 means no limit.
+PASSWORD_HASHING_QUEUE_SIZE = 100
+# Whether to use processes instead of threads.
+PASSWORD_HASHING_PROCESSES = False
+
 AUTH_PASSWORD_VALIDATORS = []
 
 ##########
@@ -290,6 +302,13 @@ SESSION_COOKIE_PATH = '/'
 SESSION_COOKIE_HTTPONLY = True
 # Whether to save the session data on every request.
 SESSION_SAVE_EVERY_REQUEST = False
+# Whether to save modified session data after the response is sent.
+# If enabled, the next request of the client may get the old session data.
+# Expiry of unmodified sessions is always refreshed in background.
+SESSION_WRITE_BEHIND = False
+# Interval in seconds to refresh expiry of unmodified sessions in batches,
+# used with SESSION_SAVE_EVERY_REQUEST.
+SESSION_REFRESH_INTERVAL = 5
 # Whether a user's session cookie expires when the Web browser is closed.
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 # The module to store session data
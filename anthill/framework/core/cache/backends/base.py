@@ -4,6 +4,7 @@ import time
 import warnings
 
 from anthill.framework.core.exceptions import ImproperlyConfigured
+from anthill.framework.utils.asynchronous import thread_pool_exec
 from anthill.framework.utils.module_loading import import_string
 
 
@@ -274,3 +275,40 @@ class BaseCache:
 
     def close(self, **kwargs):
         """Close the cache connection"""
+
+    # Asynchronous API.
+    # Backends with native asynchronous client override these methods,
+    # by default blocking ones are executed in thread pool.
+
+    async def aadd(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return await thread_pool_exec(self.add, key, value, timeout=timeout, version=version)
+
+    async def aget(self, key, default=None, version=None):
+        return await thread_pool_exec(self.get, key, default=default, version=version)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return await thread_pool_exec(self.set, key, value, timeout=timeout, version=version)
+
+    async def adelete(self, key, version=None):
+        return await thread_pool_exec(self.delete, key, version=version)
+
+    async def aget_many(self, keys, version=None):
+        return await thread_pool_exec(self.get_many, keys, version=version)
+
+    async def aset_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        return await thread_pool_exec(self.set_many, data, timeout=timeout, version=version)
+
+    async def adelete_many(self, keys, version=None):
+        return await thread_pool_exec(self.delete_many, keys, version=version)
+
+    async def ahas_key(self, key, version=None):
+        return await thread_pool_exec(self.has_key, key, version=version)
+
+    async def aincr(self, key, delta=1, version=None):
+        return await thread_pool_exec(self.incr, key, delta=delta, version=version)
+
+    async def adecr(self, key, delta=1, version=None):
+        return await thread_pool_exec(self.decr, key, delta=delta, version=version)
+
+    async def aclear(self):
+        return await thread_pool_exec(self.clear)
@@ -40,6 +40,28 @@ def omit_exception(method=None, return_value=None):
     return _decorator
 
 
+def async_omit_exception(method=None, return_value=None):
+    """
+    Same as `omit_exception` but for coroutine methods.
+    """
+
+    if method is None:
+        return functools.partial(async_omit_exception, return_value=return_value)
+
+    @functools.wraps(method)
+    async def _decorator(self, *args, **kwargs):
+        try:
+            return await method(self, *args, **kwargs)
+        except ConnectionInterrupted as e:
+            if self._ignore_exceptions:
+                if REDIS_LOG_IGNORED_EXCEPTIONS:
+                    logger.error(str(e))
+
+                return return_value
+            raise e.parent
+    return _decorator
+
+
 class RedisCache(BaseCache):
     def __init__(self, server, params):
         super(RedisCache, self).__init__(params)
@@ -155,3 +177,112 @@ class RedisCache(BaseCache):
     @omit_exception
     def touch(self, key, timeout=None, version=None):
         return self.client.touch(key, timeout=timeout, version=version)
+
+
+class AsyncRedisCache(RedisCache):
+    """
+    Redis cache backend with native asynchronous api based on aioredis.
+    Synchronous api is still available and shares data with asynchronous one.
+    """
+
+    def __init__(self, server, params):
+        super(AsyncRedisCache, self).__init__(server, params)
+        options = params.get("OPTIONS", {})
+        self._async_client_cls = options.get(
+            "ASYNC_CLIENT_CLASS",
+            "anthill.framework.core.cache.backends.redis.client.asynchronous.AsyncClient")
+        self._async_client_cls = import_string(self._async_client_cls)
+        self._async_client = None
+
+    @property
+    def async_client(self):
+        """
+        Lazy asynchronous client connection property.
+        """
+        if self._async_client is None:
+            self._async_client = self._async_client_cls(self._server, self._params, self)
+        return self._async_client
+
+    @async_omit_exception
+    async def aset(self, *args, **kwargs):
+        return await self.async_client.set(*args, **kwargs)
+
+    @async_omit_exception
+    async def aadd(self, *args, **kwargs):
+        return await self.async_client.add(*args, **kwargs)
+
+    async def aget(self, key, default=None, version=None, client=None):
+        try:
+            return await self.async_client.get(key, default=default, version=version,
+                                               client=client)
+        except ConnectionInterrupted as e:
+            if self._ignore_exceptions:
+                if REDIS_LOG_IGNORED_EXCEPTIONS:
+                    logger.error(str(e))
+                return default
+            raise
+
+    @async_omit_exception
+    async def adelete(self, *args, **kwargs):
+        return await self.async_client.delete(*args, **kwargs)
+
+    @async_omit_exception
+    async def adelete_pattern(self, *args, **kwargs):
+        kwargs['itersize'] = kwargs.get('itersize', REDIS_SCAN_ITERSIZE)
+        return await self.async_client.delete_pattern(*args, **kwargs)
+
+    @async_omit_exception
+    async def adelete_many(self, *args, **kwargs):
+        return await self.async_client.delete_many(*args, **kwargs)
+
+    @async_omit_exception
+    async def aclear(self):
+        return await self.async_client.clear()
+
+    @async_omit_exception(return_value={})
+    async def aget_many(self, *args, **kwargs):
+        return await self.async_client.get_many(*args, **kwargs)
+
+    @async_omit_exception
+    async def aset_many(self, *args, **kwargs):
+        return await self.async_client.set_many(*args, **kwargs)
+
+    @async_omit_exception
+    async def aincr(self, *args, **kwargs):
+        return await self.async_client.incr(*args, **kwargs)
+
+    @async_omit_exception
+    async def adecr(self, *args, **kwargs):
+        return await self.async_client.decr(*args, **kwargs)
+
+    @async_omit_exception
+    async def ahas_key(self, *args, **kwargs):
+        return await self.async_client.has_key(*args, **kwargs)
+
+    @async_omit_exception
+    async def akeys(self, *args, **kwargs):
+        return await self.async_client.keys(*args, **kwargs)
+
+    @async_omit_exception
+    async def attl(self, *args, **kwargs):
+        return await self.async_client.ttl(*args, **kwargs)
+
+    @async_omit_exception
+    async def apersist(self, *args, **kwargs):
+        return await self.async_client.persist(*args, **kwargs)
+
+    @async_omit_exception
+    async def aexpire(self, *args, **kwargs):
+        return await self.async_client.expire(*args, **kwargs)
+
+    @async_omit_exception
+    async def alock(self, *args, **kwargs):
+        return await self.async_client.lock(*args, **kwargs)
+
+    @async_omit_exception
+    async def aclose(self, **kwargs):
+        await self.async_client.close(**kwargs)
+
+    @async_omit_exception
+    async def atouch(self, key, timeout=None, version=None):
+        return await self.async_client.touch(key, timeout=timeout, version=version)
@@ -0,0 +1,521 @@
+import asyncio
+import uuid
+
+import aioredis
+
+from anthill.framework.core.cache.backends.base import DEFAULT_TIMEOUT
+from anthill.framework.utils.encoding import smart_text
+
+from ..exceptions import ConnectionInterrupted
+from ..util import CacheKey
+from .default import DefaultClient
+
+_main_exceptions = (aioredis.RedisError, ConnectionError, OSError, asyncio.TimeoutError)
+
+
+class LockError(Exception):
+    pass
+
+
+class AsyncLock:
+    """
+    Distributed lock based on single redis instance.
+    Lock can be released only by its owner.
+    """
+
+    release_lua = """
+        if redis.call('GET', KEYS[1]) == ARGV[1] then
+            return redis.call('DEL', KEYS[1])
+        end
+        return 0
+    """
+
+    def __init__(self, client, name, timeout=None, sleep=0.1, blocking_timeout=None):
+        self.client = client
+        self.name = name
+        self.timeout = timeout
+        self.sleep = sleep
+        self.blocking_timeout = blocking_timeout
+        self.token = None
+
+    async def acquire(self, blocking=True, blocking_timeout=None):
+        loop = asyncio.get_event_loop()
+        token = uuid.uuid4().hex
+        if blocking_timeout is None:
+            blocking_timeout = self.blocking_timeout
+        stop_at = None
+        if blocking_timeout is not None:
+            stop_at = loop.time() + blocking_timeout
+        pexpire = int(self.timeout * 1000) if self.timeout else 0
+        while True:
+            if await self.client.set(self.name, token, pexpire=pexpire,
+                                     exist=self.client.SET_IF_NOT_EXIST):
+                self.token = token
+                return True
+            if not blocking or (stop_at is not None and loop.time() > stop_at):
+                return False
+            await asyncio.sleep(self.sleep)
+
+    async def release(self):
+        if self.token is None:
+            raise LockError("Cannot release an unlocked lock")
+        token, self.token = self.token, None
+        await self.client.eval(self.release_lua, keys=[self.name], args=[token])
+
+    async def __aenter__(self):
+        if await self.acquire():
+            return self
+        raise LockError("Unable to acquire lock within the time specified")
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.release()
+
+
+class AsyncClient(DefaultClient):
+    """
+    Native asynchronous client based on aioredis.
+    Uses the same keys format, serializers and compressors as DefaultClient,
+    so both clients can share data.
+    Connection pools are bound to the event loop they were created in.
+    """
+
+    def __init__(self, server, params, backend):
+        super().__init__(server, params, backend)
+        pool_kwargs = self._options.get("CONNECTION_POOL_KWARGS", {})
+        self._pool_minsize = self._options.get("POOL_MINSIZE", 1)
+        self._pool_maxsize = self._options.get(
+            "POOL_MAXSIZE", pool_kwargs.get("max_connections", 10))
+        self._pools = [None] * len(self._server)
+        self._pools_loop = None
+
+    async def get_client(self, write=True, tried=(), show_index=False):
+        """
+        Method used for obtain a raw aioredis client (connections pool).
+        """
+        index = self.get_next_client_index(write=write, tried=tried or [])
+
+        loop = asyncio.get_event_loop()
+        if self._pools_loop is not loop:
+            pools, self._pools = self._pools, [None] * len(self._server)
+            self._pools_loop = loop
+            self._close_pools(pools)
+
+        if self._pools[index] is None:
+            # Store the future, so concurrent callers share the same pool
+            self._pools[index] = asyncio.ensure_future(self.connect(index))
+        try:
+            client = await self._pools[index]
+        except _main_exceptions as e:
+            self._pools[index] = None
+            raise ConnectionInterrupted(connection=None, parent=e)
+        except Exception:
+            self._pools[index] = None
+            raise
+
+        if show_index:
+            return client, index
+        else:
+            return client
+
+    async def connect(self, index=0):
+        kwargs = {
+            "minsize": self._pool_minsize,
+            "maxsize": self._pool_maxsize,
+        }
+
+        password = self._options.get("PASSWORD", None)
+        if password:
+            kwargs["password"] = password
+
+        socket_connect_timeout = self._options.get("SOCKET_CONNECT_TIMEOUT", None)
+        if socket_connect_timeout:
+            kwargs["timeout"] = socket_connect_timeout
+
+        return await aioredis.create_redis_pool(self._server[index], **kwargs)
+
+    def _get_timeout(self, timeout):
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self._backend.default_timeout
+        if timeout is not None:
+            # Convert to milliseconds
+            timeout = int(timeout * 1000)
+        return timeout
+
+    async def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, nx=False, xx=False):
+        """
+        Persist a value to the cache, and set an optional expiration time.
+        Also supports optional nx parameter. If set to True - will use redis setnx instead of set.
+        """
+        nkey = self.make_key(key, version=version)
+        nvalue = self.encode(value)
+        timeout = self._get_timeout(timeout)
+
+        if client is None:
+            client = await self.get_client(write=True)
+
+        if timeout is not None and timeout <= 0:
+            if nx:
+                # Using negative timeouts when nx is True should
+                # not expire (in our case delete) the value if it exists.
+                return not await self.has_key(key, version=version, client=client)
+            else:
+                return await self.delete(key, client=client, version=version)
+
+        exist = None
+        if nx:
+            exist = client.SET_IF_NOT_EXIST
+        elif xx:
+            exist = client.SET_IF_EXIST
+
+        try:
+            return bool(await client.set(nkey, nvalue, pexpire=timeout or 0, exist=exist))
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def incr_version(self, key, delta=1, version=None, client=None):
+        """
+        Adds delta to the cache version for the supplied key. Returns the
+        new version.
+        """
+        if client is None:
+            client = await self.get_client(write=True)
+
+        if version is None:
+            version = self._backend.version
+
+        old_key = self.make_key(key, version)
+        value = await self.get(old_key, version=version, client=client)
+
+        try:
+            ttl = await client.ttl(old_key)
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+        if value is None:
+            raise ValueError("Key '%s' not found" % key)
+
+        if isinstance(key, CacheKey):
+            new_key = self.make_key(key.original_key(), version=version + delta)
+        else:
+            new_key = self.make_key(key, version=version + delta)
+
+        await self.set(new_key, value, timeout=ttl if ttl >= 0 else None, client=client)
+        await self.delete(old_key, client=client)
+        return version + delta
+
+    async def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        """
+        Add a value to the cache, failing if the key already exists.
+
+        Returns ``True`` if the object was added, ``False`` if not.
+        """
+        return await self.set(key, value, timeout, version=version, client=client, nx=True)
+
+    async def get(self, key, default=None, version=None, client=None):
+        """
+        Retrieve a value from the cache.
+
+        Returns decoded value if key is found, the default if not.
+        """
+        if client is None:
+            client = await self.get_client(write=False)
+
+        key = self.make_key(key, version=version)
+
+        try:
+            value = await client.get(key)
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+        if value is None:
+            return default
+
+        return self.decode(value)
+
+    async def persist(self, key, version=None, client=None):
+        if client is None:
+            client = await self.get_client(write=True)
+
+        key = self.make_key(key, version=version)
+
+        try:
+            await client.persist(key)
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def expire(self, key, timeout, version=None, client=None):
+        if client is None:
+            client = await self.get_client(write=True)
+
+        key = self.make_key(key, version=version)
+
+        try:
+            await client.expire(key, timeout)
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def lock(self, key, version=None, timeout=None, sleep=0.1,
+                   blocking_timeout=None, client=None):
+        if client is None:
+            client = await self.get_client(write=True)
+
+        key = self.make_key(key, version=version)
+        return AsyncLock(client, key, timeout=timeout, sleep=sleep,
+                         blocking_timeout=blocking_timeout)
+
+    async def delete(self, key, version=None, prefix=None, client=None):
+        """
+        Remove a key from the cache.
+        """
+        if client is None:
+            client = await self.get_client(write=True)
+
+        try:
+            return await client.delete(self.make_key(key, version=version, prefix=prefix))
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def delete_pattern(self, pattern, version=None, prefix=None, client=None, itersize=None):
+        """
+        Remove all keys matching pattern.
+        """
+        if client is None:
+            client = await self.get_client(write=True)
+
+        pattern = self.make_pattern(pattern, version=version, prefix=prefix)
+
+        try:
+            count = 0
+            keys = []
+            async for key in client.iscan(match=pattern, count=itersize):
+                keys.append(key)
+                if len(keys) >= (itersize or 100):
+                    count += await client.delete(*keys)
+                    keys = []
+            if keys:
+                count += await client.delete(*keys)
+            return count
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def delete_many(self, keys, version=None, client=None):
+        """
+        Remove multiple keys at once.
+        """
+        if client is None:
+            client = await self.get_client(write=True)
+
+        keys = [self.make_key(k, version=version) for k in keys]
+
+        if not keys:
+            return
+
+        try:
+            return await client.delete(*keys)
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def clear(self, client=None):
+        """
+        Flush all cache keys.
+        """
+        if client is None:
+            client = await self.get_client(write=True)
+
+        try:
+            await client.flushdb()
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def get_many(self, keys, version=None, client=None):
+        """
+        Retrieve many keys.
+        """
+        if client is None:
+            client = await self.get_client(write=False)
+
+        if not keys:
+            return {}
+
+        map_keys = dict((self.make_key(k, version=version), k) for k in keys)
+
+        try:
+            results = await client.mget(*map_keys)
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+        recovered_data = {}
+        for key, value in zip(map_keys, results):
+            if value is None:
+                continue
+            recovered_data[map_keys[key]] = self.decode(value)
+        return recovered_data
+
+    async def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        """
+        Set a bunch of values in the cache at once from a dict of key/value
+        pairs using a single pipeline.
+        """
+        if client is None:
+            client = await self.get_client(write=True)
+
+        timeout = self._get_timeout(timeout)
+        if timeout is not None and timeout <= 0:
+            return await self.delete_many(data.keys(), version=version, client=client)
+
+        try:
+            pipeline = client.pipeline()
+            for key, value in data.items():
+                pipeline.set(self.make_key(key, version=version), self.encode(value),
+                             pexpire=timeout or 0)
+            await pipeline.execute()
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def _incr(self, key, delta=1, version=None, client=None, ignore_key_check=False):
+        if client is None:
+            client = await self.get_client(write=True)
+
+        key = self.make_key(key, version=version)
+
+        try:
+            try:
+                # Use lua script for atomicity
+                if not ignore_key_check:
+                    lua = """
+                    local exists = redis.call('EXISTS', KEYS[1])
+                    if (exists == 1) then
+                        return redis.call('INCRBY', KEYS[1], ARGV[1])
+                    else return false end
+                    """
+                else:
+                    lua = """
+                    return redis.call('INCRBY', KEYS[1], ARGV[1])
+                    """
+                value = await client.eval(lua, keys=[key], args=[delta])
+                if value is None:
+                    raise ValueError("Key '%s' not found" % key)
+            except aioredis.ReplyError:
+                # Value is not an integer stored by redis (e.g. too big
+                # or encoded by serializer), so try to keep TTL of key
+                timeout = await client.ttl(key)
+                # returns -2 if the key does not exist
+                # means, that key have expired
+                if timeout == -2:
+                    raise ValueError("Key '%s' not found" % key)
+                value = await self.get(key, version=version, client=client) + delta
+                await self.set(key, value, version=version,
+                               timeout=timeout if timeout >= 0 else None, client=client)
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+        return value
+
+    async def incr(self, key, delta=1, version=None, client=None, ignore_key_check=False):
+        """
+        Add delta to value in the cache. If the key does not exist, raise a
+        ValueError exception. if ignore_key_check=True then the key will be
+        created and set to the delta value by default.
+        """
+        return await self._incr(key=key, delta=delta, version=version, client=client,
+                                ignore_key_check=ignore_key_check)
+
+    async def decr(self, key, delta=1, version=None, client=None):
+        """
+        Decreace delta to value in the cache. If the key does not exist, raise a
+        ValueError exception.
+        """
+        return await self._incr(key=key, delta=-delta, version=version, client=client)
+
+    async def ttl(self, key, version=None, client=None):
+        """
+        Executes TTL redis command and return the "time-to-live" of specified key.
+        If key is a non volatile key, it returns None.
+        """
+        if client is None:
+            client = await self.get_client(write=False)
+
+        key = self.make_key(key, version=version)
+
+        try:
+            t = await client.ttl(key)
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+        if t >= 0:
+            return t
+        elif t == -1:
+            return None
+        else:
+            # -2 means key does not exist
+            return 0
+
+    async def has_key(self, key, version=None, client=None):
+        """
+        Test if key exists.
+        """
+        if client is None:
+            client = await self.get_client(write=False)
+
+        key = self.make_key(key, version=version)
+        try:
+            return await client.exists(key) == 1
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    async def keys(self, search, version=None, client=None):
+        """
+        Execute KEYS command and return matched results.
+        """
+        if client is None:
+            client = await self.get_client(write=False)
+
+        pattern = self.make_pattern(search, version=version)
+        try:
+            encoding_map = [smart_text(k) for k in await client.keys(pattern)]
+            return [self.reverse_key(k) for k in encoding_map]
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
+
+    @staticmethod
+    def _connected_clients(pools):
+        for pool in pools:
+            if pool is not None and pool.done() and not pool.cancelled() and not pool.exception():
+                yield pool.result()
+
+    def _close_pools(self, pools):
+        """Close pools bound to the previous event loop."""
+        for pool in pools:
+            if pool is not None and not pool.done():
+                pool.cancel()
+        for client in self._connected_clients(pools):
+            try:
+                client.close()
+            except RuntimeError:
+                # Previous event loop is already closed
+                pass
+
+    async def close(self, **kwargs):
+        pools, self._pools = self._pools, [None] * len(self._server)
+        for client in self._connected_clients(pools):
+            client.close()
+            await client.wait_closed()
+
+    async def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        """
+        Sets a new expiration for a key.
+        """
+        if client is None:
+            client = await self.get_client(write=True)
+
+        key = self.make_key(key, version=version)
+
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self._backend.default_timeout
+
+        try:
+            if timeout is None:
+                return bool(await client.persist(key))
+            return bool(await client.expire(key, timeout))
+        except _main_exceptions as e:
+            raise ConnectionInterrupted(connection=client, parent=e)
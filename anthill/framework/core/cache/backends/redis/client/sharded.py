@@ -1,5 +1,6 @@
 import re
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from anthill.framework.conf import settings
 from anthill.framework.utils.encoding import smart_text
@@ -23,6 +24,7 @@ class ShardClient(DefaultClient):
 
         self._ring = HashRing(self._server)
         self._serverdict = self.connect()
+        self._executor = None
 
     def get_client(self, write=True):
         raise NotImplementedError
@@ -45,6 +47,29 @@ class ShardClient(DefaultClient):
         name = self.get_server_name(key)
         return self._serverdict[name]
 
+    def group_by_server(self, keys):
+        """
+        Split prepared keys into groups by server name.
+        """
+        groups = OrderedDict()
+        for key in keys:
+            groups.setdefault(self.get_server_name(key), []).append(key)
+        return groups
+
+    def map_servers(self, func, groups):
+        """
+        Call `func(client, keys)` for every group of keys,
+        servers are requested in parallel.
+        Returns a list of results in the order of groups.
+        """
+        items = [(self._serverdict[name], keys) for name, keys in groups.items()]
+        if len(items) < 2:
+            return [func(client, keys) for client, keys in items]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=len(self._serverdict))
+        futures = [self._executor.submit(func, client, keys) for client, keys in items]
+        return [f.result() for f in futures]
+
     def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None):
         if client is None:
             key = self.make_key(key, version=version)
@@ -67,17 +92,25 @@ class ShardClient(DefaultClient):
 
         recovered_data = OrderedDict()
 
-        new_keys = [self.make_key(key, version=version) for key in keys]
-        map_keys = dict(zip(new_keys, keys))
+        map_keys = OrderedDict(
+            (self.make_key(k, version=version), k) for k in keys
+        )
 
-        for key in new_keys:
-            client = self.get_server(key)
-            value = self.get(key=key, version=version, client=client)
+        def mget(client, keys_):
+            try:
+                return dict(zip(keys_, client.mget(*keys_)))
+            except ConnectionError as e:
+                raise ConnectionInterrupted(connection=client, parent=e)
+
+        results = {}
+        for values in self.map_servers(mget, self.group_by_server(map_keys)):
+            results.update(values)
 
+        for key in map_keys:
+            value = results.get(key)
             if value is None:
                 continue
-
-            recovered_data[map_keys[key]] = value
+            recovered_data[map_keys[key]] = self.decode(value)
         return recovered_data
 
     def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, nx=False):
@@ -99,9 +132,26 @@ class ShardClient(DefaultClient):
 
         If timeout is given, that timeout will be used for the key; otherwise
         the default cache timeout will be used.
+        Keys are sent in one pipeline per server.
         """
-        for key, value in data.items():
-            self.set(key, value, timeout, version=version)
+        if not data:
+            return
+
+        map_keys = OrderedDict(
+            (self.make_key(k, version=version), v) for k, v in data.items()
+        )
+
+        def pipeline_set(client, keys_):
+            try:
+                pipeline = client.pipeline()
+                for key in keys_:
+                    super(ShardClient, self).set(
+                        key, map_keys[key], timeout, version=version, client=pipeline)
+                pipeline.execute()
+            except ConnectionError as e:
+                raise ConnectionInterrupted(connection=client, parent=e)
+
+        self.map_servers(pipeline_set, self.group_by_server(map_keys))
 
     def has_key(self, key, version=None, client=None):
         """
@@ -167,11 +217,17 @@ class ShardClient(DefaultClient):
         """
         Remove multiple keys at once.
         """
-        res = 0
-        for key in [self.make_key(k, version=version) for k in keys]:
-            client = self.get_server(key)
-            res += self.delete(key, client=client)
-        return res
+        keys = [self.make_key(k, version=version) for k in keys]
+        if not keys:
+            return 0
+
+        def delete(client, keys_):
+            try:
+                return client.delete(*keys_)
+            except ConnectionError as e:
+                raise ConnectionInterrupted(connection=client, parent=e)
+
+        return sum(self.map_servers(delete, self.group_by_server(keys)))
 
     def incr_version(self, key, delta=1, version=None, client=None):
         if client is None:
@@ -243,17 +299,32 @@ class ShardClient(DefaultClient):
         if itersize:
             kwargs['count'] = itersize
 
-        keys = []
-        for server, connection in self._serverdict.items():
-            keys.extend(key for key in connection.scan_iter(**kwargs))
-
-        res = 0
-        if keys:
-            for server, connection in self._serverdict.items():
-                res += connection.delete(*keys)
-        return res
+        batch_size = itersize or 100
+
+        def delete(client, _):
+            # Keys found on a server are deleted from the same server
+            # in batches, avoiding a round trip per key.
+            count = 0
+            keys = []
+            try:
+                for key in client.scan_iter(**kwargs):
+                    keys.append(key)
+                    if len(keys) >= batch_size:
+                        count += client.delete(*keys)
+                        keys = []
+                if keys:
+                    count += client.delete(*keys)
+            except ConnectionError as e:
+                raise ConnectionInterrupted(connection=client, parent=e)
+            return count
+
+        groups = OrderedDict((name, None) for name in self._serverdict)
+        return sum(self.map_servers(delete, groups))
 
     def close(self, **kwargs):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         if getattr(settings, "REDIS_CLOSE_CONNECTION", False):
             for client in self._serverdict.values():
                 for c in client.connection_pool._available_connections:
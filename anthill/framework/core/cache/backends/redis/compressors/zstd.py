@@ -0,0 +1,20 @@
+import zstandard
+
+from ..exceptions import CompressorError
+from .base import BaseCompressor
+
+
+class ZstdCompressor(BaseCompressor):
+    min_length = 15
+    level = 3
+
+    def compress(self, value):
+        if len(value) > self.min_length:
+            return zstandard.ZstdCompressor(level=self.level).compress(value)
+        return value
+
+    def decompress(self, value):
+        try:
+            return zstandard.ZstdDecompressor().decompress(value)
+        except zstandard.ZstdError as e:
+            raise CompressorError(e)
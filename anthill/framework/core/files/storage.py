@@ -7,6 +7,7 @@ from anthill.framework.core.exceptions import SuspiciousFileOperation
 from anthill.framework.core.files import File, locks
 from anthill.framework.core.files.move import file_move_safe
 from anthill.framework.utils.os import safe_join
+from anthill.framework.utils.asynchronous import thread_pool_exec
 from anthill.framework.utils.crypto import get_random_string
 from anthill.framework.utils.encoding import filepath_to_uri
 from anthill.framework.utils.functional import LazyObject, cached_property
@@ -45,6 +46,45 @@ class Storage:
         name = self.get_available_name(name, max_length=max_length)
         return self._save(name, content)
 
+    # Asynchronous API. Blocking operations are executed in thread pool,
+    # so slow storages do not block the IOLoop.
+    # Subclasses with native asynchronous client may override these methods.
+
+    async def aopen(self, name, mode='rb'):
+        """Retrieve the specified file from storage."""
+        return await thread_pool_exec(self.open, name, mode)
+
+    async def asave(self, name, content, max_length=None):
+        """Save new content to the file specified by name."""
+        return await thread_pool_exec(self.save, name, content, max_length=max_length)
+
+    async def awrite(self, name, chunks, max_length=None):
+        """
+        Save content given as iterable or asynchronous iterable of chunks
+        to the file specified by name. Returns the name of saved file.
+        """
+        name = await thread_pool_exec(self.get_available_name, name, max_length=max_length)
+        f = await self.aopen(name, 'wb')
+        try:
+            if hasattr(chunks, '__aiter__'):
+                async for chunk in chunks:
+                    await thread_pool_exec(f.write, chunk)
+            else:
+                for chunk in chunks:
+                    await thread_pool_exec(f.write, chunk)
+        finally:
+            await thread_pool_exec(f.close)
+        return name
+
+    async def adelete(self, name):
+        return await thread_pool_exec(self.delete, name)
+
+    async def aexists(self, name):
+        return await thread_pool_exec(self.exists, name)
+
+    async def asize(self, name):
+        return await thread_pool_exec(self.size, name)
+
     # These methods are part of the public API, with default implementations.
 
     # noinspection PyMethodMayBeStatic
@@ -214,9 +254,7 @@ class FileSystemStorage(Storage):
     def _open(self, name, mode='rb'):
         return File(open(self.path(name), mode))
 
-    def _save(self, name, content):
-        full_path = self.path(name)
-
+    def _ensure_directory(self, full_path):
         # Create any intermediate directories that do not exist.
         directory = os.path.dirname(full_path)
         if not os.path.exists(directory):
@@ -239,6 +277,10 @@ class FileSystemStorage(Storage):
         if not os.path.isdir(directory):
             raise IOError("%s exists and is not a directory." % directory)
 
+    def _save(self, name, content):
+        full_path = self.path(name)
+        self._ensure_directory(full_path)
+
         # There's a potential race condition between get_available_name and
         # saving the file; it's possible that two threads might return the
         # same name, at which point all sorts of fun happens. So we need to
@@ -287,6 +329,47 @@ class FileSystemStorage(Storage):
         # Store filenames with forward slashes, even on Windows.
         return name.replace('\\', '/')
 
+    def _create_exclusive(self, name):
+        """
+        Create new file for writing, the name is changed if the file exists.
+        Returns tuple (name, file object).
+        """
+        full_path = self.path(name)
+        self._ensure_directory(full_path)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        while True:
+            try:
+                fd = os.open(full_path, flags, 0o666)
+            except FileExistsError:
+                name = self.get_available_name(name)
+                full_path = self.path(name)
+            else:
+                return name, os.fdopen(fd, 'wb')
+
+    async def awrite(self, name, chunks, max_length=None):
+        """
+        Save content given as iterable or asynchronous iterable of chunks.
+        Every chunk is written in thread pool, file is created exclusively,
+        so concurrent writers never overwrite each other.
+        """
+        name = await thread_pool_exec(self.get_available_name, name, max_length=max_length)
+        name, f = await thread_pool_exec(self._create_exclusive, name)
+        try:
+            if hasattr(chunks, '__aiter__'):
+                async for chunk in chunks:
+                    await thread_pool_exec(f.write, chunk)
+            else:
+                for chunk in chunks:
+                    await thread_pool_exec(f.write, chunk)
+        finally:
+            await thread_pool_exec(f.close)
+
+        if self.file_permissions_mode is not None:
+            await thread_pool_exec(os.chmod, self.path(name), self.file_permissions_mode)
+
+        # Store filenames with forward slashes, even on Windows.
+        return name.replace('\\', '/')
+
     def delete(self, name):
         assert name, "The name argument is not allowed to be empty."
         name = self.path(name)
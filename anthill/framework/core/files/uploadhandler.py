@@ -3,6 +3,7 @@ Base file upload handler classes, and the built-in concrete subclasses
 """
 from anthill.framework.core.files.uploadedfile import TemporaryUploadedFile, InMemoryUploadedFile
 from anthill.framework.utils.module_loading import import_string
+from anthill.framework.utils.asynchronous import thread_pool_exec
 from anthill.framework.conf import settings
 from io import BytesIO
 
@@ -87,14 +88,16 @@ class TemporaryFileUploadHandler(FileUploadHandler):
 
     async def new_file(self, *args, **kwargs):
         await super().new_file(*args, **kwargs)
-        self.file = TemporaryUploadedFile(
+        self.file = await thread_pool_exec(
+            TemporaryUploadedFile,
             self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
 
     async def receive_data_chunk(self, raw_data):
-        self.file.write(raw_data)
+        # Disk writes are made off the IOLoop
+        await thread_pool_exec(self.file.write, raw_data)
 
     async def complete_file(self, file_size):
-        self.file.seek(0)
+        await thread_pool_exec(self.file.seek, 0)
         self.file.size = file_size
         return self.file
 
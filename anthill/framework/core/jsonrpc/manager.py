@@ -1,6 +1,10 @@
 import json
 import logging
 import inspect
+from datetime import timedelta
+from functools import partial
+from tornado import gen
+from anthill.framework.utils.asynchronous import bounded_multi
 from .utils import is_invalid_params
 from .exceptions import (
     JSONRPCInvalidParams,
@@ -34,6 +38,10 @@ class JSONRPCResponseManager(object):
         JSONRPC20Request, JSONRPC20BatchRequest or JSONRPC10Request
 
     :param dict dispather: dict<function_name:function>.
+
+    Members of batch request are executed concurrently, but not more than
+    ``batch_concurrency`` at a time. Every call is limited by
+    ``call_timeout`` seconds. Both can be overridden per call.
     """
 
     RESPONSE_CLASS_MAP = {
@@ -41,8 +49,13 @@ class JSONRPCResponseManager(object):
         "2.0": JSONRPC20Response,
     }
 
+    #: Max number of batch members executed at the same time.
+    batch_concurrency = 10
+    #: Call deadline in seconds, None means no deadline.
+    call_timeout = None
+
     @classmethod
-    async def handle(cls, request_str, dispatcher):
+    async def handle(cls, request_str, dispatcher, **options):
         if isinstance(request_str, bytes):
             request_str = request_str.decode("utf-8")
 
@@ -51,25 +64,37 @@ class JSONRPCResponseManager(object):
         except (TypeError, ValueError):
             return JSONRPC20Response(error=JSONRPCParseError()._data)
 
+        return await cls.handle_data(data, dispatcher, **options)
+
+    @classmethod
+    async def handle_data(cls, data, dispatcher, **options):
+        """
+        Handle already decoded request data.
+
+        :param data: dict or list of dicts (batch request).
+        :param jsonrpc.dispatcher.Dispatcher dispatcher:
+        """
         try:
             request = JSONRPCRequest.from_data(data)
         except JSONRPCInvalidRequestException:
             return JSONRPC20Response(error=JSONRPCInvalidRequest()._data)
 
-        return await cls.handle_request(request, dispatcher)
+        return await cls.handle_request(request, dispatcher, **options)
 
     @classmethod
-    async def handle_request(cls, request, dispatcher):
+    async def handle_request(cls, request, dispatcher, concurrency=None, timeout=None):
         """
         Handle request data.
         At this moment request has correct jsonrpc format.
 
         :param dict request: data parsed from request_str.
         :param jsonrpc.dispatcher.Dispatcher dispatcher:
+        :param int concurrency: max number of batch members executed at the same time.
+        :param float timeout: call deadline in seconds.
         """
         rs = request if isinstance(request, JSONRPC20BatchRequest) else [request]
         responses = [
-            r for r in await cls._get_responses(rs, dispatcher)
+            r for r in await cls._get_responses(rs, dispatcher, concurrency, timeout)
             if r is not None
         ]
 
@@ -85,47 +110,61 @@ class JSONRPCResponseManager(object):
             return responses[0]
 
     @classmethod
-    async def _get_responses(cls, requests, dispatcher):
+    async def _get_responses(cls, requests, dispatcher, concurrency=None, timeout=None):
         """
         Response to each single JSON-RPC Request.
+        Requests are executed concurrently, responses are in the order of requests.
         :return iterator(JSONRPC20Response):
         """
-        responses = []
-        for request in requests:
-            def make_response(**kwargs):
-                response = cls.RESPONSE_CLASS_MAP[request.JSONRPC_VERSION](_id=request._id, **kwargs)
-                response.request = request
-                return response
-
-            try:
-                method = dispatcher[request.method]
-            except KeyError:
-                output = make_response(error=JSONRPCMethodNotFound()._data)
+        requests = list(requests)
+        if timeout is None:
+            timeout = cls.call_timeout
+        if len(requests) == 1:
+            responses = [await cls._get_response(requests[0], dispatcher, timeout)]
+        else:
+            responses = await bounded_multi(
+                [partial(cls._get_response, request, dispatcher, timeout) for request in requests],
+                concurrency or cls.batch_concurrency)
+        return [
+            response for request, response in zip(requests, responses)
+            if not request.is_notification
+        ]
+
+    @classmethod
+    async def _get_response(cls, request, dispatcher, timeout=None):
+        def make_response(**kwargs):
+            response = cls.RESPONSE_CLASS_MAP[request.JSONRPC_VERSION](_id=request._id, **kwargs)
+            response.request = request
+            return response
+
+        try:
+            method = dispatcher[request.method]
+        except KeyError:
+            return make_response(error=JSONRPCMethodNotFound()._data)
+
+        try:
+            if inspect.iscoroutinefunction(method):
+                result = method(*request.args, **request.kwargs)
+                if timeout is not None:
+                    result = gen.with_timeout(timedelta(seconds=timeout), result)
+                result = await result
             else:
-                try:
-                    if inspect.iscoroutinefunction(method):
-                        result = await method(*request.args, **request.kwargs)
-                    else:
-                        result = method(*request.args, **request.kwargs)
-                except JSONRPCDispatchException as e:
-                    output = make_response(error=e.error._data)
-                except Exception as e:
-                    data = {
-                        "type": e.__class__.__name__,
-                        "args": e.args,
-                        "message": str(e),
-                    }
-
-                    logger.exception("API Exception: {0}".format(data))
-
-                    if isinstance(e, TypeError) and is_invalid_params(
-                            method, *request.args, **request.kwargs):
-                        output = make_response(error=JSONRPCInvalidParams(data=data)._data)
-                    else:
-                        output = make_response(error=JSONRPCServerError(data=data)._data)
-                else:
-                    output = make_response(result=result)
-            finally:
-                if not request.is_notification:
-                    responses.append(output)
-        return responses
+                result = method(*request.args, **request.kwargs)
+        except JSONRPCDispatchException as e:
+            return make_response(error=e.error._data)
+        except Exception as e:
+            data = {
+                "type": e.__class__.__name__,
+                "args": e.args,
+                "message": str(e),
+            }
+
+            logger.exception("API Exception: {0}".format(data))
+
+            if isinstance(e, TypeError) and is_invalid_params(
+                    method, *request.args, **request.kwargs):
+                return make_response(error=JSONRPCInvalidParams(data=data)._data)
+            else:
+                return make_response(error=JSONRPCServerError(data=data)._data)
+        else:
+            return make_response(result=result)
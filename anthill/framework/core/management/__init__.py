@@ -3,7 +3,7 @@ from .base import Group, Command, Option, InvalidCommand
 from .commands import (
     Server, Shell, Version,
     StartApplication, ApplicationChooser, SendTestEmail,
-    CompileMessages, StartProject, GeoIPMMDBUpdate
+    CompileMessages, StartProject, GeoIPMMDBUpdate, CalibrateHashers
 )
 import argparse
 import os
@@ -419,6 +419,8 @@ class AppManager(BaseManager):
             self.add_command("runserver", Server())
         if "version" not in self._commands:
             self.add_command("version", Version())
+        if "calibrate_hashers" not in self._commands:
+            self.add_command("calibrate_hashers", CalibrateHashers())
         if "db" not in self._commands:
             from anthill.framework.db.management import MigrateCommand
             self.add_command("db", MigrateCommand)
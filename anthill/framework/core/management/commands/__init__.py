@@ -9,10 +9,11 @@ from .startproject import StartProject
 from .sendtestemail import SendTestEmail
 from .version import Version
 from .mmdbupdate import GeoIPMMDBUpdate
+from .calibratehashers import CalibrateHashers
 # from .dumpsdb import DatabaseDumpsCommand
 
 __all__ = [
     'ApplicationChooser', 'Clean', 'CompileMessages', 'Server',
     'Shell', 'StartApplication', 'SendTestEmail', 'Version', 'StartProject',
-    'MakeMessages', 'GeoIPMMDBUpdate'
+    'MakeMessages', 'GeoIPMMDBUpdate', 'CalibrateHashers'
 ]
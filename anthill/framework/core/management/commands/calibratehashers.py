@@ -0,0 +1,34 @@
+from anthill.framework.core.management import Command, Option
+from pprint import pformat
+
+
+class CalibrateHashers(Command):
+    help = description = 'Picks password hashers work factors for the target hashing time.'
+    option_list = (
+        Option('-t', '--time', dest='target_time', type=float, default=0.1,
+               help='Target time of password hashing in seconds.'),
+        Option('-a', '--algorithm', dest='algorithms', nargs='*',
+               help='Algorithms to calibrate. All configured hashers by default.'),
+    )
+
+    def run(self, target_time, algorithms=None):
+        from anthill.framework.auth.hashers import get_hashers
+
+        params = {}
+        for hasher in get_hashers():
+            if algorithms and hasher.algorithm not in algorithms:
+                continue
+            try:
+                value = hasher.calibrate(target_time)
+            except ValueError as e:
+                # Hasher library is not installed
+                print('* %s: skipped, %s' % (hasher.algorithm, e))
+                continue
+            if value is None:
+                print('* %s: skipped, no work factor' % hasher.algorithm)
+                continue
+            print('* %s: %s = %s' % (hasher.algorithm, hasher.cost_attribute, value))
+            params[hasher.algorithm] = {hasher.cost_attribute: value}
+
+        print()
+        print('PASSWORD_HASHER_PARAMS = %s' % pformat(params))
@@ -8,10 +8,15 @@
     :license: BSD, see LICENSE for more details.
 """
 
+import base64
+import datetime
+import decimal
 import functools
+import json
 import os
 import sys
 import time
+import uuid
 import warnings
 from math import ceil
 from operator import itemgetter
@@ -244,7 +249,7 @@ class Pagination:
     no longer work.
     """
 
-    def __init__(self, query, page, per_page, total, items):
+    def __init__(self, query, page, per_page, total, items, has_more=None):
         #: the unlimited query object that was used to create this
         #: pagination object.
         self.query = query
@@ -252,14 +257,20 @@ class Pagination:
         self.page = page
         #: the number of items to be displayed on a page.
         self.per_page = per_page
-        #: the total number of items matching the query
+        #: the total number of items matching the query,
+        #: `None` if counting was skipped
         self.total = total
         #: the items for the current page
         self.items = items
+        #: whether more items exist after the current page,
+        #: used if counting was skipped
+        self.has_more = has_more
 
     @property
     def pages(self):
-        """The total number of pages."""
+        """The total number of pages, `None` if counting was skipped."""
+        if self.total is None:
+            return None
         if self.per_page == 0:
             pages = 0
         else:
@@ -293,6 +304,8 @@ class Pagination:
     @property
     def has_next(self):
         """True if a next page exists."""
+        if self.total is None:
+            return bool(self.has_more)
         return self.page < self.pages
 
     @property
@@ -309,15 +322,107 @@ class Pagination:
         from the sides. Skipped page numbers are represented as `None`.
         """
         last = 0
-        for num in range(1, self.pages + 1):
+        pages = self.pages
+        if pages is None:
+            pages = self.page + 1 if self.has_next else self.page
+        for num in range(1, pages + 1):
             if num <= left_edge or (self.page + right_current > num > self.page - left_current - 1) \
-                    or num > self.pages - right_edge:
+                    or num > pages - right_edge:
                 if last + 1 != num:
                     yield None
                 yield num
                 last = num
 
 
+_CURSOR_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def _encode_cursor_value(value):
+    if isinstance(value, datetime.datetime):
+        aware = value.utcoffset() is not None
+        if aware:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return {'$dt': value.strftime(_CURSOR_DATETIME_FORMAT), 'utc': aware}
+    if isinstance(value, datetime.date):
+        return {'$d': value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {'$dec': str(value)}
+    if isinstance(value, uuid.UUID):
+        return {'$uuid': str(value)}
+    raise TypeError('%r cannot be used in cursor' % value)
+
+
+def _decode_cursor_value(obj):
+    if '$dt' in obj:
+        value = datetime.datetime.strptime(obj['$dt'], _CURSOR_DATETIME_FORMAT)
+        if obj.get('utc'):
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value
+    if '$d' in obj:
+        return datetime.datetime.strptime(obj['$d'], '%Y-%m-%d').date()
+    if '$dec' in obj:
+        return decimal.Decimal(obj['$dec'])
+    if '$uuid' in obj:
+        return uuid.UUID(obj['$uuid'])
+    return obj
+
+
+def encode_cursor(values):
+    """Pack ordering values of the last page item into opaque cursor token."""
+    data = json.dumps(list(values), default=_encode_cursor_value, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Unpack cursor token made by :func:`encode_cursor`. Raises `ValueError` if invalid."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(data.decode('utf-8'), object_hook=_decode_cursor_value)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor: %s' % e)
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+class KeysetPagination:
+    """
+    Internal helper class returned by :meth:`BaseQuery.paginate_after`.
+    Pages are addressed by opaque cursors instead of page numbers,
+    so every page costs the same regardless of its position.
+    """
+
+    def __init__(self, query, ordering, cursor, next_cursor, per_page, total, items):
+        #: the unlimited query object that was used to create this
+        #: pagination object.
+        self.query = query
+        #: ordering used to build pages
+        self.ordering = ordering
+        #: the cursor of the current page, `None` for the first page
+        self.cursor = cursor
+        #: the cursor of the next page, `None` for the last page
+        self.next_cursor = next_cursor
+        #: the number of items to be displayed on a page.
+        self.per_page = per_page
+        #: the total (exact or estimated) number of items matching the query,
+        #: `None` if counting was skipped
+        self.total = total
+        #: the items for the current page
+        self.items = items
+
+    @property
+    def has_next(self):
+        """True if a next page exists."""
+        return self.next_cursor is not None
+
+    def next(self, error_out=False):
+        """Returns a :class:`KeysetPagination` object for the next page."""
+        assert self.query is not None, 'a query object is required ' \
+                                       'for this method to work'
+        return self.query.paginate_after(
+            self.next_cursor, self.ordering, self.per_page, count=None, error_out=error_out)
+
+
 class BaseQuery(orm.Query):
     """
     SQLAlchemy :class:`~sqlalchemy.orm.query.Query` subclass
@@ -352,7 +457,7 @@ class BaseQuery(orm.Query):
             raise Http404
         return rv
 
-    def paginate(self, request, page=None, per_page=None, error_out=True, max_per_page=None):
+    def paginate(self, request, page=None, per_page=None, error_out=True, max_per_page=None, count=True):
         """
         Returns ``per_page`` items from page ``page``.
 
@@ -371,6 +476,10 @@ class BaseQuery(orm.Query):
         When ``error_out`` is ``False``, ``page`` and ``per_page`` default to
         1 and 20 respectively.
 
+        If ``count`` is ``False``, total number of items is not counted,
+        only whether the next page exists. Can be ``'estimate'``, see
+        :meth:`estimate_count`.
+
         Returns a :class:`Pagination` object.
         """
 
@@ -412,11 +521,21 @@ class BaseQuery(orm.Query):
             else:
                 per_page = 20
 
+        if not count:
+            items = self.limit(per_page + 1).offset((page - 1) * per_page).all()
+            if not items and page != 1 and error_out:
+                raise Http404
+            has_more = len(items) > per_page
+            return Pagination(self, page, per_page, None, items[:per_page], has_more)
+
         items = self.limit(per_page).offset((page - 1) * per_page).all()
 
         if not items and page != 1 and error_out:
             raise Http404
 
+        if count == 'estimate':
+            return Pagination(self, page, per_page, self.estimate_count(), items)
+
         # No need to count if we're on the first page and there are fewer
         # items than we expected.
         if page == 1 and len(items) < per_page:
@@ -426,6 +545,131 @@ class BaseQuery(orm.Query):
 
         return Pagination(self, page, per_page, total, items)
 
+    def estimate_count(self):
+        """
+        Returns number of rows estimated by query planner.
+        Supported for PostgreSQL only, exact count is returned otherwise.
+        """
+        query = self.order_by(None)
+        bind = self.session.bind
+        if bind is None or bind.dialect.name != 'postgresql':
+            return query.count()
+        compiled = query.statement.compile(dialect=bind.dialect)
+        plan = self.session.connection().execute(
+            'EXPLAIN (FORMAT JSON) %s' % compiled, compiled.params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def _keyset_columns(self, ordering):
+        """
+        Resolve ordering (column names, ``-`` prefix means descending)
+        to a list of ``(name, attribute, descending)``. Primary key is
+        appended to make ordering unique.
+        """
+        model = self.column_descriptions[0]['entity']
+        mapper = inspect(model)
+        columns = []
+        for name in ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            columns.append((name, getattr(model, name), descending))
+        names = [c[0] for c in columns]
+        for column in mapper.primary_key:
+            name = mapper.get_property_by_column(column).key
+            if name not in names:
+                columns.append((name, getattr(model, name), False))
+        return columns
+
+    def _seek(self, columns, values, limit):
+        """
+        Returns up to ``limit`` items following ``values`` of ordering columns.
+        Ordering columns are expected to be not nullable.
+        """
+        query = self.order_by(None).order_by(
+            *[attr.desc() if descending else attr.asc() for _, attr, descending in columns])
+        if values is not None:
+            clauses = []
+            for i, (_, attr, descending) in enumerate(columns):
+                criteria = [c[1] == v for c, v in zip(columns[:i], values[:i])]
+                criteria.append(attr < values[i] if descending else attr > values[i])
+                clauses.append(sqlalchemy.and_(*criteria))
+            query = query.filter(sqlalchemy.or_(*clauses))
+        return query.limit(limit).all()
+
+    def paginate_after(self, cursor=None, ordering=('id',), per_page=20, count=None, error_out=True):
+        """
+        Keyset (seek) pagination. Returns ``per_page`` items following the
+        item the ``cursor`` points to, or the first items if ``cursor`` is ``None``.
+        Unlike :meth:`paginate` page position does not affect the query cost.
+
+        ``ordering`` is a sequence of column names, ``-`` prefix means
+        descending order. Primary key is always added to the ordering.
+
+        ``count`` can be ``None`` (do not count, default),
+        ``'exact'`` or ``'estimate'`` (see :meth:`estimate_count`).
+
+        When ``error_out`` is ``True`` (default), invalid cursor
+        causes a 404 response, otherwise first page is returned.
+
+        Returns a :class:`KeysetPagination` object.
+        """
+        columns = self._keyset_columns(ordering)
+
+        values = None
+        if cursor:
+            try:
+                values = decode_cursor(cursor)
+                if len(values) != len(columns):
+                    raise ValueError('Cursor does not match ordering')
+            except ValueError:
+                if error_out:
+                    raise Http404
+                values = cursor = None
+
+        items = self._seek(columns, values, per_page + 1)
+
+        next_cursor = None
+        if len(items) > per_page:
+            items = items[:per_page]
+            next_cursor = encode_cursor(getattr(items[-1], c[0]) for c in columns)
+
+        if count == 'exact':
+            total = self.order_by(None).count()
+        elif count == 'estimate':
+            total = self.estimate_count()
+        else:
+            total = None
+
+        return KeysetPagination(self, ordering, cursor, next_cursor, per_page, total, items)
+
+    def iter_batches(self, batch_size=1000, ordering=('id',), start=0):
+        """
+        Fetch records in batches using keyset pagination, so every batch
+        costs the same. If ``start`` is given, that many first records are skipped.
+        """
+        columns = self._keyset_columns(ordering)
+        if start:
+            query = self.order_by(None).order_by(
+                *[attr.desc() if descending else attr.asc() for _, attr, descending in columns])
+            items = query.offset(start).limit(batch_size).all()
+        else:
+            items = self._seek(columns, None, batch_size)
+        while items:
+            yield items
+            if len(items) < batch_size:
+                return
+            values = [getattr(items[-1], c[0]) for c in columns]
+            items = self._seek(columns, values, batch_size)
+
+    def stream(self, batch_size=1000):
+        """
+        Iterate over records using server-side cursor where the database
+        driver supports it, loading ``batch_size`` rows at a time.
+        Session must not be used for other queries until iteration is done.
+        """
+        return self.execution_options(stream_results=True).yield_per(batch_size)
+
 
 class _QueryProperty:
     def __init__(self, sa):
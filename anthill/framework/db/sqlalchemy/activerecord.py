@@ -381,6 +381,21 @@ class _QueryHelper:
             for obj in rows:
                 yield obj
 
+    def stream(self, batch_size=1000):
+        """
+        Iterate over records using server-side cursor. Example::
+
+            for user in User.where(country='US').stream(500):
+                # do something with user
+                pass
+        """
+        return self._query.stream(batch_size)
+
+    def paginate_after(self, cursor=None, ordering=('id',), per_page=20, count=None, error_out=True):
+        """Keyset pagination, see :meth:`BaseQuery.paginate_after`."""
+        return self._query.paginate_after(
+            cursor, ordering, per_page, count=count, error_out=error_out)
+
     def find_in_batches(self, start=None, batch_size=None):
         """
         Fetch records in batches.
@@ -406,12 +421,17 @@ class _QueryHelper:
         if batch_size < 1:
             raise Exception("batch_size must be positive")
 
+        if not (self._order_by or self._group_by or self._offset or self._limit):
+            # Seek by primary key, so every batch costs the same
+            yield from self._query.iter_batches(batch_size, ordering=(), start=offset)
+            return
+
         while True:
             rows = self._query.offset(offset).limit(batch_size).all()
             if rows:
                 yield rows
             if len(rows) < batch_size:
-                raise StopIteration()
+                return
             else:
                 offset += batch_size
 
@@ -556,6 +576,15 @@ class ActiveRecordMixin:
     def find_in_batches(cls, start=None, batch_size=None):
         return cls.select().find_in_batches(start=start, batch_size=batch_size)
 
+    @classmethod
+    def stream(cls, batch_size=1000):
+        return cls.select().stream(batch_size)
+
+    @classmethod
+    def paginate_after(cls, cursor=None, ordering=('id',), per_page=20, count=None, error_out=True):
+        return cls.select().paginate_after(
+            cursor, ordering, per_page, count=count, error_out=error_out)
+
     @classmethod
     def select(cls, *columns):
         return _QueryHelper(cls).select(*columns)
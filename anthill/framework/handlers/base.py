@@ -14,6 +14,7 @@ from anthill.framework.utils.urls import build_absolute_uri
 from anthill.framework.utils.serializer import AlchemyJSONEncoder
 from anthill.framework.http import HttpGoneError, Http404, HttpServerError
 from anthill.framework.conf import settings
+from tornado.gen import convert_yielded
 from tornado import httputil
 import json
 import logging
@@ -69,6 +70,7 @@ class CommonRequestHandlerMixin:
 class RequestHandler(TranslationHandlerMixin, LogExceptionHandlerMixin, SessionHandlerMixin,
                      CommonRequestHandlerMixin, BaseRequestHandler):
     def __init__(self, application, request, **kwargs):
+        self._session_saving = None
         super().__init__(application, request, **kwargs)
         self.init_session()
 
@@ -99,11 +101,23 @@ class RequestHandler(TranslationHandlerMixin, LogExceptionHandlerMixin, SessionH
 
     async def prepare(self):
         """Called at the beginning of a request before  `get`/`post`/etc."""
-        self.setup_session()
+        await self.asetup_session()
 
     def finish(self, chunk=None):
-        """Finishes this response, ending the HTTP request."""
-        self.update_session()
+        """
+        Finishes this response, ending the HTTP request.
+        If session must be saved, response is finished after that.
+        """
+        if self._session_saving is not None:
+            return self._session_saving
+        save = self.update_session()
+        if save is None:
+            return super().finish(chunk)
+        self._session_saving = convert_yielded(self._finish_after(save, chunk))
+        return self._session_saving
+
+    async def _finish_after(self, save, chunk=None):
+        await save
         super().finish(chunk)
 
     def on_finish(self):
@@ -166,11 +180,11 @@ class WebSocketHandler(TranslationHandlerMixin, LogExceptionHandlerMixin, Sessio
         Called at the beginning of a request before websocket
         connection is opened.
         """
-        self.setup_session()
+        await self.asetup_session()
 
     async def on_message(self, message):
         """Handle incoming messages on the WebSocket."""
-        self.update_session()
+        await self.aupdate_session()
 
     def data_received(self, chunk):
         """Implement this method to handle streamed request data."""
@@ -474,7 +488,8 @@ class StaticFileHandler(SessionHandlerMixin, BaseStaticFileHandler):
         self.init_session()
 
     async def prepare(self):
-        self.setup_session()
+        await self.asetup_session()
+        await self.aload_session()
         # noinspection PyAttributeOutsideInit
         self.root = self.get_root()
 
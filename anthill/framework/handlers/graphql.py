@@ -7,15 +7,26 @@ from graphql.error import GraphQLError, format_error as format_graphql_error
 from anthill.framework.http import HttpForbiddenError, HttpBadRequestError
 from tornado.log import app_log
 from tornado.escape import to_basestring
-from graphql.execution import ExecutionResult
+from graphql.execution import ExecutionResult, execute
+from graphql.language.parser import parse
+from graphql.language.source import Source
+from graphql.validation import validate
+from anthill.framework.utils.datastructures import LRUCache
+from anthill.framework.utils.dataloader import DataLoaderRegistry
 from tornado.web import HTTPError
+from tornado.gen import multi
+import hashlib
 import inspect
 import importlib
 import six
 
 DEFAULTS = {
     'SCHEMA': None,
-    'MIDDLEWARE': ()
+    'MIDDLEWARE': (),
+    # Max number of parsed and validated documents cached per process
+    'DOCUMENT_CACHE_SIZE': 1000,
+    # Allow requests with query hash only (`extensions.persistedQuery.sha256Hash`)
+    'PERSISTED_QUERIES': False,
 }
 
 # List of settings that may be in string import notation.
@@ -96,6 +107,56 @@ class GrapheneSettings:
 graphene_settings = GrapheneSettings(None, DEFAULTS, IMPORT_STRINGS)
 
 
+class DocumentCache:
+    """
+    LRU cache of parsed and validated documents keyed by schema and query hash.
+    Also used as a storage of persisted queries.
+    """
+
+    def __init__(self, max_size):
+        self._cache = LRUCache(max_size)
+
+    @staticmethod
+    def query_hash(query):
+        return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+    def get(self, schema, query_hash):
+        """Returns tuple (document, validation errors) or None."""
+        return self._cache.get((id(schema), query_hash))
+
+    def parse(self, schema, query, query_hash=None):
+        """
+        Returns tuple (document, validation errors).
+        Raises GraphQLError on syntax error.
+        """
+        query_hash = query_hash or self.query_hash(query)
+        entry = self.get(schema, query_hash)
+        if entry is None:
+            document = parse(Source(query, name='GraphQL request'))
+            entry = document, validate(schema, document)
+            self._cache.set((id(schema), query_hash), entry)
+        return entry
+
+    @property
+    def hits(self):
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        return self._cache.misses
+
+
+_document_cache = None
+
+
+def get_document_cache():
+    """Return shared document cache, create it on first use."""
+    global _document_cache
+    if _document_cache is None:
+        _document_cache = DocumentCache(graphene_settings.DOCUMENT_CACHE_SIZE)
+    return _document_cache
+
+
 def instantiate_middleware(middlewares):
     for middleware in middlewares:
         if inspect.isclass(middleware):
@@ -124,6 +185,8 @@ class GraphQLHandler(TemplateMixin, RequestHandler):
     pretty = False
     batch = False
     context = None
+    persisted_queries = None
+    document_cache = None
 
     def initialize(
             self,
@@ -154,6 +217,10 @@ class GraphQLHandler(TemplateMixin, RequestHandler):
         self.pretty = pretty
         self.batch = batch
         self.context = context
+        if self.persisted_queries is None:
+            self.persisted_queries = graphene_settings.PERSISTED_QUERIES
+        if self.document_cache is None:
+            self.document_cache = get_document_cache()
 
     def __init__(self, application, request, **kwargs):
         super().__init__(application, request, **kwargs)
@@ -170,9 +237,8 @@ class GraphQLHandler(TemplateMixin, RequestHandler):
         try:
             data = self.parse_body()
             if self.batch:
-                responses = []
-                for entry in data:
-                    responses.append(await self.get_graphql_response(entry))
+                # Batch entries are executed concurrently
+                responses = await multi([self.get_graphql_response(entry) for entry in data])
                 result = '[{}]'.format(','.join([response[0] for response in responses]))
                 status_code = responses and max(responses, key=lambda response: response[1])[1] or 200
             else:
@@ -214,8 +280,9 @@ class GraphQLHandler(TemplateMixin, RequestHandler):
 
     async def get_graphql_response(self, data):
         query, values, operation_name, id = self.get_graphql_params(data)
+        query_hash = self.get_query_hash(data)
         execution_result = await self.execute_graphql_request(
-            query, values, operation_name)
+            query, values, operation_name, query_hash)
 
         status_code = 200
         if execution_result:
@@ -242,21 +309,53 @@ class GraphQLHandler(TemplateMixin, RequestHandler):
 
         return result, status_code
 
-    async def execute_graphql_request(self, query, values, operation_name):
+    def get_query_hash(self, data):
+        """Returns persisted query hash from request data if any."""
+        try:
+            return data['extensions']['persistedQuery']['sha256Hash']
+        except (KeyError, TypeError):
+            return None
+
+    def get_document(self, query, query_hash=None):
+        """
+        Returns tuple (document, validation errors) from cache,
+        parsing and validating query if needed.
+        """
+        if query_hash is not None and not self.persisted_queries:
+            query_hash = None
         if not query:
+            entry = self.document_cache.get(self.schema, query_hash)
+            if entry is None:
+                raise GraphQLError('PersistedQueryNotFound')
+            return entry
+        if query_hash is not None and query_hash != self.document_cache.query_hash(query):
+            raise HttpBadRequestError('Provided sha does not match query.')
+        return self.document_cache.parse(self.schema, query, query_hash)
+
+    async def execute_graphql_request(self, query, values, operation_name, query_hash=None):
+        if not query and not (self.persisted_queries and query_hash):
             if self.is_graphiql():
                 return None
             raise HttpBadRequestError('Must provide query string.')
         try:
-            result = await self.schema.execute(
-                query,
-                values=values,
-                operation_name=operation_name,
+            document, validation_errors = self.get_document(query, query_hash)
+        except HTTPError:
+            raise
+        except Exception as e:
+            return ExecutionResult(errors=[e], invalid=True)
+        if validation_errors:
+            return ExecutionResult(errors=validation_errors, invalid=True)
+        try:
+            result = await execute(
+                self.schema,
+                document,
+                root=self.root,
                 context=self.get_context(),
-                middleware=self.middleware,
+                variables=values,
+                operation_name=operation_name,
+                executor=self.executor,
                 return_promise=self.enable_async,
-                root=self.root,
-                executor=self.executor
+                middleware=self.middleware
             )
         except Exception as e:
             return ExecutionResult(errors=[e], invalid=True)
@@ -343,5 +442,18 @@ class GraphQLHandler(TemplateMixin, RequestHandler):
             context = {}
         if isinstance(context, dict) and 'request' not in context:
             context.update({'request': self.request})
-        context.update({'handler': self})
+        context.update({'handler': self, 'loaders': self.loaders})
         return context
+
+    @property
+    def loaders(self):
+        """
+        Per-request data loaders registry. Use it in resolvers to batch
+        loading of related objects:
+
+            def resolve_author(self, info):
+                return info.context['loaders'].model(User).load(self.author_id)
+        """
+        if not hasattr(self, '_loaders'):
+            self._loaders = DataLoaderRegistry()
+        return self._loaders
@@ -13,6 +13,11 @@ def response_serialize(obj):
 
 
 class JSONRPCMixin:
+    #: Max number of batch members executed at the same time.
+    json_rpc_batch_concurrency = None
+    #: Call deadline in seconds.
+    json_rpc_call_timeout = None
+
     def set_default_headers(self):
         self.set_header('Content-Type', 'application/json')
 
@@ -20,14 +25,18 @@ class JSONRPCMixin:
         self.set_header('Cache-Control', 'no-store')
 
     async def json_rpc(self, message: str) -> str:
+        options = {
+            'concurrency': self.json_rpc_batch_concurrency,
+            'timeout': self.json_rpc_call_timeout,
+        }
         try:
             json_rpc_request = JSONRPCRequest.from_json(message)
         except (TypeError, ValueError, JSONRPCInvalidRequestException):
-            response = await JSONRPCResponseManager.handle(message, self.dispatcher)
+            response = await JSONRPCResponseManager.handle(message, self.dispatcher, **options)
         else:
             json_rpc_request.params = json_rpc_request.params or {}
             response = await JSONRPCResponseManager.handle_request(
-                json_rpc_request, self.dispatcher)
+                json_rpc_request, self.dispatcher, **options)
 
         if response:
             response.serialize = response_serialize
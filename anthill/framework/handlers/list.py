@@ -1,11 +1,12 @@
 from anthill.framework.handlers.base import ContextMixin, TemplateMixin, TemplateHandler
-from anthill.framework.utils.asynchronous import thread_pool_exec as future_exec
 from anthill.framework.core.paginator import Paginator, InvalidPage
 from anthill.framework.core.exceptions import ImproperlyConfigured
 from anthill.framework.utils.translation import translate_lazy as _
+from anthill.framework.utils.text import slugify
 from anthill.framework.http.errors import Http404
 from sqlalchemy_utils import sort_query
 from sqlalchemy.orm import Query
+from operator import attrgetter
 
 
 class MultipleObjectMixin(ContextMixin):
@@ -18,21 +19,24 @@ class MultipleObjectMixin(ContextMixin):
     context_object_name = None
     paginator_class = Paginator
     page_kwarg = 'page'
+    cursor_kwarg = 'cursor'
     ordering = None
+    # Pagination mode: `page` (numbered pages, LIMIT/OFFSET)
+    # or `keyset` (opaque cursors, see `BaseQuery.paginate_after`).
+    pagination_mode = 'page'
 
     def get_queryset(self):
         """
         Return the list of items for this handler.
 
         The return value must be an iterable and may be an instance of
-        `QuerySet` in which case `QuerySet` specific behavior will be enabled.
+        `Query` in which case it is kept lazy, so ordering and
+        pagination are done by database.
         """
         if self.queryset is not None:
             queryset = self.queryset
-            if isinstance(queryset, Query):
-                queryset = queryset.all()
         elif self.model is not None:
-            queryset = self.model.query.all()
+            queryset = self.model.query
         else:
             raise ImproperlyConfigured(
                 "%(cls)s is missing a QuerySet. Define "
@@ -45,7 +49,12 @@ class MultipleObjectMixin(ContextMixin):
         if ordering:
             if isinstance(ordering, str):
                 ordering = (ordering,)
-            queryset = sort_query(queryset, *ordering)
+            if isinstance(queryset, Query):
+                queryset = sort_query(queryset, *ordering)
+            else:
+                queryset = list(queryset)
+                for field in reversed(ordering):
+                    queryset.sort(key=attrgetter(field.lstrip('-')), reverse=field.startswith('-'))
 
         return queryset
 
@@ -53,6 +62,16 @@ class MultipleObjectMixin(ContextMixin):
         """Return the field or fields to use for ordering the queryset."""
         return self.ordering
 
+    def paginate_queryset_after(self, queryset, page_size):
+        """Paginate the queryset by cursor."""
+        ordering = self.get_ordering() or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        cursor = self.path_kwargs.get(self.cursor_kwarg) or self.get_argument(self.cursor_kwarg, None)
+        page = queryset.paginate_after(cursor, ordering, page_size)
+        is_paginated = page.has_next or page.cursor is not None
+        return page, page.items, is_paginated
+
     def paginate_queryset(self, queryset, page_size):
         """Paginate the queryset, if needed."""
         paginator = self.get_paginator(
@@ -115,7 +134,15 @@ class MultipleObjectMixin(ContextMixin):
         queryset = object_list if object_list is not None else self.object_list
         page_size = self.get_paginate_by(queryset)
         context_object_name = self.get_context_object_name(queryset)
-        if page_size:
+        if page_size and self.pagination_mode == 'keyset' and isinstance(queryset, Query):
+            page, queryset, is_paginated = self.paginate_queryset_after(queryset, page_size)
+            context = {
+                'paginator': None,
+                'page_obj': page,
+                'is_paginated': is_paginated,
+                'object_list': queryset
+            }
+        elif page_size:
             paginator, page, queryset, is_paginated = self.paginate_queryset(queryset, page_size)
             context = {
                 'paginator': paginator,
@@ -147,7 +174,9 @@ class BaseListHandler(MultipleObjectMixin, TemplateHandler):
             # When pagination is enabled and object_list is a queryset,
             # it's better to do a cheap query than to load the unpaginated
             # queryset in memory.
-            if self.get_paginate_by(self.object_list) is not None and hasattr(self.object_list, 'exists'):
+            if isinstance(self.object_list, Query):
+                is_empty = self.object_list.limit(1).first() is None
+            elif self.get_paginate_by(self.object_list) is not None and hasattr(self.object_list, 'exists'):
                 is_empty = not self.object_list.exists()
             else:
                 is_empty = not self.object_list
@@ -169,18 +198,23 @@ class MultipleObjectTemplateMixin(TemplateMixin):
         a list. May not be called if render is overridden.
         """
         try:
-            names = super().get_template_names()
+            names = [super().get_template_name()]
         except ImproperlyConfigured:
             # If template_name isn't specified, it's not a problem --
             # we just start with an empty list.
             names = []
 
         # If the list is a queryset, we'll invent a template name based on the
-        # app and model name. This name gets put at the end of the template
+        # model name. This name gets put at the end of the template
         # name list so that user-supplied names override the automatically-
         # generated ones.
+        entity = None
         if isinstance(self.object_list, Query):
-            names.append("%s%s.html" % (opts.model_name, self.template_name_suffix))
+            entity = self.object_list.column_descriptions[0]['entity']
+        if entity is None:
+            entity = getattr(self, 'model', None)
+        if entity is not None:
+            names.append("%s%s.html" % (slugify(entity.__name__), self.template_name_suffix))
         elif not names:
             raise ImproperlyConfigured(
                 "%(cls)s requires either a 'template_name' attribute "
@@ -190,6 +224,10 @@ class MultipleObjectTemplateMixin(TemplateMixin):
             )
         return names
 
+    def get_template_name(self):
+        """Return the most specific template name."""
+        return self.get_template_names()[0]
+
 
 class ListHandler(MultipleObjectTemplateMixin, BaseListHandler):
     """
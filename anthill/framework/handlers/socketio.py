@@ -45,12 +45,12 @@ class SocketIOHandler(TranslationHandlerMixin, LogExceptionHandlerMixin, Session
         Called at the beginning of a request before websocket
         connection is opened.
         """
-        self.setup_session()
+        await self.asetup_session()
 
     async def on_message(self, message):
         """Handle incoming messages on the WebSocket."""
         await super().on_message(message)
-        self.update_session()
+        await self.aupdate_session()
 
     async def open(self, *args, **kwargs):
         """Invoked when a new WebSocket is opened."""
@@ -20,6 +20,10 @@ import binascii
 PHASE_BOUNDARY = 1
 PHASE_HEADERS = 2
 PHASE_BODY = 3
+PHASE_END = 4
+
+# Maximum size of single part headers
+MAX_HEADERS_SIZE = 64 * 1024
 
 RAW = 1
 FILE = 2
@@ -58,7 +62,7 @@ class StreamingMultiPartParser:
         ctypes, opts = _parse_header(content_type)
         boundary = opts.get('boundary')
         if not boundary or not cgi.valid_boundary(boundary):
-            raise MultiPartParserError('Invalid boundary in multipart: %s' % boundary.decode())
+            raise MultiPartParserError('Invalid boundary in multipart: %r' % boundary)
 
         # Content-Length should contain the length of the body we are about
         # to receive.
@@ -75,9 +79,11 @@ class StreamingMultiPartParser:
         if self.boundary.startswith('"') and self.boundary.endswith('"'):
             self.boundary = self.boundary[1:-1]
 
-        self._boundary_delimiter = "--{}\r\n".format(self.boundary).encode('ascii')
-        self._end_boundary = "\r\n--{}--\r\n".format(self.boundary).encode('ascii')
         self._boundary = self.boundary.encode('ascii')
+        # The first boundary may follow preamble,
+        # the others are preceded by CRLF that belongs to them.
+        self._first_delimiter = b"--" + self._boundary
+        self._part_delimiter = b"\r\n--" + self._boundary
 
         self.upload_handlers = upload_handlers
         self.content_length = content_length
@@ -86,14 +92,15 @@ class StreamingMultiPartParser:
         self.current_phase = PHASE_BOUNDARY
         self.current_field_type = RAW
 
-        self._buffer = b""
+        self._buffer = bytearray()
+        self._headers_search_start = 0
         self._data_size = 0
         self._field_name = None
         self._skip_field_name = None  # Tuple (field_name, upload_handler_index)
         self._transfer_encoding = None
         self._file_name = None
 
-        self._read_field_data = b""
+        self._read_field_data = bytearray()
 
         self.files = {}
         self.arguments = {}
@@ -154,14 +161,14 @@ class StreamingMultiPartParser:
                 self.files.setdefault(self._field_name, []).append(file_obj)
 
     async def complete_field(self):
-        data = self._read_field_data
+        data = bytes(self._read_field_data)
         # if self._transfer_encoding == 'base64':
         #     try:
         #         data = base64.b64decode(data)
         #     except binascii.Error:
         #         pass
         self.arguments.setdefault(self._field_name, []).append(data)
-        self._read_field_data = b""
+        self._read_field_data = bytearray()
 
     async def complete_part(self):
         if self.current_field_type == FILE:
@@ -175,101 +182,148 @@ class StreamingMultiPartParser:
             if await handler.complete():
                 break
 
-    async def data_received(self, chunk):
-        """Receive chunk of multipart/form-data."""
-        self._buffer += chunk
+    def _stop(self, message):
+        gen_log.warning(message)
+        self.current_phase = PHASE_END
+        self._buffer.clear()
+
+    async def _process_headers(self, headers):
+        """Parse part headers and prepare to receive part body."""
+        if headers:
+            headers = HTTPHeaders.parse(headers.decode(self.encoding))
+        else:
+            self._stop('multipart/form-data missing headers')
+            return
 
-        while True:
-            if self.current_phase == PHASE_BOUNDARY:
-                if len(self._buffer) > len(self._boundary_delimiter):
-                    if self._buffer.startswith(self._boundary_delimiter):
-                        self.current_phase = PHASE_HEADERS
-                        self._buffer = self._buffer[len(self._boundary_delimiter):]
-                    elif self._buffer.startswith(self._end_boundary):
-                        # TODO: Is it possible?
-                        return
-                    else:
-                        gen_log.warning('Invalid multipart/form-data')
-                        return
-                else:
-                    # Wait for next chunk
-                    return
+        if 'Content-Disposition' in headers:
+            self.current_field_type = FIELD
 
-            if self.current_phase == PHASE_HEADERS:
-                if b"\r\n\r\n" in self._buffer:
-                    headers, remaining_part = self._buffer.split(b"\r\n\r\n", 1)
+        disposition_header = headers.get('Content-Disposition', '')
+        disposition, disposition_params = _parse_header(disposition_header)
+        if disposition != 'form-data':
+            self._stop('Invalid multipart/form-data')
+            return
 
-                    if headers:
-                        headers = HTTPHeaders.parse(headers.decode(self.encoding))
-                    else:
-                        gen_log.warning('multipart/form-data missing headers')
-                        return
+        self.current_phase = PHASE_BODY
+        self._data_size = 0  # Reset data size counter before enter PHASE_BODY phase
 
-                    if 'Content-Disposition' in headers:
-                        self.current_field_type = FIELD
+        try:
+            field_name = disposition_params['name'].strip()
+        except (KeyError, IndexError, AttributeError):
+            self._stop('multipart/form-data missing field name')
+            return
+        field_name = force_text(field_name, self.encoding, errors='replace')
+        self._field_name = field_name
 
-                    disposition_header = headers.get('Content-Disposition', '')
-                    disposition, disposition_params = _parse_header(disposition_header)
-                    if disposition != 'form-data':
-                        gen_log.warning('Invalid multipart/form-data')
-                        return
+        self._transfer_encoding = headers.get('Content-Transfer-Encoding', '')
+
+        if 'filename' in disposition_params:
+            self.current_field_type = FILE
+
+        file_name = disposition_params.get('filename')
+        if file_name:
+            file_name = force_text(file_name, self.encoding, errors='replace')
+        self._file_name = file_name
+
+        if file_name:
+            content_type = headers.get('Content-Type', '')
+            content_type, content_type_extra = _parse_header(content_type)
+            charset = content_type_extra.get('charset')
+
+            try:
+                content_length = int(headers.get('Content-Length', 0))
+            except (TypeError, ValueError):
+                content_length = None
 
-                    self.current_phase = PHASE_BODY
+            await self.new_file(
+                field_name, file_name, content_type, content_length,
+                charset, content_type_extra)
 
-                    self._buffer = remaining_part
-                    self._data_size = 0  # Reset data size counter before enter PHASE_BODY phase
+    async def data_received(self, chunk):
+        """
+        Receive chunk of multipart/form-data.
+
+        Only the new chunk and a tail shorter than the boundary
+        delimiter are scanned, part body is passed to upload handlers
+        as soon as it is received, so memory usage is bounded by chunk size.
+        """
+        if self.current_phase == PHASE_END:
+            return
+
+        buffer = self._buffer
+        buffer += chunk
+
+        while True:
+            if self.current_phase == PHASE_BOUNDARY:
+                # Skip preamble up to the first boundary
+                delimiter = self._first_delimiter
+                idx = buffer.find(delimiter)
+                if idx == -1:
+                    del buffer[:max(0, len(buffer) - len(delimiter) + 1)]
+                    return
+                end = idx + len(delimiter)
+                if len(buffer) < end + 2:
+                    # Wait for next chunk
+                    return
+                tail = bytes(buffer[end:end + 2])
+                del buffer[:end + 2]
+                if tail == b"--":
+                    # Empty form
+                    self.current_phase = PHASE_END
+                    buffer.clear()
+                    return
+                if tail != b"\r\n":
+                    self._stop('Invalid multipart/form-data')
+                    return
+                self.current_phase = PHASE_HEADERS
+                self._headers_search_start = 0
 
-                    try:
-                        field_name = disposition_params['name'].strip()
-                    except (KeyError, IndexError, AttributeError):
+            if self.current_phase == PHASE_HEADERS:
+                idx = buffer.find(b"\r\n\r\n", self._headers_search_start)
+                if idx == -1:
+                    if len(buffer) > MAX_HEADERS_SIZE:
+                        self._stop('multipart/form-data part headers are too large')
                         return
-                    field_name = force_text(field_name, self.encoding, errors='replace')
-                    self._field_name = field_name
-
-                    self._transfer_encoding = headers.get('Content-Transfer-Encoding', '')
-
-                    if 'filename' in disposition_params:
-                        self.current_field_type = FILE
-
-                    file_name = disposition_params.get('filename')
-                    if file_name:
-                        file_name = force_text(file_name, self.encoding, errors='replace')
-                    self._file_name = file_name
-
-                    if file_name:
-                        content_type = headers.get('Content-Type', '')
-                        content_type, content_type_extra = _parse_header(content_type)
-                        charset = content_type_extra.get('charset')
-
-                        try:
-                            content_length = int(headers.get('Content-Length', 0))
-                        except (TypeError, ValueError):
-                            content_length = None
-
-                        await self.new_file(
-                            field_name, file_name, content_type, content_length,
-                            charset, content_type_extra)
-                else:
-                    # Wait for all headers for current file
+                    # Wait for all headers for current part,
+                    # the end of headers can be split between chunks
+                    self._headers_search_start = max(0, len(buffer) - 3)
+                    return
+                headers = bytes(buffer[:idx])
+                del buffer[:idx + 4]
+                self._headers_search_start = 0
+                await self._process_headers(headers)
+                if self.current_phase != PHASE_BODY:
                     return
 
             if self.current_phase == PHASE_BODY:
-                if self._boundary_delimiter in self._buffer:
-                    data, remaining_data = self._buffer.split(self._boundary_delimiter, 1)
-                    self._buffer = remaining_data
-                    await self.receive_data_chunk(data[:-2])
-                    await self.complete_part()
-                    self.current_phase = PHASE_HEADERS
-                    continue
-
-                elif self._end_boundary in self._buffer:
-                    remaining_data = self._buffer.split(self._end_boundary)[0]
-                    await self.receive_data_chunk(remaining_data)
-                    await self.complete_part()
+                delimiter = self._part_delimiter
+                idx = buffer.find(delimiter)
+                if idx == -1:
+                    # Delimiter can be split between chunks,
+                    # so keep the tail that can be its beginning.
+                    keep = len(delimiter) - 1
+                    if len(buffer) > keep:
+                        await self.receive_data_chunk(bytes(buffer[:len(buffer) - keep]))
+                        del buffer[:len(buffer) - keep]
                     return
-
-                else:
-                    if self._buffer:
-                        await self.receive_data_chunk(self._buffer)
-                    self._buffer = b""
+                end = idx + len(delimiter)
+                if len(buffer) < end + 2:
+                    if idx:
+                        await self.receive_data_chunk(bytes(buffer[:idx]))
+                        del buffer[:idx]
+                    # Wait for next chunk
+                    return
+                if idx:
+                    await self.receive_data_chunk(bytes(buffer[:idx]))
+                await self.complete_part()
+                tail = bytes(buffer[end:end + 2])
+                del buffer[:end + 2]
+                if tail == b"--":
+                    # Close delimiter, epilogue is ignored
+                    self.current_phase = PHASE_END
+                    buffer.clear()
+                    return
+                if tail != b"\r\n":
+                    self._stop('Invalid multipart/form-data')
                     return
+                self.current_phase = PHASE_HEADERS
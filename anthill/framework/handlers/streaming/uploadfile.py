@@ -4,6 +4,11 @@ from anthill.framework.core.files.storage import default_storage
 from anthill.framework.core.files.uploadhandler import load_handler
 from anthill.framework.handlers import RequestHandler
 from anthill.framework.handlers.streaming.multipartparser import StreamingMultiPartParser
+from anthill.framework.utils.asynchronous import thread_pool_exec
+import logging
+import time
+
+logger = logging.getLogger('anthill.application')
 
 
 # noinspection PyAttributeOutsideInit
@@ -13,6 +18,10 @@ class UploadFileStreamHandlerMixin:
 
     async def prepare(self):
         await super().prepare()
+        self.upload_metrics = {
+            'bytes_received': 0,
+            'started_at': time.monotonic(),
+        }
         self._content_type = self.request.headers.get('Content-Type', '')
         if self._content_type.startswith('multipart/form-data'):
             self.request.connection.set_max_body_size(self.max_upload_size)
@@ -22,6 +31,7 @@ class UploadFileStreamHandlerMixin:
             self.request.body_arguments = self.mp.arguments
 
     async def data_received(self, chunk):
+        self.upload_metrics['bytes_received'] += len(chunk)
         if self._content_type.startswith('multipart/form-data'):
             await self.mp.data_received(chunk)
 
@@ -51,13 +61,26 @@ class UploadFileStreamHandlerMixin:
         for files in self.request.files.values():
             for f in files:
                 f_name = self.filename_transform(f.name)
-                default_storage.save(f_name, f.file)
-                f.close()
+                await default_storage.asave(f_name, f.file)
+                await thread_pool_exec(f.close)
+
+    def on_upload_metrics(self, metrics):
+        """Called with upload metrics when uploading is finalized."""
+        logger.debug(
+            'Upload: %(bytes_received)s bytes received in %(receive_time).3fs '
+            '(%(throughput).0f B/s), stored in %(store_time).3fs' % metrics)
 
     async def post(self):
+        metrics = self.upload_metrics
+        received_at = time.monotonic()
         # Finalize uploading
         await self.process_files()
         await self.mp.complete()
+        finished_at = time.monotonic()
+        metrics['receive_time'] = received_at - metrics['started_at']
+        metrics['store_time'] = finished_at - received_at
+        metrics['throughput'] = metrics['bytes_received'] / max(metrics['receive_time'], 1e-6)
+        self.on_upload_metrics(metrics)
 
 
 @stream_request_body
@@ -1,7 +1,8 @@
-from tornado.websocket import WebSocketHandler
-from tornado.process import Subprocess
+from tornado.websocket import WebSocketHandler, WebSocketClosedError
 from tornado.escape import to_unicode
+from tornado.ioloop import IOLoop
 from anthill.framework.conf import settings
+from anthill.framework.utils import tail
 import logging
 
 __all__ = ['WatchFileHandler', 'WatchTextFileHandler', 'WatchLogFileHandler']
@@ -12,15 +13,21 @@ logger = logging.getLogger('anthill.application')
 class WatchFileHandler(WebSocketHandler):
     """
     Sends new data to WebSocket client while file changing.
+    File is followed by a tailer shared by all clients watching it.
     """
     streaming_finished_message = 'File streaming has finished up'
-    extra_args = []
     last_lines_limit = None
     filename = None
+    # Maximum number of lines queued for slow client and what to do
+    # on overflow: `drop_oldest`, `drop_newest` or `disconnect`.
+    queue_size = getattr(settings, 'WATCH_FILE_QUEUE_SIZE', 1000)
+    slow_consumer_policy = getattr(settings, 'WATCH_FILE_SLOW_CONSUMER_POLICY', tail.DROP_OLDEST)
+    # Number of last lines kept by tailer for new clients.
+    backlog = getattr(settings, 'WATCH_FILE_BACKLOG', 1000)
 
     def __init__(self, application, request, **kwargs):
         super().__init__(application, request, **kwargs)
-        self._process = None
+        self._subscription = None
 
     def initialize(self, filename=None, last_lines_limit=0):
         if filename is not None:
@@ -31,33 +38,48 @@ class WatchFileHandler(WebSocketHandler):
         return self.filename
 
     def open(self):
-        cmd = ['tail']
-        cmd += ['-n', str(self.last_lines_limit)]
-        cmd += self.extra_args
         try:
-            cmd += ['-f', self.get_filename()]
-            self._process = Subprocess(cmd, stdout=Subprocess.STREAM, bufsize=1)
+            self._subscription = tail.subscribe(
+                self.get_filename(),
+                last_lines=self.last_lines_limit or 0,
+                maxsize=self.queue_size,
+                policy=self.slow_consumer_policy,
+                backlog=self.backlog)
         except Exception as e:
             logger.error(str(e))
             self.close(reason=str(e))
         else:
-            self._process.set_exit_callback(self._close)
-            self._process.stdout.read_until(b'\n', self.write_line)
+            IOLoop.current().spawn_callback(self._stream)
+
+    async def _stream(self) -> None:
+        subscription = self._subscription
+        while True:
+            line = await subscription.get()
+            if line is None:
+                break
+            try:
+                # Wait for the message to be flushed, so lines
+                # for slow client are accumulated in subscription queue
+                await self.write_line(line)
+            except WebSocketClosedError:
+                return
+        if subscription.policy == tail.DISCONNECT and subscription.dropped:
+            self.close(reason='Client is too slow')
+        else:
+            self._close()
 
     def _close(self) -> None:
         self.close(reason=self.streaming_finished_message)
 
     def on_close(self, *args, **kwargs):
-        if self._process is not None:
-            self._process.proc.terminate()
-            self._process.proc.wait()
+        if self._subscription is not None:
+            self._subscription.close()
 
     def transform_output_data(self, data: bytes) -> bytes:
         return data
 
-    def write_line(self, data: bytes) -> None:
-        self.write_message(self.transform_output_data(data.strip()))
-        self._process.stdout.read_until(b'\n', self.write_line)
+    def write_line(self, data: bytes):
+        return self.write_message(self.transform_output_data(data.strip()))
 
     def check_origin(self, origin):
         return True
@@ -12,6 +12,8 @@ from anthill.framework.utils.crypto import (
 )
 from anthill.framework.utils.encoding import force_bytes
 from anthill.framework.utils.module_loading import import_string
+from anthill.framework.utils.asynchronous import thread_pool_exec, bounded_multi
+from tornado.ioloop import IOLoop
 
 # session_key should not be case sensitive because some backends can store it
 # on case insensitive file systems.
@@ -38,6 +40,9 @@ class SessionBase:
     TEST_COOKIE_NAME = 'testcookie'
     TEST_COOKIE_VALUE = 'worked'
 
+    # Whether session may be saved after the response is sent.
+    write_behind = True
+
     __not_given = object()
 
     def __init__(self, session_key=None):
@@ -151,6 +156,13 @@ class SessionBase:
             if not self.exists(session_key):
                 return session_key
 
+    async def _aget_new_session_key(self):
+        """Return session key that isn't being used."""
+        while True:
+            session_key = get_random_string(32, VALID_KEY_CHARS)
+            if not await self.aexists(session_key):
+                return session_key
+
     def _get_or_create_session_key(self):
         if self._session_key is None:
             self._session_key = self._get_new_session_key()
@@ -195,6 +207,20 @@ class SessionBase:
 
     _session = property(_get_session)
 
+    async def aload_session(self):
+        """
+        Load session data from storage without blocking the IOLoop,
+        so later access to the session doesn't touch the storage.
+        """
+        try:
+            return self._session_cache
+        except AttributeError:
+            if self.session_key is None:
+                self._session_cache = {}
+            else:
+                self._session_cache = await self.aload()
+        return self._session_cache
+
     def get_expiry_age(self, **kwargs):
         """
         Get the number of seconds until the session expires.
@@ -337,6 +363,38 @@ class SessionBase:
         """
         raise NotImplementedError('subclasses of SessionBase must provide a load() method')
 
+    # Asynchronous api. Default implementations run synchronous
+    # methods in thread pool, child classes may provide native ones.
+
+    async def aexists(self, session_key):
+        return await thread_pool_exec(self.exists, session_key)
+
+    async def acreate(self):
+        await thread_pool_exec(self.create)
+
+    async def asave(self, must_create=False):
+        await thread_pool_exec(self.save, must_create)
+
+    async def adelete(self, session_key=None):
+        await thread_pool_exec(self.delete, session_key)
+
+    async def aload(self):
+        return await thread_pool_exec(self.load)
+
+    @classmethod
+    async def arefresh_expiry_many(cls, sessions):
+        """
+        Refresh expiry of unmodified sessions.
+        Default implementation saves every session.
+        """
+        async def refresh(session):
+            try:
+                await session.asave()
+            except UpdateError:
+                pass
+
+        await bounded_multi([lambda s=s: refresh(s) for s in sessions], 10)
+
     @classmethod
     def clear_expired(cls):
         """
@@ -347,3 +405,43 @@ class SessionBase:
         a built-in expiration mechanism, it should be a no-op.
         """
         raise NotImplementedError('This backend does not support clear_expired().')
+
+
+class ExpiryRefresher:
+    """
+    Collects sessions whose expiry should be refreshed
+    and refreshes them in batches, once per `interval` seconds.
+    Refreshes of the same session are merged.
+    """
+
+    def __init__(self, interval=None):
+        self._interval = interval
+        self._pending = {}
+
+    @property
+    def interval(self):
+        if self._interval is None:
+            return getattr(settings, 'SESSION_REFRESH_INTERVAL', 5)
+        return self._interval
+
+    def add(self, session):
+        if session.session_key is None:
+            return
+        if not self._pending:
+            IOLoop.current().call_later(self.interval, self.flush)
+        self._pending[(session.__class__, session.session_key)] = session
+
+    async def flush(self):
+        pending, self._pending = self._pending, {}
+        groups = {}
+        for (store_class, _), session in pending.items():
+            groups.setdefault(store_class, []).append(session)
+        for store_class, sessions in groups.items():
+            try:
+                await store_class.arefresh_expiry_many(sessions)
+            except Exception:
+                logger = logging.getLogger('anthill.application')
+                logger.exception('Cannot refresh sessions expiry')
+
+
+expiry_refresher = ExpiryRefresher()
@@ -3,6 +3,7 @@ from anthill.framework.sessions.backends.base import (
     CreateError, SessionBase, UpdateError,
 )
 from anthill.framework.core.cache import caches
+from anthill.framework.utils.asynchronous import bounded_multi
 
 KEY_PREFIX = "anthill.framework.sessions.cache"
 
@@ -19,7 +20,10 @@ class SessionStore(SessionBase):
 
     @property
     def cache_key(self):
-        return '.'.join([self.cache_key_prefix, self._get_or_create_session_key()])
+        return self._get_cache_key(self._get_or_create_session_key())
+
+    def _get_cache_key(self, session_key):
+        return '.'.join([self.cache_key_prefix, session_key])
 
     def load(self):
         try:
@@ -67,14 +71,73 @@ class SessionStore(SessionBase):
             raise CreateError
 
     def exists(self, session_key):
-        return bool(session_key) and (self.cache_key_prefix + session_key) in self._cache
+        return bool(session_key) and self._get_cache_key(session_key) in self._cache
 
     def delete(self, session_key=None):
         if session_key is None:
             if self.session_key is None:
                 return
             session_key = self.session_key
-        self._cache.delete(self.cache_key_prefix + session_key)
+        self._cache.delete(self._get_cache_key(session_key))
+
+    async def aload(self):
+        try:
+            session_data = await self._cache.aget(self.cache_key)
+        except Exception:
+            session_data = None
+        if session_data is not None:
+            return session_data
+        self._session_key = None
+        return {}
+
+    async def acreate(self):
+        for i in range(10000):
+            self._session_key = await self._aget_new_session_key()
+            try:
+                await self.asave(must_create=True)
+            except CreateError:
+                continue
+            self.modified = True
+            return
+        raise RuntimeError(
+            "Unable to create a new session key. "
+            "It is likely that the cache is unavailable.")
+
+    async def asave(self, must_create=False):
+        if self.session_key is None:
+            return await self.acreate()
+        if must_create:
+            func = self._cache.aadd
+        elif await self._cache.aget(self.cache_key) is not None:
+            func = self._cache.aset
+        else:
+            raise UpdateError
+        result = await func(self.cache_key,
+                            self._get_session(no_load=must_create),
+                            self.get_expiry_age())
+        if must_create and not result:
+            raise CreateError
+
+    async def aexists(self, session_key):
+        return bool(session_key) and await self._cache.ahas_key(self._get_cache_key(session_key))
+
+    async def adelete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        await self._cache.adelete(self._get_cache_key(session_key))
+
+    @classmethod
+    async def arefresh_expiry_many(cls, sessions):
+        cache = caches[settings.SESSION_CACHE_ALIAS]
+        if not hasattr(cache, 'atouch'):
+            return await super().arefresh_expiry_many(sessions)
+        # Only expiration time is updated, session data is left as is.
+        await bounded_multi([
+            lambda s=s: cache.atouch(s.cache_key, s.get_expiry_age())
+            for s in sessions
+        ], 10)
 
     @classmethod
     def clear_expired(cls):
@@ -2,7 +2,9 @@ from anthill.framework.sessions.backends.base import (
     CreateError, SessionBase, UpdateError,
 )
 from anthill.framework.utils.functional import cached_property
+from anthill.framework.utils.asynchronous import thread_pool_exec
 from anthill.framework.utils import timezone
+from sqlalchemy.exc import IntegrityError
 import logging
 
 logger = logging.getLogger('anthill.application')
@@ -73,7 +75,22 @@ class SessionStore(SessionBase):
             return self.create()
         data = self._get_session(no_load=must_create)
         obj = self.create_model_instance(data)
-        obj.save(force_insert=must_create)
+        session = self.model.query.session
+        if must_create:
+            session.add(obj)
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                raise CreateError
+        else:
+            updated = self.model.query.filter_by(session_key=obj.session_key).update({
+                'session_data': obj.session_data,
+                'expire_date': obj.expire_date
+            }, synchronize_session=False)
+            session.commit()
+            if not updated:
+                raise UpdateError
 
     def delete(self, session_key=None):
         if session_key is None:
@@ -86,6 +103,19 @@ class SessionStore(SessionBase):
         s = self._get_session_from_db()
         return self.decode(s.session_data) if s else {}
 
+    @classmethod
+    async def arefresh_expiry_many(cls, sessions):
+        model = cls.get_model_class()
+
+        def refresh():
+            # Only expiration date is updated, session data is left as is.
+            for session in sessions:
+                model.query.filter_by(session_key=session.session_key).update(
+                    {'expire_date': session.get_expiry_date()}, synchronize_session=False)
+            model.query.session.commit()
+
+        await thread_pool_exec(refresh)
+
     @classmethod
     def clear_expired(cls):
         model = cls.get_model_class()
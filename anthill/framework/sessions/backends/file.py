@@ -10,6 +10,7 @@ from anthill.framework.sessions.backends.base import (
 )
 from anthill.framework.sessions.exceptions import InvalidSessionKey
 from anthill.framework.core.exceptions import ImproperlyConfigured, SuspiciousOperation
+from anthill.framework.utils.asynchronous import thread_pool_exec
 from anthill.framework.utils import timezone
 
 
@@ -183,6 +184,18 @@ class SessionStore(SessionBase):
     def clean(self):
         pass
 
+    @classmethod
+    async def arefresh_expiry_many(cls, sessions):
+        def refresh():
+            # Expiry is counted from the file modification time.
+            for session in sessions:
+                try:
+                    os.utime(session._key_to_file())
+                except (OSError, SuspiciousOperation):
+                    pass
+
+        await thread_pool_exec(refresh)
+
     @classmethod
     def clear_expired(cls):
         storage_path = cls._get_storage_path()
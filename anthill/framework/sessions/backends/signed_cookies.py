@@ -4,6 +4,9 @@ from anthill.framework.core import signing
 
 
 class SessionStore(SessionBase):
+    # Session data is stored in the cookie itself,
+    # so it must be saved before the cookie is set.
+    write_behind = False
 
     def load(self):
         """
@@ -41,6 +44,12 @@ class SessionStore(SessionBase):
         self._session_key = self._get_session_key()
         self.modified = True
 
+    async def aload(self):
+        return self.load()
+
+    async def asave(self, must_create=False):
+        self.save(must_create)
+
     def exists(self, session_key=None):
         """
         This method makes sense when you're talking to a shared resource, but
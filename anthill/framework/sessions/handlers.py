@@ -1,27 +1,107 @@
 from anthill.framework.utils.cache import patch_vary_headers
-from anthill.framework.core.exceptions import SuspiciousOperation
-from anthill.framework.sessions.backends.base import UpdateError
+from anthill.framework.sessions.backends.base import (
+    CreateError, UpdateError, VALID_KEY_CHARS, expiry_refresher)
+from anthill.framework.utils.crypto import get_random_string
 from anthill.framework.conf import settings
+from tornado.ioloop import IOLoop
 from importlib import import_module
+from functools import lru_cache
+import logging
 import time
 
+logger = logging.getLogger('anthill.application')
+
+
+@lru_cache()
+def get_session_store_class(engine):
+    return import_module(engine).SessionStore
+
 
 class SessionHandlerMixin:
     # noinspection PyAttributeOutsideInit
     def init_session(self):
-        session_engine = import_module(settings.SESSION_ENGINE)
-        self.SessionStore = session_engine.SessionStore
+        self.SessionStore = get_session_store_class(settings.SESSION_ENGINE)
 
     # noinspection PyAttributeOutsideInit
     def setup_session(self):
         session_key = self.get_cookie(settings.SESSION_COOKIE_NAME)
         self.session = self.SessionStore(session_key)
 
+    async def asetup_session(self):
+        """
+        Setup session with no data loaded. Data is loaded on first access,
+        or with `aload_session` by the code that needs the session.
+        """
+        self.setup_session()
+
+    async def aload_session(self):
+        """Load session data without blocking the IOLoop."""
+        await self.session.aload_session()
+
+    @property
+    def _session_write_behind(self):
+        return self.session.write_behind and getattr(settings, 'SESSION_WRITE_BEHIND', False)
+
+    def save_session(self):
+        """
+        Save session data. Return awaitable to wait for before the response
+        is finished, or None if session is saved after the response is sent.
+        """
+        session = self.session
+        if not self._session_write_behind:
+            return self._asave_session(session, must_create=False)
+        must_create = session.session_key is None
+        if must_create:
+            # Session key is required for the cookie right now.
+            session._session_key = get_random_string(32, VALID_KEY_CHARS)
+        IOLoop.current().spawn_callback(self._asave_session, session, must_create)
+
+    # noinspection PyMethodMayBeStatic
+    async def _asave_session(self, session, must_create):
+        try:
+            await session.asave(must_create=must_create)
+        except UpdateError:
+            logger.warning(
+                "The session was deleted before it was saved. The user may "
+                "have logged out in a concurrent request, for example.")
+        except CreateError:
+            logger.error("Cannot create session: key %s is already used." % session.session_key)
+        except Exception:
+            logger.exception('Cannot save session')
+
     @property
     def _is_websocket(self):
         return hasattr(self, 'ws_connection')
 
+    def _set_session_cookie(self, max_age, expires):
+        self.set_cookie(
+            settings.SESSION_COOKIE_NAME,
+            self.session.session_key,
+            max_age=max_age,
+            expires=expires,
+            domain=settings.SESSION_COOKIE_DOMAIN,
+            path=settings.SESSION_COOKIE_PATH,
+            secure=settings.SESSION_COOKIE_SECURE or None,
+            httponly=settings.SESSION_COOKIE_HTTPONLY or None
+        )
+
+    async def _asave_session_and_set_cookie(self, save, max_age, expires):
+        await save
+        if not self._is_websocket:
+            # Session key may be created or changed by the save.
+            self._set_session_cookie(max_age, expires)
+
+    async def aupdate_session(self):
+        """Update session and wait for its data to be saved."""
+        save = self.update_session()
+        if save is not None:
+            await save
+
     def update_session(self):
+        """
+        Return awaitable to wait for before the response is finished
+        if session must be saved, otherwise None.
+        """
         # If session was modified, or if the configuration is to save the
         # session every time, save the changes and set a session cookie or delete
         # the session cookie if the session has been emptied.
@@ -53,22 +133,13 @@ class SessionHandlerMixin:
                     # Save the session data and refresh the client cookie.
                     # Skip session save for 500 responses.
                     if self._status_code != 500:
-                        try:
-                            self.session.save()
-                        except UpdateError:
-                            raise SuspiciousOperation(
-                                "The request's session was deleted before the "
-                                "request completed. The user may have logged "
-                                "out in a concurrent request, for example."
-                            )
+                        save = None
+                        if modified or not self.session.write_behind:
+                            save = self.save_session()
+                        else:
+                            # Only expiry of unmodified session is refreshed.
+                            expiry_refresher.add(self.session)
+                        if save is not None:
+                            return self._asave_session_and_set_cookie(save, max_age, expires)
                         if not self._is_websocket:
-                            self.set_cookie(
-                                settings.SESSION_COOKIE_NAME,
-                                self.session.session_key,
-                                max_age=max_age,
-                                expires=expires,
-                                domain=settings.SESSION_COOKIE_DOMAIN,
-                                path=settings.SESSION_COOKIE_PATH,
-                                secure=settings.SESSION_COOKIE_SECURE or None,
-                                httponly=settings.SESSION_COOKIE_HTTPONLY or None
-                            )
+                            self._set_session_cookie(max_age, expires)
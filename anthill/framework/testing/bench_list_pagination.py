@@ -0,0 +1,98 @@
+"""
+Regression benchmark of list handlers pagination on 100k rows SQLite table.
+Memory per request should not depend on the table size and page position.
+
+Usage:
+    ANTHILL_SETTINGS_MODULE=<service>.settings \
+        python -m anthill.framework.testing.bench_list_pagination [rows]
+"""
+# Application is set up first, as by the management entry point.
+from anthill.framework.apps import app  # noqa
+from anthill.framework.db.sqlalchemy import BaseQuery, encode_cursor
+from anthill.framework.handlers.list import MultipleObjectMixin
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+import sqlalchemy as sa
+import tracemalloc
+import time
+import sys
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = 'item'
+    id = sa.Column(sa.Integer, primary_key=True)
+    title = sa.Column(sa.String(64), nullable=False)
+
+
+class ItemList(MultipleObjectMixin):
+    paginate_by = 20
+    ordering = ('-id',)
+
+    def __init__(self, queryset, pagination_mode, **path_kwargs):
+        self.queryset = queryset
+        self.pagination_mode = pagination_mode
+        self.path_kwargs = path_kwargs
+
+    def get_argument(self, name, default=None):
+        return default
+
+    def request(self):
+        queryset = self.get_queryset()
+        page_size = self.get_paginate_by(queryset)
+        if self.pagination_mode == 'keyset':
+            return self.paginate_queryset_after(queryset, page_size)[1]
+        return self.paginate_queryset(queryset, page_size)[2]
+
+
+class MaterializedItemList(ItemList):
+    """Previous behaviour: whole table is loaded, sorted and sliced in Python."""
+
+    def get_queryset(self):
+        return sorted(self.queryset.all(), key=lambda item: item.id, reverse=True)
+
+
+def create_session(rows):
+    engine = sa.create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    engine.execute(Item.__table__.insert(), [{'id': i, 'title': 'item %d' % i} for i in range(1, rows + 1)])
+    return sessionmaker(bind=engine, query_cls=BaseQuery)()
+
+
+def measure(session, handler_class, pagination_mode, repeat=5, **path_kwargs):
+    peaks, elapsed = [], 0
+    for _ in range(repeat):
+        session.expunge_all()
+        handler = handler_class(session.query(Item), pagination_mode, **path_kwargs)
+        tracemalloc.start()
+        started = time.perf_counter()
+        items = list(handler.request())
+        elapsed += time.perf_counter() - started
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert len(items) == handler.paginate_by
+    return max(peaks), elapsed / repeat
+
+
+def main(rows=100000):
+    session = create_session(rows)
+    last_page = rows // ItemList.paginate_by
+    cases = [
+        ('offset, first page', ItemList, 'page', {'page': 1}),
+        ('offset, middle page', ItemList, 'page', {'page': last_page // 2}),
+        ('offset, last page', ItemList, 'page', {'page': last_page}),
+        ('keyset, first page', ItemList, 'keyset', {}),
+        ('keyset, middle page', ItemList, 'keyset', {'cursor': encode_cursor([rows // 2])}),
+        ('keyset, last page', ItemList, 'keyset', {'cursor': encode_cursor([ItemList.paginate_by + 1])}),
+        ('materialized, first page', MaterializedItemList, 'page', {'page': 1}),
+    ]
+    print('%d rows, %d items per page' % (rows, ItemList.paginate_by))
+    print('%-26s %12s %10s' % ('case', 'peak memory', 'time'))
+    for name, handler_class, pagination_mode, path_kwargs in cases:
+        peak, elapsed = measure(session, handler_class, pagination_mode, **path_kwargs)
+        print('%-26s %9.1f KB %7.2f ms' % (name, peak / 1024, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
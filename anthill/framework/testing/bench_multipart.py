@@ -0,0 +1,84 @@
+"""
+Memory benchmark of streaming multipart parser on 1 GB file upload.
+Peak memory should be bounded by the chunk size, not by the upload size.
+
+Usage:
+    ANTHILL_SETTINGS_MODULE=<service>.settings \
+        python -m anthill.framework.testing.bench_multipart [size_mb]
+"""
+# Application is set up first, as by the management entry point.
+from anthill.framework.apps import app  # noqa
+from anthill.framework.core.files.uploadhandler import FileUploadHandler
+from anthill.framework.handlers.streaming.multipartparser import StreamingMultiPartParser
+from tornado.ioloop import IOLoop
+import tracemalloc
+import time
+import sys
+
+BOUNDARY = 'benchmarkboundary'
+CHUNK_SIZES = (16 * 1024, 64 * 1024, 1024 * 1024, 8 * 1024 * 1024)
+
+
+class CountingUploadHandler(FileUploadHandler):
+    """Discards received data, only counts it."""
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.received = 0
+
+    async def receive_data_chunk(self, raw_data):
+        self.received += len(raw_data)
+
+    async def complete_file(self, file_size):
+        return self.file_name
+
+
+def iter_body(size, chunk_size):
+    head = (
+        '--%s\r\n'
+        'Content-Disposition: form-data; name="file"; filename="upload.bin"\r\n'
+        'Content-Type: application/octet-stream\r\n\r\n' % BOUNDARY).encode('ascii')
+    tail = ('\r\n--%s--\r\n' % BOUNDARY).encode('ascii')
+    yield head
+    data = b'x' * chunk_size
+    sent = 0
+    while sent < size:
+        part = data[:size - sent]
+        sent += len(part)
+        yield part
+    yield tail
+
+
+async def measure(size, chunk_size):
+    headers = {
+        'Content-Type': 'multipart/form-data; boundary=%s' % BOUNDARY,
+        'Content-Length': str(size),
+    }
+    upload_handler = CountingUploadHandler()
+    parser = StreamingMultiPartParser(headers, [upload_handler])
+    body = iter_body(size, chunk_size)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for chunk in body:
+        await parser.data_received(chunk)
+    await parser.complete()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert upload_handler.received == size
+    assert parser.files == {'file': ['upload.bin']}
+    return peak, elapsed
+
+
+async def main(size_mb=1024):
+    size = size_mb * 1024 * 1024
+    print('%d MB file part' % size_mb)
+    print('%10s %14s %10s %12s' % ('chunk', 'peak memory', 'time', 'throughput'))
+    for chunk_size in CHUNK_SIZES:
+        peak, elapsed = await measure(size, chunk_size)
+        print('%7d KB %11.1f KB %8.2f s %7.1f MB/s' % (
+            chunk_size / 1024, peak / 1024, elapsed, size_mb / elapsed))
+
+
+if __name__ == '__main__':
+    IOLoop.current().run_sync(lambda: main(*map(int, sys.argv[1:])))
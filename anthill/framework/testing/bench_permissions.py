@@ -0,0 +1,70 @@
+"""
+Microbenchmark of permission checks with 1k permissions assigned to user:
+compiled permissions trie versus decoding json blobs on every check.
+
+Usage:
+    ANTHILL_SETTINGS_MODULE=<service>.settings \
+        python -m anthill.framework.testing.bench_permissions [checks]
+"""
+from anthill.framework.auth.backends.authorizer import DefaultPermissionVerifier, Permission
+import random
+import json
+import time
+import sys
+
+DOMAINS = 50
+ACTIONS = 10
+TARGETS = 2
+
+
+def create_blobs():
+    """Serialized permissions per domain, as kept by the permissions storage."""
+    blobs = {}
+    for d in range(DOMAINS):
+        parts = [{'domain': 'd%d' % d, 'action': ['a%d' % a], 'target': ['t%d' % t for t in range(TARGETS)]}
+                 for a in range(ACTIONS)]
+        blobs['d%d' % d] = json.dumps(parts)
+    blobs['*'] = json.dumps([{'domain': '*', 'action': ['view'], 'target': ['*']}])
+    return blobs
+
+
+def create_requests(count=1000):
+    rand = random.Random(0)
+    return ['d%d:a%d:t%d' % (rand.randrange(DOMAINS + 10), rand.randrange(ACTIONS + 2), rand.randrange(TARGETS + 1))
+            for _ in range(count)]
+
+
+def is_permitted_from_json(verifier, blobs, required):
+    """Previous behaviour: matching blobs are decoded for every check."""
+    domain = Permission.get_domain(required)
+    return any(verifier.is_permitted_from_json(required, blob)
+               for blob in (blobs.get('*'), blobs.get(domain)) if blob)
+
+
+def measure(check, requests, checks):
+    started = time.perf_counter()
+    for i in range(checks):
+        check(requests[i % len(requests)])
+    return checks / (time.perf_counter() - started)
+
+
+def main(checks=200000):
+    verifier = DefaultPermissionVerifier()
+    blobs = create_blobs()
+    requests = create_requests()
+    compiled = verifier.compile(blobs.values())
+
+    for required in requests:
+        assert compiled.implies(required) == is_permitted_from_json(verifier, blobs, required), required
+
+    permissions = DOMAINS * ACTIONS * TARGETS
+    print('%d permissions, %d distinct checks' % (permissions, len(requests)))
+    print('%-10s %14s' % ('path', 'checks/s'))
+    print('%-10s %14.0f' % ('compiled', measure(compiled.implies, requests, checks)))
+    json_checks = max(1, checks // 100)
+    print('%-10s %14.0f' % ('json', measure(
+        lambda required: is_permitted_from_json(verifier, blobs, required), requests, json_checks)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
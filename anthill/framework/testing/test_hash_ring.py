@@ -0,0 +1,66 @@
+from anthill.framework.utils.hash_ring import HashRing, ring_hash
+import unittest
+
+KEYS = ['key:%d' % i for i in range(10000)]
+
+
+def assignment(ring):
+    return {key: ring.get_node(key) for key in KEYS}
+
+
+class HashRingTest(unittest.TestCase):
+    def setUp(self):
+        self.ring = HashRing(['redis-0', 'redis-1', 'redis-2', 'redis-3'])
+
+    def test_add_node_moves_keys_only_to_new_node(self):
+        before = assignment(self.ring)
+        self.ring.add_node('redis-4')
+        after = assignment(self.ring)
+        moved = [key for key in KEYS if before[key] != after[key]]
+        for key in moved:
+            self.assertEqual(after[key], 'redis-4')
+        # About 1/N of keys should move
+        self.assertAlmostEqual(len(moved) / len(KEYS), 1 / 5, delta=0.05)
+
+    def test_remove_node_moves_keys_only_from_removed_node(self):
+        before = assignment(self.ring)
+        self.ring.remove_node('redis-1')
+        after = assignment(self.ring)
+        moved = [key for key in KEYS if before[key] != after[key]]
+        for key in moved:
+            self.assertEqual(before[key], 'redis-1')
+        self.assertEqual(len(moved), list(before.values()).count('redis-1'))
+        self.assertAlmostEqual(len(moved) / len(KEYS), 1 / 4, delta=0.05)
+        self.assertNotIn('redis-1', after.values())
+
+    def test_remove_node_restores_assignment(self):
+        before = assignment(self.ring)
+        self.ring.add_node('redis-4')
+        self.ring.remove_node('redis-4')
+        self.assertEqual(assignment(self.ring), before)
+
+    def test_add_node_back_restores_assignment(self):
+        before = assignment(self.ring)
+        self.ring.remove_node('redis-2')
+        self.ring.add_node('redis-2')
+        self.assertEqual(assignment(self.ring), before)
+
+    def test_wraparound_past_last_point(self):
+        last = self.ring.sorted_keys[-1]
+        key = next(key for key in ('wrap:%d' % i for i in range(100000))
+                   if ring_hash(key) > last)
+        node, pos = self.ring.get_node_pos(key)
+        self.assertEqual(pos, 0)
+        self.assertEqual(node, self.ring.ring[self.ring.sorted_keys[0]])
+        points = list(self.ring.iter_nodes(key))
+        self.assertEqual(points[0], (self.ring.sorted_keys[0], node))
+        self.assertEqual(len(points), len(self.ring.sorted_keys))
+
+    def test_empty_ring(self):
+        ring = HashRing()
+        self.assertIsNone(ring.get_node('key'))
+        self.assertEqual(list(ring.iter_nodes('key')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
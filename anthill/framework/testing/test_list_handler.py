@@ -0,0 +1,53 @@
+# Application is set up first, as by the management entry point.
+from anthill.framework.apps import app  # noqa
+from anthill.framework.core.exceptions import ImproperlyConfigured
+from anthill.framework.handlers.list import ListHandler
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Query
+from tornado.httputil import HTTPServerRequest
+from tornado.web import Application
+from unittest import mock
+import sqlalchemy as sa
+import unittest
+
+Base = declarative_base()
+
+
+class BlogPost(Base):
+    __tablename__ = 'blog_post'
+    id = sa.Column(sa.Integer, primary_key=True)
+
+
+class BlogPostListHandler(ListHandler):
+    model = BlogPost
+
+
+class ListHandlerTemplateNamesTest(unittest.TestCase):
+    def create_handler(self, handler_class, object_list, template_name=None):
+        request = HTTPServerRequest(method='GET', uri='/', connection=mock.Mock())
+        handler = handler_class(Application(), request, template_name=template_name)
+        handler.object_list = object_list
+        return handler
+
+    def test_query_without_template_name(self):
+        handler = self.create_handler(ListHandler, Query(BlogPost))
+        self.assertEqual(handler.get_template_names(), ['blogpost_list.html'])
+        self.assertEqual(handler.get_template_name(), 'blogpost_list.html')
+
+    def test_query_with_template_name(self):
+        handler = self.create_handler(ListHandler, Query(BlogPost), template_name='posts.html')
+        self.assertEqual(handler.get_template_names(), ['posts.html', 'blogpost_list.html'])
+        self.assertEqual(handler.get_template_name(), 'posts.html')
+
+    def test_model_with_list_of_objects(self):
+        handler = self.create_handler(BlogPostListHandler, [])
+        self.assertEqual(handler.get_template_name(), 'blogpost_list.html')
+
+    def test_list_without_template_name(self):
+        handler = self.create_handler(ListHandler, [])
+        with self.assertRaises(ImproperlyConfigured):
+            handler.get_template_name()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,12 @@ from tornado.concurrent import Future, chain_future
 from concurrent.futures import ThreadPoolExecutor
 from tornado.process import cpu_count
 from tornado.ioloop import IOLoop
+from tornado.locks import Semaphore
+from tornado.gen import multi
 from functools import wraps
 
 __all__ = [
-    'ThreadPoolExecution', 'thread_pool_exec', 'as_future'
+    'ThreadPoolExecution', 'thread_pool_exec', 'as_future', 'bounded_multi'
 ]
 
 
@@ -41,3 +43,17 @@ class ThreadPoolExecution:
 
 thread_pool_exec = ThreadPoolExecution()
 as_future = thread_pool_exec.as_future
+
+
+async def bounded_multi(funcs, concurrency):
+    """
+    Run coroutine functions concurrently, but not more
+    than `concurrency` at a time. Results are returned in order.
+    """
+    semaphore = Semaphore(concurrency)
+
+    async def run(func):
+        async with semaphore:
+            return await func()
+
+    return await multi([run(func) for func in funcs])
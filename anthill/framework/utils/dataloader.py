@@ -0,0 +1,129 @@
+"""
+Batching and caching of data loading.
+
+Keys requested within the same IOLoop iteration are loaded
+with a single call of batch load function:
+
+    async def load_users(ids):
+        # returns list of values in the order of ids
+        ...
+
+    loader = DataLoader(load_users)
+    user1, user2 = await multi([loader.load(1), loader.load(2)])
+"""
+from anthill.framework.utils.asynchronous import thread_pool_exec
+from tornado.concurrent import Future
+from tornado.ioloop import IOLoop
+from tornado.gen import multi
+
+__all__ = ['DataLoader', 'ModelLoader', 'DataLoaderRegistry']
+
+
+class DataLoader:
+    """
+    Loader is intended to be used within single request,
+    because loaded values are cached.
+    """
+
+    def __init__(self, batch_load_fn=None, max_batch_size=None, cache=True):
+        if batch_load_fn is not None:
+            self.batch_load = batch_load_fn
+        self.max_batch_size = max_batch_size
+        self.cache = cache
+        self._futures = {}
+        self._queue = []
+
+    async def batch_load(self, keys):
+        """Returns list of values in the order of keys."""
+        raise NotImplementedError
+
+    def load(self, key):
+        future = self._futures.get(key) if self.cache else None
+        if future is None:
+            future = Future()
+            if self.cache:
+                self._futures[key] = future
+            if not self._queue:
+                IOLoop.current().add_callback(self.dispatch)
+            self._queue.append((key, future))
+        return future
+
+    def load_many(self, keys):
+        return multi([self.load(key) for key in keys])
+
+    def prime(self, key, value):
+        if key not in self._futures:
+            future = Future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def clear(self, key=None):
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(key, None)
+
+    async def dispatch(self):
+        queue, self._queue = self._queue, []
+        size = self.max_batch_size or len(queue)
+        await multi([self._dispatch_batch(queue[i:i + size]) for i in range(0, len(queue), size)])
+
+    async def _dispatch_batch(self, batch):
+        keys = [key for key, _ in batch]
+        try:
+            values = await self.batch_load(keys)
+            if len(values) != len(keys):
+                raise ValueError(
+                    'Batch load function must return a list of the same length as keys')
+        except Exception as e:
+            for key, future in batch:
+                self._futures.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (key, future), value in zip(batch, values):
+            if not future.done():
+                future.set_result(value)
+
+
+class ModelLoader(DataLoader):
+    """Loads SQLAlchemy model objects by column values with single `IN` query."""
+
+    def __init__(self, model, column='id', **kwargs):
+        super().__init__(**kwargs)
+        self.model = model
+        self.column = column
+
+    async def batch_load(self, keys):
+        column = getattr(self.model, self.column)
+        query = self.model.query.filter(column.in_(set(keys)))
+        objects = await thread_pool_exec(query.all)
+        objects = {getattr(obj, self.column): obj for obj in objects}
+        return [objects.get(key) for key in keys]
+
+
+class DataLoaderRegistry:
+    """Per-request registry of data loaders."""
+
+    def __init__(self):
+        self._loaders = {}
+
+    def get(self, name, batch_load_fn=None, **kwargs):
+        """Returns loader registered with the name, creating it if needed."""
+        loader = self._loaders.get(name)
+        if loader is None:
+            if batch_load_fn is None:
+                raise KeyError('Data loader `%s` is not registered' % name)
+            loader = self._loaders[name] = DataLoader(batch_load_fn, **kwargs)
+        return loader
+
+    def model(self, model, column='id', **kwargs):
+        """Returns loader of model objects by column."""
+        key = (model, column)
+        loader = self._loaders.get(key)
+        if loader is None:
+            loader = self._loaders[key] = ModelLoader(model, column, **kwargs)
+        return loader
+
+    def register(self, name, loader):
+        self._loaders[name] = loader
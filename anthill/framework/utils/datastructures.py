@@ -1,4 +1,5 @@
 import copy
+import time
 from collections import OrderedDict
 
 
@@ -275,3 +276,52 @@ class DictWrapper(dict):
         if use_func:
             return self.func(value)
         return value
+
+
+class LRUCache:
+    """
+    A dict-like storage of limited size with optional entries expiration.
+    Least recently used entries are evicted first.
+    """
+    _missing = object()
+
+    def __init__(self, max_size=1000, timeout=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value, expire_at = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        expire_at = time.monotonic() + timeout if timeout else None
+        self._data[key] = (value, expire_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, self._missing) is not self._missing
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,80 @@
+"""
+Consistent hashing ring (ketama-like).
+
+Every node is placed on the ring at `replicas` points, a key belongs to the
+first node point found clockwise from the key hash. Adding or removing
+a node moves only the keys that belong to that node.
+"""
+import bisect
+import hashlib
+
+__all__ = ['HashRing', 'ring_hash']
+
+
+def ring_hash(key):
+    """Returns 64-bit integer hash of the key."""
+    if not isinstance(key, bytes):
+        key = str(key).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    def __init__(self, nodes=(), replicas=128):
+        self.replicas = replicas
+        self.nodes = []
+        self.ring = {}
+        self.sorted_keys = []
+        self._ring_nodes = []
+
+        for node in nodes:
+            self.add_node(node)
+
+    def _node_hashes(self, node):
+        return [ring_hash('%s:%d' % (node, x)) for x in range(self.replicas)]
+
+    def _update(self):
+        self.sorted_keys = sorted(self.ring)
+        self._ring_nodes = [self.ring[k] for k in self.sorted_keys]
+
+    def add_node(self, node):
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for _hash in self._node_hashes(node):
+            self.ring[_hash] = node
+        self._update()
+
+    def remove_node(self, node):
+        self.nodes.remove(node)
+        for _hash in self._node_hashes(node):
+            if self.ring.get(_hash) == node:
+                del self.ring[_hash]
+        self._update()
+
+    def get_node(self, key):
+        n, i = self.get_node_pos(key)
+        return n
+
+    def get_node_pos(self, key):
+        if not self.ring:
+            return None, None
+
+        idx = bisect.bisect(self.sorted_keys, ring_hash(key))
+        if idx == len(self.sorted_keys):
+            idx = 0
+        return self._ring_nodes[idx], idx
+
+    def iter_nodes(self, key):
+        """Iterates over ring points clockwise starting from the key position."""
+        if not self.ring:
+            return
+
+        node, pos = self.get_node_pos(key)
+        for k in self.sorted_keys[pos:] + self.sorted_keys[:pos]:
+            yield k, self.ring[k]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __call__(self, key):
+        return self.get_node(key)
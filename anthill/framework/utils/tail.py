@@ -0,0 +1,310 @@
+"""
+Asynchronous file tailer.
+
+Single tailer is shared by all subscribers of the same file,
+new lines are fanned out to every subscriber queue.
+File changes are detected with inotify on Linux, polling is used otherwise.
+
+Usage:
+    from anthill.framework.utils.tail import subscribe
+
+    subscription = subscribe('/var/log/app.log', last_lines=10)
+    try:
+        while True:
+            line = await subscription.get()
+            if line is None:
+                # Subscription closed
+                break
+            ...
+    finally:
+        subscription.close()
+"""
+from tornado.ioloop import IOLoop, PeriodicCallback
+from tornado.locks import Condition
+from collections import deque
+import ctypes
+import ctypes.util
+import logging
+import os
+import sys
+
+__all__ = [
+    'FileTailer', 'Subscription', 'subscribe',
+    'DROP_OLDEST', 'DROP_NEWEST', 'DISCONNECT'
+]
+
+logger = logging.getLogger('anthill.application')
+
+# Slow consumer policies
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+DISCONNECT = 'disconnect'
+
+_tailers = {}
+
+
+class _Inotify:
+    """Minimal inotify binding based on ctypes."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.wd = None
+
+    def watch(self, path):
+        if self.wd is not None:
+            self._libc.inotify_rm_watch(self.fd, self.wd)
+            self.wd = None
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.wd = wd
+
+    def read_events(self):
+        """Drain pending events, only the fact of the change matters."""
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+class Subscription:
+    """Bounded queue of lines for a single subscriber."""
+
+    def __init__(self, tailer, maxsize=1000, policy=DROP_OLDEST):
+        if policy not in (DROP_OLDEST, DROP_NEWEST, DISCONNECT):
+            raise ValueError('Unknown slow consumer policy: %s' % policy)
+        self.tailer = tailer
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._lines = deque()
+        self._condition = Condition()
+
+    def put(self, line):
+        if self.closed:
+            return
+        if self.maxsize and len(self._lines) >= self.maxsize:
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return
+            if self.policy == DISCONNECT:
+                logger.warning('Slow tail subscriber of %s disconnected' % self.tailer.path)
+                self.close()
+                return
+            self._lines.popleft()
+        self._lines.append(line)
+        self._condition.notify()
+
+    async def get(self):
+        """Wait for the next line. Returns None if subscription is closed."""
+        while not self._lines:
+            if self.closed:
+                return None
+            await self._condition.wait()
+        return self._lines.popleft()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._lines.clear()
+        self._condition.notify_all()
+        self.tailer.unsubscribe(self)
+
+
+class FileTailer:
+    """
+    Follows the file and sends new lines to subscribers.
+    Handles file truncation and rotation.
+    """
+
+    def __init__(self, path, backlog=1000, poll_interval=1.0, read_size=64 * 1024):
+        self.path = path
+        self.backlog = deque(maxlen=backlog)
+        self.poll_interval = poll_interval
+        self.read_size = read_size
+        self.subscribers = set()
+        self._file = None
+        self._inode = None
+        self._partial = b''
+        self._inotify = None
+        self._poller = None
+
+    @property
+    def running(self):
+        return self._poller is not None
+
+    def start(self):
+        if self.running:
+            return
+        self._open(from_end=True)
+        self._read_backlog()
+        poll_interval = self.poll_interval
+        if sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify()
+                self._inotify.watch(self.path)
+            except (OSError, AttributeError) as e:
+                logger.warning('Inotify is not available, polling %s: %s' % (self.path, e))
+                self._inotify = None
+            else:
+                IOLoop.current().add_handler(self._inotify.fd, self._on_inotify, IOLoop.READ)
+                # Polling is kept to catch file rotation
+                poll_interval *= 5
+        self._poller = PeriodicCallback(self._check, poll_interval * 1000)
+        self._poller.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self._poller.stop()
+        self._poller = None
+        if self._inotify is not None:
+            IOLoop.current().remove_handler(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        for subscription in list(self.subscribers):
+            subscription.close()
+
+    def subscribe(self, last_lines=0, maxsize=1000, policy=DROP_OLDEST):
+        subscription = Subscription(self, maxsize, policy)
+        if last_lines > self.backlog.maxlen:
+            self._grow_backlog(last_lines)
+        if not self.running:
+            self.start()
+        if maxsize:
+            # Backlog should not overflow the new subscriber
+            last_lines = min(last_lines, maxsize)
+        if last_lines:
+            for line in list(self.backlog)[-last_lines:]:
+                subscription.put(line)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+        if not self.subscribers:
+            self.stop()
+            if _tailers.get(self.path) is self:
+                del _tailers[self.path]
+
+    def _open(self, from_end=False):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError:
+            self._inode = None
+            return
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._partial = b''
+        if from_end:
+            self._file.seek(0, os.SEEK_END)
+
+    def _read_backlog(self):
+        """Read last lines of the file into backlog."""
+        if self._file is None or not self.backlog.maxlen:
+            return
+        end = self._file.tell()
+        pos, data = end, b''
+        while pos > 0 and data.count(b'\n') <= self.backlog.maxlen:
+            size = min(self.read_size, pos)
+            pos -= size
+            self._file.seek(pos)
+            data = self._file.read(size) + data
+        self._file.seek(end)
+        lines = data.split(b'\n')
+        # The last element is an incomplete line (or empty one)
+        self._partial = lines.pop()
+        if pos > 0:
+            # The first line may be cut
+            lines = lines[1:]
+        self.backlog.extend(lines)
+
+    def _grow_backlog(self, size):
+        self.backlog = deque(self.backlog, maxlen=size)
+        if self.running and self._file is not None:
+            # Lines dropped by the smaller backlog are read again
+            self.backlog.clear()
+            self._read_backlog()
+
+    def _on_inotify(self, fd, events):
+        self._inotify.read_events()
+        self._check()
+
+    def _check(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            # File is removed, wait for it to be created again
+            return
+        if self._file is None or stat.st_ino != self._inode:
+            # File is rotated, read the rest of the old one and reopen
+            self._read()
+            if not self.running:
+                # Last subscriber is gone while reading
+                return
+            self._open()
+            if self._inotify is not None:
+                try:
+                    self._inotify.watch(self.path)
+                except OSError as e:
+                    logger.warning(str(e))
+        elif stat.st_size < self._file.tell():
+            # File is truncated
+            self._file.seek(0)
+            self._partial = b''
+        self._read()
+
+    def _read(self):
+        if self._file is None:
+            return
+        while True:
+            data = self._file.read(self.read_size)
+            if not data:
+                return
+            lines = (self._partial + data).split(b'\n')
+            self._partial = lines.pop()
+            for line in lines:
+                self._publish(line)
+            if self._file is None:
+                # Tailer is stopped by the last subscriber disconnected
+                return
+
+    def _publish(self, line):
+        self.backlog.append(line)
+        for subscription in list(self.subscribers):
+            subscription.put(line)
+
+
+def subscribe(path, last_lines=0, maxsize=1000, policy=DROP_OLDEST, backlog=1000):
+    """Subscribe to new lines of the file, tailer is shared for the same path."""
+    path = os.path.abspath(path)
+    tailer = _tailers.get(path)
+    if tailer is None:
+        tailer = _tailers[path] = FileTailer(path, backlog=max(backlog, last_lines))
+    return tailer.subscribe(last_lines, maxsize, policy)
@@ -1,7 +1,8 @@
-from tornado.gen import with_timeout
+from tornado.gen import with_timeout, multi
 from tornado.util import TimeoutError
 from tornado.ioloop import IOLoop
 from tornado.concurrent import Future
+from tornado.locks import Semaphore
 from tornado.escape import utf8
 
 from anthill.framework.testing.timing import ElapsedTime
@@ -13,9 +14,9 @@ import datetime
 
 from anthill.framework.core.jsonrpc.exceptions import JSONRPCInvalidRequestException
 from anthill.framework.core.jsonrpc.jsonrpc import JSONRPCRequest
+from anthill.framework.core.jsonrpc.jsonrpc2 import JSONRPC20BatchRequest
 from anthill.framework.core.jsonrpc.manager import JSONRPCResponseManager
 from anthill.framework.core.jsonrpc.dispatcher import Dispatcher
-from anthill.framework.utils.asynchronous import as_future
 from anthill.framework.core.cache import cache
 from anthill.framework.conf import settings
 
@@ -24,7 +25,8 @@ import inspect
 import json
 import logging
 import hashlib
-import copy
+import collections
+import time
 
 __all__ = [
     'BaseInternalConnection', 'InternalConnection', 'JSONRPCInternalConnection',
@@ -38,7 +40,14 @@ logger = logging.getLogger('anthill.application')
 
 DEFAULT_CACHE_TIMEOUT = getattr(settings, 'INTERNAL_DEFAULT_CACHE_TIMEOUT', 300)
 INTERNAL_REQUEST_CACHING = getattr(settings, 'INTERNAL_REQUEST_CACHING', True)
+INTERNAL_REQUEST_CACHE_STALE_TIMEOUT = getattr(settings, 'INTERNAL_REQUEST_CACHE_STALE_TIMEOUT', 0)
 INTERNAL_API_METHOD_CACHING = getattr(settings, 'INTERNAL_API_METHOD_CACHING', False)
+INTERNAL_CONCURRENT_DISPATCH = getattr(settings, 'INTERNAL_CONCURRENT_DISPATCH', True)
+INTERNAL_DISPATCH_CONCURRENCY = getattr(settings, 'INTERNAL_DISPATCH_CONCURRENCY', 100)
+INTERNAL_DISPATCH_METHOD_CONCURRENCY = getattr(settings, 'INTERNAL_DISPATCH_METHOD_CONCURRENCY', {})
+INTERNAL_REQUEST_BATCHING = getattr(settings, 'INTERNAL_REQUEST_BATCHING', False)
+INTERNAL_REQUEST_BATCH_WINDOW = getattr(settings, 'INTERNAL_REQUEST_BATCH_WINDOW', 0)
+INTERNAL_REQUEST_BATCH_MAX_SIZE = getattr(settings, 'INTERNAL_REQUEST_BATCH_MAX_SIZE', 100)
 
 
 def cache_key(service, method, postfix=None):
@@ -48,7 +57,96 @@ def cache_key(service, method, postfix=None):
     return '.'.join(parts)
 
 
-def _cached(key, timeout):
+def args_hash(args, kwargs) -> str:
+    """
+    Return hash of call arguments.
+    Arguments are serialized canonically, so equal calls
+    give the same hash regardless of keyword arguments order.
+    """
+    data = json.dumps([args, kwargs], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(utf8(data), digest_size=16).hexdigest()
+
+
+class CacheStats:
+    """Cache hits and misses counters per service method."""
+
+    def __init__(self):
+        self._stats = collections.defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def hit(self, service, method):
+        self._stats[(service, method)]['hits'] += 1
+
+    def miss(self, service, method):
+        self._stats[(service, method)]['misses'] += 1
+
+    def as_dict(self):
+        return {'.'.join(k): v.copy() for k, v in self._stats.items()}
+
+    def clear(self):
+        self._stats.clear()
+
+
+# Internal requests caching statistics
+request_cache_stats = CacheStats()
+# Internal api methods caching statistics
+method_cache_stats = CacheStats()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key:
+    the first caller performs the call, others await its result.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    def __contains__(self, key):
+        return key in self._calls
+
+    async def do(self, key, func, *args, **kwargs):
+        future = self._calls.get(key)
+        if future is not None:
+            return await future
+        future = self._calls[key] = Future()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark exception as retrieved, it is raised to the first caller anyway
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if not future.done():
+                future.cancel()
+
+
+_single_flight = SingleFlight()
+
+
+def _pack(value, timeout):
+    return {'__swr__': True, 'value': value, 'fresh_until': time.time() + timeout}
+
+
+def _unpack(packed):
+    """Return cached value and whether it is stale."""
+    if isinstance(packed, dict) and packed.get('__swr__'):
+        return packed['value'], packed['fresh_until'] < time.time()
+    return packed, False
+
+
+def _cached(key, timeout, stale_timeout=0):
+    """
+    Internal requests caching decorator.
+    Concurrent identical requests are coalesced, so only one of them
+    is actually performed on cache miss.
+    If `stale_timeout` is set, expired value is kept for `stale_timeout`
+    seconds more and returned while it is refreshed in background.
+    """
     def decorator(func):
         @wraps(func)
         async def wrapper(conn, service, method, *args, **kwargs):
@@ -56,18 +154,37 @@ def _cached(key, timeout):
             if not caching:
                 return await func(conn, service, method, *args, **kwargs)
             timeout_ = kwargs.pop('cache_timeout', timeout)
-            postfix = hashlib.md5(utf8(str(args) + str(kwargs))).hexdigest()
+            postfix = args_hash(args, kwargs)
             k = key(service, method, postfix) if callable(key) else key
-            result = await as_future(cache.get)(k)
+
+            async def fetch():
+                result_ = await func(conn, service, method, *args, **kwargs)
+                if stale_timeout:
+                    await cache.aset(k, _pack(result_, timeout_), timeout_ + stale_timeout)
+                else:
+                    await cache.aset(k, result_, timeout_)
+                return result_
+
+            async def refresh():
+                try:
+                    await _single_flight.do(k, fetch)
+                except Exception as e:
+                    logger.warning('Cannot refresh cached result of %s@%s: %s', method, service, e)
+
+            result, stale = _unpack(await cache.aget(k))
             if result is None:
-                result = await func(conn, service, method, *args, **kwargs)
-                await as_future(cache.set)(k, result, timeout_)
+                request_cache_stats.miss(service, method)
+                return await _single_flight.do(k, fetch)
+            request_cache_stats.hit(service, method)
+            if stale and k not in _single_flight:
+                IOLoop.current().spawn_callback(refresh)
             return result
         return wrapper
     return decorator
 
 
-cached = _cached(key=cache_key, timeout=DEFAULT_CACHE_TIMEOUT)
+cached = _cached(key=cache_key, timeout=DEFAULT_CACHE_TIMEOUT,
+                 stale_timeout=INTERNAL_REQUEST_CACHE_STALE_TIMEOUT)
 
 
 class InternalAPIError(Exception):
@@ -120,10 +237,9 @@ class InternalAPI(Singleton):
 
         def decorator(func):
             def get_cache_key(api_, *args, **kwargs):
-                kwargs = copy.deepcopy(kwargs)
-                del kwargs['service']
+                kwargs = {k: v for k, v in kwargs.items() if k != 'service'}
                 method = func.__name__
-                postfix = hashlib.md5(utf8(str(args) + str(kwargs))).hexdigest()
+                postfix = args_hash(args, kwargs)
                 key = cache_key(self.service.name, method, postfix) if callable(cache_key) else cache_key
                 return key
 
@@ -132,16 +248,18 @@ class InternalAPI(Singleton):
                     key = None
                     if enable_cache:
                         key = get_cache_key(api_, *args, **kwargs)
-                        result = await as_future(cache.get)(key)
+                        result = await cache.aget(key)
                         if result:
+                            method_cache_stats.hit(self.service.name, func.__name__)
                             return result
+                        method_cache_stats.miss(self.service.name, func.__name__)
                     try:
                         result = await func(api_, *args, **kwargs)
                     except Exception as e:
                         return {'error': {'message': str(e)}}
                     else:
                         if enable_cache:
-                            await as_future(cache.set)(key, result, cache_timeout)
+                            await cache.aset(key, result, cache_timeout)
                         return result
             else:
                 def wrapper(api_, *args, **kwargs):
@@ -169,15 +287,34 @@ class BaseInternalConnection(Singleton):
     message_type = 'internal'
     channel_alias = 'internal'
     channel_group_name_prefix = 'internal'
+    # Pseudo service name all services are subscribed to.
+    broadcast_name = '__all__'
     request_timeout = 10
+    # Incoming requests are processed as separate tasks,
+    # so one slow method does not block other requests and responses.
+    concurrent_dispatch = INTERNAL_CONCURRENT_DISPATCH
+    # Maximum number of requests processed at the same time.
+    dispatch_concurrency = INTERNAL_DISPATCH_CONCURRENCY
+    # Maps method names to its own concurrency limits.
+    dispatch_method_concurrency = INTERNAL_DISPATCH_METHOD_CONCURRENCY
 
     def __init__(self, service=None):
         self.channel_layer = None
         self.channel_name = None
         self.channel_receive = None
+        # Responses are received from the separate channel,
+        # so they are not blocked by requests waiting for dispatch.
+        self.reply_channel_name = None
+        self.reply_channel_receive = None
         self.service = service
         self._responses = {}
         self._current_request_id = 0
+        self._loop = None
+        self._dispatch_semaphore = Semaphore(self.dispatch_concurrency)
+        self._method_semaphores = {
+            method: Semaphore(limit)
+            for method, limit in self.dispatch_method_concurrency.items()
+        }
         super().__init__()
 
     def channel_group_name(self, service=None) -> str:
@@ -191,15 +328,71 @@ class BaseInternalConnection(Singleton):
                 message = await self.channel_receive()
                 if not message.get('type', None):
                     raise ValueError('Worker received message with no type.')
+                if self.concurrent_dispatch and self.is_request(message):
+                    # Every batch member is limited by its own method semaphore
+                    # and responded separately, so slow methods do not delay the rest.
+                    for request in self.split_request(message):
+                        # Next messages are not received until the slot is free,
+                        # so the burst of requests does not pile up in memory.
+                        await self._dispatch_semaphore.acquire()
+                        IOLoop.current().spawn_callback(self.dispatch, request)
+                else:
+                    # Results and errors are delivered in order of receiving.
+                    await self.on_message(message)
+
+    async def reply_channel_receive_callback(self) -> None:
+        """Responses listener callback."""
+        while True:
+            message = await self.reply_channel_receive()
+            # Results and errors are delivered in order of receiving.
+            await self.on_message(message)
+
+    async def dispatch(self, message: dict) -> None:
+        """
+        Process incoming request message within method concurrency limits.
+        Dispatch slot acquired by the receiving loop is released when done.
+        """
+        method = self.request_method(message)
+        method_semaphore = self._method_semaphores.get(method)
+        try:
+            if method_semaphore is not None:
+                async with method_semaphore:
+                    await self.on_message(message)
+            else:
                 await self.on_message(message)
+        except Exception:
+            logger.exception('Internal request `%s` processing failed.', method)
+        finally:
+            self._dispatch_semaphore.release()
+
+    def is_request(self, message: dict) -> bool:
+        """Check if message is a request (not a response)."""
+        return False
+
+    def request_method(self, message: dict) -> Optional[str]:
+        """
+        Return requested method name if message is a single request,
+        otherwise return None.
+        """
+        return None
+
+    def split_request(self, message: dict) -> list:
+        """Split batch request message into single request messages."""
+        return [message]
 
     async def connect(self) -> None:
+        self._loop = IOLoop.current()
         IOLoop.current().add_callback(self.channel_receive_callback)
         self.channel_layer = get_channel_layer(alias=self.channel_alias)
         if self.channel_layer is not None:
             self.channel_name = await self.channel_layer.new_channel(prefix=self.service.app.label)
             self.channel_receive = partial(self.channel_layer.receive, self.channel_name)
+            self.reply_channel_name = await self.channel_layer.new_channel(prefix=self.service.app.label)
+            self.reply_channel_receive = partial(self.channel_layer.receive, self.reply_channel_name)
+            IOLoop.current().spawn_callback(self.reply_channel_receive_callback)
             await self.channel_layer.group_add(self.channel_group_name(), self.channel_name)
+            await self.channel_layer.group_add(
+                self.channel_group_name(self.broadcast_name), self.channel_name)
             logger.debug('Internal api connection status: CONNECTED.')
         else:
             logger.debug('Internal api connection status: NOT_CONNECTED.')
@@ -207,6 +400,8 @@ class BaseInternalConnection(Singleton):
     async def disconnect(self) -> None:
         await self.channel_layer.group_discard(
             self.channel_group_name(), self.channel_name)
+        await self.channel_layer.group_discard(
+            self.channel_group_name(self.broadcast_name), self.channel_name)
         logger.debug('Internal api connection status: DISCONNECTED.')
 
     async def group_send(self, service: str, message: dict) -> None:
@@ -242,29 +437,73 @@ class BaseInternalConnection(Singleton):
         """Request for method and wait for result."""
         raise NotImplementedError
 
+    async def request_many(self, service: str, calls: list, timeout: int = None, **kwargs) -> list:
+        """Request for several methods at once and wait for results."""
+        raise NotImplementedError
+
     async def push(self, service: str, method: str, **kwargs) -> None:
         """Request for method with no wait for result."""
         raise NotImplementedError
 
+    async def broadcast(self, method: str, **kwargs) -> None:
+        """Request for method of all services with no wait for result."""
+        await self.push(self.broadcast_name, method, **kwargs)
+
+    def broadcast_threadsafe(self, method: str, **kwargs) -> None:
+        """Version of `broadcast` safe to call from any thread."""
+        if self._loop is not None:
+            self._loop.add_callback(self.broadcast, method, **kwargs)
+
 
 class JSONRPCInternalConnection(BaseInternalConnection):
     message_type = 'internal_json_rpc'
     json_rpc_ver = '2.0'  # Only 2.0 supported!
+    # Requests to the same service made within a batch window
+    # are sent as a single JSON-RPC batch message.
+    request_batching = INTERNAL_REQUEST_BATCHING
+    # Batch window in seconds. If 0, requests made
+    # within the same IOLoop iteration are coalesced.
+    request_batch_window = INTERNAL_REQUEST_BATCH_WINDOW
+    request_batch_max_size = INTERNAL_REQUEST_BATCH_MAX_SIZE
 
     def __init__(self, service=None, dispatcher=None):
         super().__init__(service)
         self.dispatcher = dispatcher if dispatcher is not None else Dispatcher()
         for method_name in api:
             self.dispatcher.add_method(getattr(api, method_name))
-
-    async def on_request(self, payload: dict, channel: str) -> None:
-        payload = json.dumps(payload)
+        self._pending_batches = {}
+
+    def is_request(self, message: dict) -> bool:
+        payload = message.get('payload')
+        if isinstance(payload, list):
+            return any(isinstance(p, dict) and 'method' in p for p in payload)
+        return isinstance(payload, dict) and 'method' in payload
+
+    def request_method(self, message: dict) -> Optional[str]:
+        payload = message.get('payload')
+        if isinstance(payload, dict):
+            return payload.get('method')
+
+    def split_request(self, message: dict) -> list:
+        payload = message.get('payload')
+        if isinstance(payload, list) and payload:
+            return [dict(message, payload=p) for p in payload]
+        return [message]
+
+    async def on_request(self, payload, channel: str) -> None:
+        # Payload is already decoded by channel layer,
+        # so request is validated and dispatched directly from it.
         try:
-            json_rpc_request = JSONRPCRequest.from_json(payload)
+            json_rpc_request = JSONRPCRequest.from_data(payload)
         except (TypeError, ValueError, JSONRPCInvalidRequestException):
-            response = await JSONRPCResponseManager.handle(payload, self.dispatcher)
+            response = await JSONRPCResponseManager.handle_data(payload, self.dispatcher)
         else:
-            json_rpc_request.params = json_rpc_request.params or {}
+            if isinstance(json_rpc_request, JSONRPC20BatchRequest):
+                json_rpc_requests = json_rpc_request
+            else:
+                json_rpc_requests = [json_rpc_request]
+            for r in json_rpc_requests:
+                r.params = r.params or {}
             response = await JSONRPCResponseManager.handle_request(
                 json_rpc_request, self.dispatcher)
 
@@ -301,16 +540,23 @@ class JSONRPCInternalConnection(BaseInternalConnection):
             error = dict(error=payload['error'])
             future.set_result(error)
 
-    async def on_message(self, message: dict) -> None:
-        payload = message['payload']
+    async def on_response(self, payload: dict) -> None:
         if 'result' in payload:
             await self.on_result(payload)
         elif 'error' in payload:
             await self.on_error(payload)
-        elif 'method' in payload:
-            await self.on_request(payload, channel=message['channel'])
         else:
-            raise ValueError('Invalid message: %s' % message)
+            raise ValueError('Invalid response: %s' % payload)
+
+    async def on_message(self, message: dict) -> None:
+        payload = message['payload']
+        if self.is_request(message):
+            await self.on_request(payload, channel=message.get('channel'))
+        elif isinstance(payload, list):
+            for p in payload:
+                await self.on_response(p)
+        else:
+            await self.on_response(payload)
 
     @staticmethod
     def _is_response_valid(response: Optional[dict]) -> bool:
@@ -325,54 +571,141 @@ class JSONRPCInternalConnection(BaseInternalConnection):
         if registered_services is not None and service not in registered_services:
             raise ServiceDoesNotExist
 
+    def _request_payload(self, method: str, kwargs: dict, request_id: Optional[int] = None) -> dict:
+        kwargs.update(service=self.service.name)
+        payload = {
+            'jsonrpc': self.json_rpc_ver,
+            'method': method,
+            'params': kwargs
+        }
+        if request_id is not None:
+            payload['id'] = request_id
+        return payload
+
+    def _request_message(self, payload) -> dict:
+        return {
+            'type': self.message_type,
+            'service': self.service.name,
+            'channel': self.reply_channel_name or self.channel_name,
+            'payload': payload
+        }
+
+    async def send_request(self, service: str, payload: dict) -> None:
+        """
+        Send request payload to service channel group.
+        If request batching enabled, payload is queued and
+        sent together with other requests to the service.
+        """
+        if not self.request_batching:
+            await self.group_send(service, self._request_message(payload))
+            return
+        batch = self._pending_batches.get(service)
+        if batch is None:
+            batch = self._pending_batches[service] = ([], Future())
+            if self.request_batch_window:
+                IOLoop.current().call_later(
+                    self.request_batch_window, self.flush_requests, service, batch)
+            else:
+                IOLoop.current().add_callback(self.flush_requests, service, batch)
+        payloads, sent = batch
+        payloads.append(payload)
+        if len(payloads) >= self.request_batch_max_size:
+            # Next requests go to the new batch
+            del self._pending_batches[service]
+            IOLoop.current().add_callback(self.flush_requests, service, batch)
+        await sent
+
+    async def flush_requests(self, service: str, batch: tuple) -> None:
+        """Send queued requests to service as a single message."""
+        if self._pending_batches.get(service) is batch:
+            del self._pending_batches[service]
+        payloads, sent = batch
+        if not payloads:
+            return  # Already sent
+        payload = payloads[0] if len(payloads) == 1 else payloads[:]
+        del payloads[:]
+        try:
+            await self.group_send(service, self._request_message(payload))
+        except Exception as e:
+            sent.set_exception(e)
+        else:
+            sent.set_result(None)
+
+    async def _wait_for_results(self, service: str, request_ids: list, timeout: int = None) -> list:
+        futures = [self._responses[request_id] for request_id in request_ids]
+        timeout = timeout or self.request_timeout
+        try:
+            return await with_timeout(datetime.timedelta(seconds=timeout), multi(futures))
+        except TimeoutError:
+            raise RequestTimeoutError(
+                'Service `%s` not responded for %s sec' % (service, timeout))
+            # return {'error': {'message': 'Service `%s` not responded for %s sec' % (service, timeout)}}
+        finally:
+            for request_id in request_ids:
+                del self._responses[request_id]
+
     @cached
     async def request(self, service: str, method: str, timeout: int = None, registered_services=None,
                       **kwargs) -> dict:
         self.check_service(service, registered_services)
         with ElapsedTime('request@InternalConnection -> {0}@{1}', method, service):
-            kwargs.update(service=self.service.name)
             request_id = self.next_request_id()
-            message = {
-                'type': self.message_type,
-                'service': self.service.name,
-                'channel': self.channel_name,
-                'payload': {
-                    'jsonrpc': self.json_rpc_ver,
-                    'method': method,
-                    'params': kwargs,
-                    'id': request_id
-                }
-            }
-            self._responses[request_id] = future = Future()
-            await self.group_send(service, message)
-            timeout = timeout or self.request_timeout
+            payload = self._request_payload(method, kwargs, request_id)
+            self._responses[request_id] = Future()
             try:
-                result = await with_timeout(datetime.timedelta(seconds=timeout), future)
-            except TimeoutError:
-                raise RequestTimeoutError(
-                    'Service `%s` not responded for %s sec' % (service, timeout))
-                # return {'error': {'message': 'Service `%s` not responded for %s sec' % (service, timeout)}}
-            else:
-                if not self._is_response_valid(result):
-                    raise RequestError(result)
-                return result
-            finally:
+                await self.send_request(service, payload)
+            except Exception:
                 del self._responses[request_id]
+                raise
+            result, = await self._wait_for_results(service, [request_id], timeout)
+            if not self._is_response_valid(result):
+                raise RequestError(result)
+            return result
+
+    async def request_many(self, service: str, calls: list, timeout: int = None, registered_services=None,
+                           return_exceptions: bool = False) -> list:
+        """
+        Request for several methods of the service as JSON-RPC batches
+        of at most `request_batch_max_size` calls and wait for results.
+
+        :param service: service name.
+        :param calls: list of (method, kwargs) pairs.
+        :param timeout: timeout for the whole batch.
+        :param registered_services: known services names to check service.
+        :param return_exceptions: if True, errors returned as RequestError
+            instances in place of results, otherwise first error raised.
+        :return: results list in order of calls.
+        """
+        self.check_service(service, registered_services)
+        if not calls:
+            return []
+        with ElapsedTime('request_many@InternalConnection -> {0}@{1}', len(calls), service):
+            request_ids, payloads = [], []
+            for method, kwargs in calls:
+                request_id = self.next_request_id()
+                request_ids.append(request_id)
+                payloads.append(self._request_payload(method, dict(kwargs), request_id))
+                self._responses[request_id] = Future()
+            size = self.request_batch_max_size
+            try:
+                for i in range(0, len(payloads), size):
+                    await self.group_send(service, self._request_message(payloads[i:i + size]))
+            except Exception:
+                for request_id in request_ids:
+                    del self._responses[request_id]
+                raise
+            results = await self._wait_for_results(service, request_ids, timeout)
+            for i, result in enumerate(results):
+                if not self._is_response_valid(result):
+                    if not return_exceptions:
+                        raise RequestError(result)
+                    results[i] = RequestError(result)
+            return results
 
     async def push(self, service: str, method: str, registered_services=None, **kwargs) -> None:
         self.check_service(service, registered_services)
         with ElapsedTime('push@InternalConnection -> {0}@{1}', method, service):
-            kwargs.update(service=self.service.name)
-            message = {
-                'type': self.message_type,
-                'service': self.service.name,
-                'payload': {
-                    'jsonrpc': self.json_rpc_ver,
-                    'method': method,
-                    'params': kwargs
-                }
-            }
-            await self.group_send(service, message)
+            await self.send_request(service, self._request_payload(method, kwargs))
 
 
 InternalConnection = JSONRPCInternalConnection  # More simple alias
@@ -390,10 +723,18 @@ class InternalAPIMixin:
     def internal_request(self):
         return self.internal_connection.request
 
+    @property
+    def internal_request_many(self):
+        return self.internal_connection.request_many
+
     @property
     def internal_push(self):
         return self.internal_connection.push
 
+    @property
+    def internal_broadcast(self):
+        return self.internal_connection.broadcast
+
 
 class InternalAPIConnector(InternalAPIMixin):
     pass
@@ -1,4 +1,4 @@
-from ..core import as_internal, InternalAPI
+from ..core import as_internal, InternalAPI, request_cache_stats, method_cache_stats
 from typing import Optional
 
 
@@ -17,6 +17,14 @@ def doc(api: InternalAPI, **options):
     return {'methods': ', '.join(api.methods)}
 
 
+@as_internal()
+def get_cache_stats(api: InternalAPI, **options):
+    return {
+        'requests': request_cache_stats.as_dict(),
+        'methods': method_cache_stats.as_dict()
+    }
+
+
 @as_internal()
 def get_service_metadata(api: InternalAPI, **options):
     return api.service.app.metadata
@@ -1,5 +1,5 @@
 from anthill.framework.utils.asynchronous import thread_pool_exec as future_exec
-from ..core import as_internal, InternalAPI
+from ..core import as_internal, InternalAPI, connector
 from typing import Optional
 
 
@@ -33,6 +33,15 @@ async def get_model_object(model_name: str,
     return await future_exec(query.one)
 
 
+async def publish_model_changed(api: InternalAPI, model_name: str, data: dict) -> None:
+    """Make all services to invalidate cached remote model object."""
+    await connector.internal_broadcast(
+        'invalidate_remote_model',
+        model_name='.'.join([api.service.name, model_name]),
+        data=data
+    )
+
+
 def deserialize_data(model, **data):
     from anthill.framework.db import db
 
@@ -72,9 +81,25 @@ async def model_history(api: InternalAPI,
                         model_name: str,
                         object_id: str,
                         identifier_name: str = 'id',
+                        page_size: int = 0,
+                        before: Optional[int] = None,
                         **options):
+    """
+    Returns object versions. If `page_size` or `before` is given,
+    versions are returned newest first, seeking by transaction id
+    lower than `before`.
+    """
     obj = await get_model_object(model_name, object_id, identifier_name)
-    return obj.versions
+    if not page_size and before is None:
+        return obj.versions
+    from sqlalchemy_continuum import version_class
+    transaction_id = version_class(obj.__class__).transaction_id
+    query = obj.versions.order_by(None).order_by(transaction_id.desc())
+    if before is not None:
+        query = query.filter(transaction_id < before)
+    if page_size:
+        query = query.limit(page_size)
+    return await future_exec(query.all)
 
 
 @as_internal()
@@ -95,16 +120,32 @@ async def get_models(api: InternalAPI,
                      identifier_name: str = 'id',
                      page: int = 1,
                      page_size: int = 0,
+                     cursor: Optional[str] = None,
+                     ordering: Optional[list] = None,
                      **options):
+    """
+    Returns list of model objects, paginated by page number.
+    If `cursor` is given (empty string for the first page), keyset
+    pagination is used instead, and the result is a dict with
+    `items` and `next_cursor` keys.
+    """
     model = get_model_class(model_name)
+    keyset = cursor is not None
     query = await get_model_query(
         model_name=model_name,
-        page=page,
-        page_size=page_size,
+        page=0 if keyset else page,
+        page_size=0 if keyset else page_size,
         in_list=in_list,
         identifier_name=identifier_name,
         **(filter_data or {})
     )
+    if keyset:
+        pagination = await future_exec(
+            query.paginate_after, cursor or None, ordering or ('id',), page_size or 20)
+        return {
+            'items': model.dump_many(pagination.items),
+            'next_cursor': pagination.next_cursor
+        }
     objects = await future_exec(query.all)
     return model.dump_many(objects)
 
@@ -116,7 +157,10 @@ async def update_or_create_model(api: InternalAPI,
                                  **options):
     obj = deserialize_data(model_name, **data)
     obj = await future_exec(obj.save)
-    return obj.dump()
+    data = obj.dump()
+    if not getattr(obj, 'publish_changes_on_save', False):
+        await publish_model_changed(api, model_name, data)
+    return data
 
 
 @as_internal()
@@ -126,4 +170,15 @@ async def delete_model(api: InternalAPI,
                        identifier_name: str = 'id',
                        **options):
     obj = await get_model_object(model_name, object_id, identifier_name)
+    data = obj.dump()
     await future_exec(obj.delete)
+    await publish_model_changed(api, model_name, data)
+
+
+@as_internal()
+def invalidate_remote_model(api: InternalAPI,
+                            model_name: str,
+                            data: dict,
+                            **options) -> None:
+    from anthill.platform.remote_models import remote_models_cache
+    remote_models_cache.invalidate(model_name, data)
@@ -1,9 +1,11 @@
 from anthill.framework.core.mail.asynchronous import send_mail
 from anthill.platform.core.messenger.message import send_message
 from anthill.platform.core.messenger.settings import messenger_settings
-from anthill.platform.remote_models import RemoteModel
+from anthill.platform.remote_models import RemoteModel, remote_models_cache
 from anthill.platform.api.internal import RequestError, connector
+from anthill.framework.utils.dataloader import DataLoader
 from tornado.escape import json_decode, json_encode
+from tornado.concurrent import Future
 from functools import partial
 from datetime import datetime
 import dateutil.parser
@@ -73,6 +75,26 @@ class RemoteUser(RemoteModel):
         """Return the identifying username for this RemoteUser."""
         return getattr(self, self.USERNAME_FIELD)
 
+    @classmethod
+    async def load(cls, user_id) -> "RemoteUser":
+        """
+        Load user by id. Concurrent loads are batched
+        into a single `get_users` request.
+        Raise `RequestError` if user does not exist.
+        """
+        user = await user_loader.load(user_id)
+        if user is None:
+            raise RequestError('User `%s` does not exist.' % user_id)
+        return user
+
+    @classmethod
+    async def load_many(cls, user_ids) -> list:
+        """
+        Load users by ids. Result list is in order of ids,
+        with None in place of users not found.
+        """
+        return await user_loader.load_many(user_ids)
+
     # async def save(self, force_insert=False):
     #    raise NotImplementedError("Service doesn't provide a DB representation for RemoteUser.")
 
@@ -85,6 +107,12 @@ class RemoteUser(RemoteModel):
     def check_password(self, raw_password):
         raise NotImplementedError("Service doesn't provide a DB representation for RemoteUser.")
 
+    async def aset_password(self, raw_password):
+        raise NotImplementedError("Service doesn't provide a DB representation for RemoteUser.")
+
+    async def acheck_password(self, raw_password):
+        raise NotImplementedError("Service doesn't provide a DB representation for RemoteUser.")
+
     async def get_profile(self) -> "RemoteProfile":
         data = await self.internal_request('profile', 'get_profile', user_id=self.user_id)
         return RemoteProfile(**data)
@@ -127,8 +155,7 @@ class RemoteProfile(RemoteModel):
         return '<RemoteProfile(user_id=%r)>' % self.user_id
 
     async def get_user(self) -> RemoteUser:
-        data = await self.internal_request('login', 'get_user', user_id=self.user_id)
-        return RemoteUser(**data)
+        return await RemoteUser.load(self.user_id)
 
     @property
     def user_id(self):
@@ -151,6 +178,42 @@ class RemoteProfile(RemoteModel):
         return iso_parse(self._data.get('updated', None))
 
 
+class RemoteUserLoader(DataLoader):
+    """
+    Collects user ids requested within the same IOLoop iteration,
+    removes duplicates and loads users with a single `get_users` request.
+    Loaded users are cached by remote models cache, not by the loader.
+    """
+
+    def __init__(self, max_batch_size=1000):
+        super().__init__(max_batch_size=max_batch_size, cache=False)
+
+    def load(self, user_id) -> Future:
+        data = remote_models_cache.get(RemoteUser.model_name, 'id', user_id)
+        if data is not None:
+            future = Future()
+            future.set_result(RemoteUser(**data))
+            return future
+        return super().load(user_id)
+
+    async def batch_load(self, user_ids):
+        users_data = await connector.internal_request(
+            'login', 'get_users', user_ids=list(set(user_ids)), caching=False)
+        users = {str(data['id']): data for data in users_data}
+        result = []
+        for user_id in user_ids:
+            data = users.get(str(user_id))
+            if data is not None:
+                remote_models_cache.set(RemoteUser.model_name, 'id', user_id, data)
+                result.append(RemoteUser(**data))
+            else:
+                result.append(None)
+        return result
+
+
+user_loader = RemoteUserLoader()
+
+
 async def internal_authenticate(internal_request=None, **credentials) -> RemoteUser:
     """Perform internal api authentication."""
     internal_request = internal_request or connector.internal_request
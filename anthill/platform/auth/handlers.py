@@ -37,13 +37,14 @@ class UserHandlerMixin:
         Return the user model instance associated with the given session.
         If no user is retrieved, return an instance of `AnonymousUser`.
         """
+        await self.aload_session()
         user = None
         try:
             user_id = _get_user_session_key(self)
         except KeyError:
             pass
         else:
-            user = await RemoteUser(id=user_id).get()
+            user = await RemoteUser.load(user_id)
             # Verify the session
             if hasattr(user, 'get_session_auth_hash'):
                 session_hash = self.session.get(HASH_SESSION_KEY)
@@ -82,6 +83,7 @@ class LoginHandlerMixin:
         if hasattr(user, 'get_session_auth_hash'):
             session_auth_hash = user.get_session_auth_hash()
 
+        await self.aload_session()
         if SESSION_KEY in self.session:
             if _get_user_session_key(self) != user.id or (
                     session_auth_hash and
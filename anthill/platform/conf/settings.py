@@ -16,7 +16,7 @@ DEFAULT_HANDLER_CLASS = None
 
 CACHES = {
     "default": {
-        "BACKEND": "anthill.framework.core.cache.backends.redis.cache.RedisCache",
+        "BACKEND": "anthill.framework.core.cache.backends.redis.cache.AsyncRedisCache",
         "LOCATION": "redis://localhost:6379/0",
         "OPTIONS": {
             "CLIENT_CLASS": "anthill.framework.core.cache.backends.redis.client.DefaultClient",
@@ -94,7 +94,7 @@ LOG_STREAMING = {
 ##############
 
 CACHES['rate_limit'] = {
-    "BACKEND": "anthill.framework.core.cache.backends.redis.cache.RedisCache",
+    "BACKEND": "anthill.framework.core.cache.backends.redis.cache.AsyncRedisCache",
     "LOCATION": "redis://localhost:6379/1",
     "OPTIONS": {
         "CLIENT_CLASS": "anthill.framework.core.cache.backends.redis.client.DefaultClient",
@@ -149,7 +149,7 @@ WEBSOCKET_MEM_LEVEL = 6
 #############################
 
 CACHES['websocket_clients_watcher'] = {
-    "BACKEND": "anthill.framework.core.cache.backends.redis.cache.RedisCache",
+    "BACKEND": "anthill.framework.core.cache.backends.redis.cache.AsyncRedisCache",
     "LOCATION": "redis://localhost:6379/1",
     "OPTIONS": {
         "CLIENT_CLASS": "anthill.framework.core.cache.backends.redis.client.DefaultClient",
@@ -170,12 +170,20 @@ CHANNEL_LAYERS = {
         "BACKEND": "anthill.platform.core.messenger.channels.layers.backends.redis.ChannelLayer",
         "CONFIG": {
             "hosts": [("localhost", 6379)],
+            "pool_minsize": 1,
+            "pool_maxsize": 10,
         },
     },
     "internal": {
         "BACKEND": "anthill.platform.core.messenger.channels.layers.backends.redis.ChannelLayer",
         "CONFIG": {
             "hosts": [("localhost", 6379)],
+            "pool_minsize": 1,
+            "pool_maxsize": 10,
+            # Messages larger than `compression_threshold` bytes are compressed.
+            # Example: "anthill.framework.core.cache.backends.redis.compressors.zstd.ZstdCompressor"
+            "compressor": None,
+            "compression_threshold": 1024,
         },
     },
 }
@@ -198,8 +206,35 @@ INTERNAL_API_CONF = 'api.v1.internal'
 INTERNAL_REQUEST_CACHING = True
 INTERNAL_API_METHOD_CACHING = False
 INTERNAL_DEFAULT_CACHE_TIMEOUT = 300  # 5min
+# If set, expired cached results of internal requests are kept for
+# this number of seconds and returned while refreshing in background.
+INTERNAL_REQUEST_CACHE_STALE_TIMEOUT = 0
+# Process incoming internal requests concurrently.
+INTERNAL_CONCURRENT_DISPATCH = True
+INTERNAL_DISPATCH_CONCURRENCY = 100
+# Maps internal api method names and its concurrency limits.
+#
+# Example:
+#
+# INTERNAL_DISPATCH_METHOD_CONCURRENCY = {
+#     'get_models': 10,
+# }
+INTERNAL_DISPATCH_METHOD_CONCURRENCY = {}
+# Coalesce internal requests to the same service into JSON-RPC batches.
+# Enable only if all services understand batch messages.
+INTERNAL_REQUEST_BATCHING = False
+# Batch window in seconds. If 0, requests made within
+# the same IOLoop iteration are sent as one batch.
+INTERNAL_REQUEST_BATCH_WINDOW = 0
+INTERNAL_REQUEST_BATCH_MAX_SIZE = 100
 PUBLIC_API_URL = None
 
+# Per-process cache of remote models (RemoteUser, RemoteProfile, etc).
+# Entries are invalidated by owning service on model save or delete.
+REMOTE_MODELS_CACHE_ENABLE = True
+REMOTE_MODELS_CACHE_MAX_SIZE = 10000
+REMOTE_MODELS_CACHE_TIMEOUT = 60  # 1min
+
 #########
 # GEOIP #
 #########
@@ -1,9 +1,10 @@
 from anthill.platform.core.messenger.channels.layers.backends.base import BaseChannelLayer
 from anthill.platform.core.messenger.channels.exceptions import ChannelFull
+from anthill.framework.utils.module_loading import import_string
+from anthill.framework.utils.hash_ring import HashRing
 
 import asyncio
 import base64
-import binascii
 import collections
 import hashlib
 import itertools
@@ -14,6 +15,12 @@ import time
 import aioredis
 import msgpack
 
+# Lua scripts SHA1 digests cache
+_script_digests = {}
+
+# Compressed messages are prefixed with byte that is never used by msgpack
+COMPRESSED_MARKER = b"\xc1"
+
 
 class ChannelLayer(BaseChannelLayer):
     """
@@ -26,6 +33,39 @@ class ChannelLayer(BaseChannelLayer):
     blpop_timeout = 5
     queue_get_timeout = 10
 
+    # Lua scripts are executed by their SHA1 digests (EVALSHA),
+    # so script text is sent to the server only once.
+
+    # Checks channel capacity, pushes message and sets expiry
+    # in a single round trip.
+    # KEYS: channel key; ARGV: message, capacity, expiry.
+    send_lua = """
+        if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[2]) then
+            return 0
+        end
+        redis.call('RPUSH', KEYS[1], ARGV[1])
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+        return 1
+    """
+
+    # Pushes message to every channel that is not full.
+    # KEYS: channel keys; ARGV: messages, capacities, expiry.
+    group_send_lua = """
+        for i=1,#KEYS do
+            if redis.call('LLEN', KEYS[i]) < tonumber(ARGV[i + #KEYS]) then
+                redis.call('RPUSH', KEYS[i], ARGV[i])
+                redis.call('EXPIRE', KEYS[i], ARGV[#ARGV])
+            end
+        end
+    """
+
+    # Discards expired channels and returns the rest of group members.
+    # KEYS: group key; ARGV: max score to discard.
+    group_channels_lua = """
+        redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1])
+        return redis.call('ZRANGE', KEYS[1], 0, -1)
+    """
+
     def __init__(
             self,
             hosts=None,
@@ -35,6 +75,10 @@ class ChannelLayer(BaseChannelLayer):
             capacity=100,
             channel_capacity=None,
             symmetric_encryption_keys=None,
+            pool_minsize=1,
+            pool_maxsize=10,
+            compressor=None,
+            compression_threshold=1024,
     ):
         # Store basic information
         self.expiry = expiry
@@ -46,9 +90,16 @@ class ChannelLayer(BaseChannelLayer):
         # Cached redis connection pools and the event loop they are from
         self.pools = {}
         self.pools_loop = None
+        self.pool_minsize = pool_minsize
+        self.pool_maxsize = pool_maxsize
         # Configure the host objects
         self.hosts = self.decode_hosts(hosts)
         self.ring_size = len(self.hosts)
+        # Channels and groups are mapped to hosts by host address,
+        # so adding or removing a host remaps only a part of them
+        self._host_indexes = dict(
+            (str(host["address"]), index) for index, host in enumerate(self.hosts))
+        self.ring = HashRing(self._host_indexes)
         # Normal channels choose a host index by cycling through the available hosts
         self._receive_index_generator = itertools.cycle(range(len(self.hosts)))
         self._send_index_generator = itertools.cycle(range(len(self.hosts)))
@@ -57,6 +108,9 @@ class ChannelLayer(BaseChannelLayer):
         self.client_prefix = "".join(random.choice(string.ascii_letters) for i in range(8))
         # Set up any encryption objects
         self._setup_encryption(symmetric_encryption_keys)
+        # Set up compression of large messages
+        self.compressor = import_string(compressor)(options={}) if compressor else None
+        self.compression_threshold = compression_threshold
         # Number of coroutines trying to receive right now
         self.receive_count = 0
         # Event loop they are trying to receive on
@@ -125,13 +179,13 @@ class ChannelLayer(BaseChannelLayer):
         else:
             index = next(self._send_index_generator)
         async with self.connection(index) as connection:
-            # Check the length of the list before send
-            # This can allow the list to leak slightly over capacity, but that's fine.
-            if await connection.llen(channel_key) >= self.get_capacity(channel):
-                raise ChannelFull()
-            # Push onto the list then set it to expire in case it's not consumed
-            await connection.rpush(channel_key, self.serialize(message))
-            await connection.expire(channel_key, int(self.expiry))
+            # Check the length of the list, push onto the list then set it
+            # to expire in case it's not consumed. All in one round trip.
+            pushed = await self.eval_script(
+                connection, self.send_lua, keys=[channel_key],
+                args=[self.serialize(message), self.get_capacity(channel), int(self.expiry)])
+        if not pushed:
+            raise ChannelFull()
 
     async def receive(self, channel):
         """
@@ -297,28 +351,19 @@ class ChannelLayer(BaseChannelLayer):
         # Retrieve list of all channel names
         key = self._group_key(group)
         async with self.connection(self.consistent_hash(group)) as connection:
-            # Discard old channels based on group_expiry
-            await connection.zremrangebyscore(key, min=0, max=int(time.time()) - self.group_expiry)
-
-            # Return current lot
-            channel_names = [x.decode("utf8") for x in await connection.zrange(key, 0, -1)]
+            # Discard old channels based on group_expiry and return current lot
+            channel_names = await self.eval_script(
+                connection, self.group_channels_lua, keys=[key],
+                args=[int(time.time()) - self.group_expiry])
+            channel_names = [x.decode("utf8") for x in channel_names]
 
         connection_to_channels, channel_to_message, channel_to_capacity, channel_to_key = \
             self._map_channel_to_connection(channel_names, message)
 
         for connection_index, channel_redis_keys in connection_to_channels.items():
-            # Create a LUA script specific for this connection.
             # Make sure to use the message specific to this channel, it is
             # stored in channel_to_message dict and contains the
             # __anthill_channel__ key.
-            group_send_lua = """
-                for i=1,#KEYS do
-                    if redis.call('LLEN', KEYS[i]) < tonumber(ARGV[i + #KEYS]) then
-                        redis.call('RPUSH', KEYS[i], ARGV[i])
-                        redis.call('EXPIRE', KEYS[i], %d)
-                    end
-                end
-            """ % self.expiry
 
             # We need to filter the messages to keep those related to the connection
             args = [
@@ -332,8 +377,11 @@ class ChannelLayer(BaseChannelLayer):
                 if channel_to_key[channel_name] in channel_redis_keys
             ]
 
+            args.append(int(self.expiry))
+
             async with self.connection(connection_index) as connection:
-                await connection.eval(group_send_lua, keys=channel_redis_keys, args=args)
+                await self.eval_script(
+                    connection, self.group_send_lua, keys=channel_redis_keys, args=args)
 
     def _map_channel_to_connection(self, channel_names, message):
         """
@@ -358,7 +406,7 @@ class ChannelLayer(BaseChannelLayer):
             channel_key = self.prefix + channel_non_local_name
             idx = self.consistent_hash(channel_non_local_name)
             connection_to_channels[idx].append(channel_key)
-            channel_to_capacity[channel] = self.get_capacity(message)
+            channel_to_capacity[channel] = self.get_capacity(channel)
             channel_to_message[channel] = self.serialize(message)
             # We build a
             channel_to_key[channel] = channel_key
@@ -371,6 +419,31 @@ class ChannelLayer(BaseChannelLayer):
         """
         return ("%s:group:%s" % (self.prefix, group)).encode("utf8")
 
+    # Scripting #
+
+    @staticmethod
+    def script_digest(script):
+        """
+        Returns SHA1 digest of the Lua script.
+        """
+        digest = _script_digests.get(script)
+        if digest is None:
+            digest = _script_digests[script] = hashlib.sha1(script.encode("utf8")).hexdigest()
+        return digest
+
+    async def eval_script(self, connection, script, keys=None, args=None):
+        """
+        Executes Lua script by its digest. Falls back to sending
+        the whole script if it is not cached by the server yet.
+        """
+        try:
+            return await connection.evalsha(self.script_digest(script), keys=keys, args=args)
+        except aioredis.ReplyError as e:
+            if not str(e).startswith("NOSCRIPT"):
+                raise
+            # EVAL caches the script, so next time EVALSHA succeeds
+            return await connection.eval(script, keys=keys, args=args)
+
     # Serialization #
 
     def serialize(self, message):
@@ -378,6 +451,10 @@ class ChannelLayer(BaseChannelLayer):
         Serializes message to a byte string.
         """
         value = msgpack.packb(message, use_bin_type=True)
+        if self.compressor is not None and len(value) >= self.compression_threshold:
+            compressed = self.compressor.compress(value)
+            if compressed is not value:
+                value = COMPRESSED_MARKER + compressed
         if self.crypter:
             value = self.crypter.encrypt(value)
         return value
@@ -388,20 +465,24 @@ class ChannelLayer(BaseChannelLayer):
         """
         if self.crypter:
             message = self.crypter.decrypt(message, self.expiry + 10)
+        if message[:1] == COMPRESSED_MARKER:
+            if self.compressor is None:
+                raise ValueError(
+                    "Received compressed message, but no compressor is configured. "
+                    "Set the same compressor for all channel layers sharing the hosts.")
+            message = self.compressor.decompress(message[1:])
         return msgpack.unpackb(message, raw=False)
 
     # Internal functions #
 
     def consistent_hash(self, value):
         """
-        Maps the value to a node value between 0 and 4095
-        using CRC, then down to one of the ring nodes.
+        Maps the value to one of the ring nodes (host index)
+        using consistent hash ring.
         """
-        if isinstance(value, str):
-            value = value.encode("utf8")
-        bigval = binascii.crc32(value) & 0xfff
-        ring_divisor = 4096 / float(self.ring_size)
-        return int(bigval / ring_divisor)
+        if self.ring_size == 1:
+            return 0
+        return self._host_indexes[self.ring.get_node(value)]
 
     def make_fernet(self, key):
         """
@@ -427,19 +508,68 @@ class ChannelLayer(BaseChannelLayer):
         if not 0 <= index < self.ring_size:
             raise ValueError("There are only %s hosts - you asked for %s!" % (self.ring_size, index))
         # Make a context manager
-        return self.ConnectionContextManager(self.hosts[index])
+        return self.ConnectionContextManager(self, index)
+
+    async def get_pool(self, index):
+        """
+        Returns connection pool for the host index given.
+        Pools are bound to the event loop they were created in,
+        so they are recreated if the current event loop changes.
+        """
+        loop = asyncio.get_event_loop()
+        if self.pools_loop is not loop:
+            self._close_pools()
+            self.pools_loop = loop
+        if index not in self.pools:
+            # Store the future, so concurrent callers share the same pool
+            self.pools[index] = asyncio.ensure_future(aioredis.create_pool(
+                minsize=self.pool_minsize, maxsize=self.pool_maxsize,
+                loop=loop, **self.hosts[index]), loop=loop)
+        try:
+            return await self.pools[index]
+        except Exception:
+            del self.pools[index]
+            raise
+
+    def _close_pools(self):
+        for pool_future in self.pools.values():
+            if pool_future.done() and not pool_future.exception():
+                pool_future.result().close()
+            else:
+                pool_future.cancel()
+        self.pools = {}
+
+    async def close_pools(self):
+        """
+        Closes all connection pools.
+        """
+        pools = [f.result() for f in self.pools.values() if f.done() and not f.exception()]
+        self._close_pools()
+        for pool in pools:
+            await pool.wait_closed()
 
     class ConnectionContextManager:
         """
-        Async context manager for connections
+        Async context manager for pooled connections
         """
 
-        def __init__(self, kwargs):
-            self.kwargs = kwargs
+        broken_connection_errors = (asyncio.CancelledError, aioredis.RedisError, OSError)
+
+        def __init__(self, layer, index):
+            self.layer = layer
+            self.index = index
+            self.pool = None
+            self.raw_conn = None
 
         async def __aenter__(self):
-            self.conn = await aioredis.create_redis(**self.kwargs)
+            self.pool = await self.layer.get_pool(self.index)
+            self.raw_conn = await self.pool.acquire()
+            self.conn = aioredis.Redis(self.raw_conn)
             return self.conn
 
         async def __aexit__(self, exc_type, exc, tb):
-            self.conn.close()
+            if exc_type is not None and issubclass(exc_type, self.broken_connection_errors):
+                # Connection may be left in inconsistent state
+                # (e.g. cancelled blocking command), so do not reuse it.
+                self.raw_conn.close()
+            self.pool.release(self.raw_conn)
@@ -1,4 +1,5 @@
 from anthill.framework.handlers import WebSocketJSONRPCHandler
+from types import MethodType
 from anthill.platform.handlers.base import InternalRequestHandlerMixin
 
 __all__ = ['JsonRPCSessionHandler', 'jsonrpc_method']
@@ -31,10 +32,23 @@ class JsonRPCSessionHandler(InternalRequestHandlerMixin, WebSocketJSONRPCHandler
         super().__init__(application, request, dispatcher, **kwargs)
         self._setup_methods()
 
+    @classmethod
+    def get_jsonrpc_methods(cls):
+        """
+        Map of json-rpc method names to functions.
+        Built once per handler class.
+        """
+        methods = cls.__dict__.get('_jsonrpc_methods')
+        if methods is None:
+            methods = {}
+            for method_name, attr in cls.__dict__.items():
+                if getattr(attr, 'jsonrpc_method', False):
+                    kwargs = getattr(attr, 'kwargs', {})
+                    name = kwargs.get('name', method_name)
+                    methods[name] = attr
+            cls._jsonrpc_methods = methods
+        return methods
+
     def _setup_methods(self):
-        for method_name in self.__class__.__dict__:
-            attr = getattr(self, method_name)
-            if getattr(attr, 'jsonrpc_method', False):
-                kwargs = getattr(attr, 'kwargs', {})
-                name = kwargs.get('name', method_name)
-                self.dispatcher.add_method(attr, name)
+        for name, func in self.get_jsonrpc_methods().items():
+            self.dispatcher.add_method(MethodType(func, self), name)
@@ -1,8 +1,54 @@
+from anthill.framework.conf import settings
 from anthill.framework.core.exceptions import ImproperlyConfigured
+from anthill.framework.utils.datastructures import LRUCache
 from anthill.framework.utils.text import capfirst
 from anthill.platform.api.internal import InternalAPIMixin
 from typing import Type, Optional
 
+REMOTE_MODELS_CACHE_ENABLE = getattr(settings, 'REMOTE_MODELS_CACHE_ENABLE', True)
+REMOTE_MODELS_CACHE_MAX_SIZE = getattr(settings, 'REMOTE_MODELS_CACHE_MAX_SIZE', 10000)
+REMOTE_MODELS_CACHE_TIMEOUT = getattr(settings, 'REMOTE_MODELS_CACHE_TIMEOUT', 60)
+
+
+class RemoteModelCache:
+    """
+    Per-process cache of remote model objects data.
+    Entries are invalidated by the service that owns the model
+    on every save or delete operation.
+    """
+
+    def __init__(self, max_size=REMOTE_MODELS_CACHE_MAX_SIZE,
+                 timeout=REMOTE_MODELS_CACHE_TIMEOUT, enable=REMOTE_MODELS_CACHE_ENABLE):
+        self.enable = enable
+        self._cache = LRUCache(max_size=max_size, timeout=timeout)
+
+    @staticmethod
+    def make_key(model_name, identifier_name, identifier):
+        return model_name, identifier_name, str(identifier)
+
+    def get(self, model_name, identifier_name, identifier) -> Optional[dict]:
+        if not self.enable:
+            return None
+        data = self._cache.get(self.make_key(model_name, identifier_name, identifier))
+        if data is not None:
+            return data.copy()
+
+    def set(self, model_name, identifier_name, identifier, data: dict) -> None:
+        if self.enable:
+            self._cache.set(self.make_key(model_name, identifier_name, identifier), data.copy())
+
+    def invalidate(self, model_name, data: dict) -> None:
+        """Remove all entries related to the model object data."""
+        for identifier_name, identifier in data.items():
+            if isinstance(identifier, (str, int)):
+                self._cache.delete(self.make_key(model_name, identifier_name, identifier))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+remote_models_cache = RemoteModelCache()
+
 
 class RemoteModel(InternalAPIMixin):
     """Class for representing model object from remote server."""
@@ -44,12 +90,18 @@ class RemoteModel(InternalAPIMixin):
 
     async def get(self):
         """Perform get model operation on remote server."""
-        kwargs = await self.request(
-            'get_model',
-            model_name=self.get_model_name(),
-            object_id=self.get_identifier(),
-            identifier_name=self.IDENTIFIER_FIELD
-        )
+        identifier = self.get_identifier()
+        kwargs = remote_models_cache.get(self.model_name, self.IDENTIFIER_FIELD, identifier)
+        if kwargs is None:
+            kwargs = await self.request(
+                'get_model',
+                model_name=self.get_model_name(),
+                object_id=identifier,
+                identifier_name=self.IDENTIFIER_FIELD,
+                # Shared request cache is not invalidated with this one.
+                caching=False
+            )
+            remote_models_cache.set(self.model_name, self.IDENTIFIER_FIELD, identifier, kwargs)
         self._data.update(kwargs)
         return self
 
@@ -61,6 +113,7 @@ class RemoteModel(InternalAPIMixin):
             object_id=self.get_identifier(),
             identifier_name=self.IDENTIFIER_FIELD
         )
+        remote_models_cache.invalidate(self.model_name, self._data)
 
     async def save(self):
         """Perform save model operation on remote server."""
@@ -18,13 +18,41 @@ Usage:
     def function_name():
         # function code
         ...
+
+Asynchronous rate limit is atomic across processes and hosts. It uses
+sliding window log kept in redis and checked by single Lua script
+(or in process memory if the cache backend is not redis based):
+
+    from anthill.platform.security.rate_limit import default_async_rate_limit
+
+    @default_async_rate_limit('user', user_id)
+    async def function_name():
+        # function code
+        ...
+
+    class Handler(RequestHandler):
+        @default_async_rate_limit.handler('ip')
+        async def get(self):
+            ...
+
+    @as_internal()
+    @default_async_rate_limit.internal('get_users')
+    async def get_users(api, **options):
+        ...
 """
 from anthill.framework.core.cache import caches
 from anthill.framework.conf import settings
 from anthill.framework.utils.module_loading import import_string
 from anthill.framework.core.exceptions import ImproperlyConfigured
+from anthill.framework.utils.ip import get_ip
 from functools import wraps
+import collections
+import inspect
+import hashlib
+import math
 import threading
+import time
+import uuid
 import logging
 
 logger = logging.getLogger('anthill.rate_limit')
@@ -33,7 +61,11 @@ cache = caches['rate_limit']
 RATE_LIMIT_ENABLE = getattr(settings, 'RATE_LIMIT_ENABLE', False)
 RATE_LIMIT_CONFIG = getattr(settings, 'RATE_LIMIT_CONFIG', {})
 
-__all__ = ['RateLimit', 'RateLimitException', 'default_rate_limit']
+__all__ = [
+    'RateLimit', 'RateLimitException', 'default_rate_limit',
+    'AsyncRateLimit', 'RedisSlidingWindow', 'LocMemSlidingWindow',
+    'default_async_rate_limit'
+]
 
 
 class RateLimitException(Exception):
@@ -169,3 +201,294 @@ class RateLimit:
 
 
 default_rate_limit = RateLimit(storage=cache)
+
+
+class RedisSlidingWindow:
+    """
+    Sliding window log stored in redis sorted set.
+    Check and update are made by single Lua script, so it's atomic
+    across all workers. Redis server time is used as a clock.
+    """
+
+    hit_lua = """
+        redis.replicate_commands()
+        local t = redis.call('TIME')
+        local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+        local window = tonumber(ARGV[1])
+        local limit = tonumber(ARGV[2])
+        redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+        local count = redis.call('ZCARD', KEYS[1])
+        if count < limit then
+            redis.call('ZADD', KEYS[1], now, ARGV[3])
+            redis.call('PEXPIRE', KEYS[1], window)
+            return {1, count + 1, 0}
+        end
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        return {0, count, tonumber(oldest[2]) + window - now}
+    """
+    hit_lua_digest = hashlib.sha1(hit_lua.encode('utf-8')).hexdigest()
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    async def _client(self):
+        return await self.storage.async_client.get_client(write=True)
+
+    async def hit(self, key, limit, duration, member):
+        """
+        Register the hit if limit is not reached.
+        Returns tuple (allowed, requests, retry_after).
+        """
+        client = await self._client()
+        key = self.storage.make_key(key)
+        args = [int(duration * 1000), limit, member]
+        try:
+            result = await client.evalsha(self.hit_lua_digest, keys=[key], args=args)
+        except Exception as e:
+            if 'NOSCRIPT' not in str(e):
+                raise
+            result = await client.eval(self.hit_lua, keys=[key], args=args)
+        allowed, requests, retry_after = result
+        return bool(allowed), requests, retry_after / 1000.0
+
+    async def undo(self, key, member):
+        client = await self._client()
+        await client.zrem(self.storage.make_key(key), member)
+
+    async def reset(self, key):
+        return await self.storage.adelete(key)
+
+    async def reset_all(self):
+        return await self.storage.aclear()
+
+
+class LocMemSlidingWindow:
+    """
+    Sliding window log stored in process memory.
+    Not shared between processes, used when cache is not redis based
+    and for tests.
+    """
+
+    def __init__(self, clock=time.monotonic, sweep_interval=60):
+        self.clock = clock
+        self.sweep_interval = sweep_interval
+        self.logs = {}
+        # Time when the last hit of the key leaves the window
+        self.expires = {}
+        self._next_sweep = clock() + sweep_interval
+
+    def _remove(self, key):
+        self.logs.pop(key, None)
+        self.expires.pop(key, None)
+
+    def _sweep(self, now):
+        """Remove logs of the keys not hit during their window."""
+        for key, expires in list(self.expires.items()):
+            if expires <= now:
+                self._remove(key)
+        self._next_sweep = now + self.sweep_interval
+
+    async def hit(self, key, limit, duration, member):
+        now = self.clock()
+        if now >= self._next_sweep:
+            self._sweep(now)
+        log = self.logs.get(key) or collections.OrderedDict()
+        while log and next(iter(log.values())) <= now - duration:
+            log.popitem(last=False)
+        if len(log) < limit:
+            log[member] = now
+            self.logs[key] = log
+            self.expires[key] = now + duration
+            return True, len(log), 0
+        if not log:
+            self._remove(key)
+            return False, 0, duration
+        return False, len(log), next(iter(log.values())) + duration - now
+
+    async def undo(self, key, member):
+        log = self.logs.get(key)
+        if log is not None:
+            log.pop(member, None)
+            if not log:
+                self._remove(key)
+
+    async def reset(self, key):
+        self._remove(key)
+
+    async def reset_all(self):
+        self.logs.clear()
+        self.expires.clear()
+
+
+class AsyncRateLimit(RateLimit):
+    """
+    Asynchronous rate limit based on sliding window log.
+    Uses the same configuration as `RateLimit`.
+    """
+
+    def __init__(self, storage):
+        super().__init__(storage)
+        if hasattr(storage, 'async_client'):
+            self.window = RedisSlidingWindow(storage)
+        else:
+            self.window = LocMemSlidingWindow()
+
+    async def check(self, resource_name, resource_key):
+        """
+        Register request to the resource.
+        Returns tuple (allowed, state, member), `allowed` is False
+        if the limit is exceeded and resource is configured as blocking.
+        """
+        rate_requests_max, rate_duration_max = self.config[resource_name]['rate']
+        storage_key = self.build_storage_key(resource_name, resource_key)
+        member = uuid.uuid4().hex
+
+        allowed, rate_requests, retry_after = await self.window.hit(
+            storage_key, rate_requests_max, rate_duration_max, member)
+
+        state = dict(
+            rate_storage_key=storage_key,
+            rate_requests_max=rate_requests_max,
+            rate_duration=rate_duration_max,
+            rate_requests=rate_requests,
+            rate_resource_name=resource_name,
+            rate_resource_key=resource_key,
+            rate_retry_after=retry_after
+        )
+
+        if not allowed:
+            member = None
+            if not self.config[resource_name]['block']:
+                callback = self.config[resource_name]['callback']
+                if callback is not None:
+                    callback(**state)
+                allowed = True
+
+        return allowed, state, member
+
+    def is_configured(self, resource_name):
+        if not RATE_LIMIT_ENABLE or not RATE_LIMIT_CONFIG:
+            if RATE_LIMIT_ENABLE and not RATE_LIMIT_CONFIG:
+                logger.warning('Rate limit is not configured.')
+            return False
+        if resource_name not in self.config:
+            logger.error('Resource `%s` is not configured.' % resource_name)
+            return False
+        return True
+
+    async def limit(self, resource_name, resource_key, func, exceeded):
+        """
+        Execute coroutine function `func` if limit is not exceeded,
+        otherwise `exceeded(state)`.
+        """
+        if not self.is_configured(resource_name):
+            return await func()
+
+        allowed, state, member = await self.check(resource_name, resource_key)
+
+        if not allowed:
+            result = exceeded(state)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        try:
+            return await func()
+        except Exception:
+            # Fallback first then re-raise exception
+            if member is not None:
+                await self.window.undo(state['rate_storage_key'], member)
+            raise
+
+    def __call__(self, resource_name, resource_key, exceeded_callback=None, *args, **kwargs):
+        if exceeded_callback is not None and not callable(exceeded_callback):
+            raise ImproperlyConfigured('Exceeded callback is not callable')
+
+        def exceeded(state):
+            if exceeded_callback is None:
+                raise RateLimitException(state)
+            kwargs.update(state)
+            return exceeded_callback(*args, **kwargs)
+
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*f_args, **f_kwargs):
+                return await self.limit(
+                    resource_name, resource_key,
+                    lambda: func(*f_args, **f_kwargs), exceeded)
+
+            return wrapper
+
+        return decorator
+
+    def handler(self, resource_name, key_func=None):
+        """
+        Decorator for tornado request handler methods.
+        Resource key is client ip address by default.
+        Responds with 429 status code if limit is exceeded.
+        """
+
+        def exceeded(handler, state):
+            # Not raising HTTPError here, because error page
+            # rendering clears Retry-After header.
+            handler.set_status(429)
+            handler.set_header('Retry-After', str(math.ceil(state['rate_retry_after'])))
+            handler.finish()
+
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(handler, *f_args, **f_kwargs):
+                if key_func is None:
+                    resource_key = get_ip(handler.request)
+                else:
+                    resource_key = key_func(handler)
+
+                async def execute():
+                    result = func(handler, *f_args, **f_kwargs)
+                    if inspect.isawaitable(result):
+                        result = await result
+                    return result
+
+                return await self.limit(
+                    resource_name, str(resource_key), execute,
+                    lambda state: exceeded(handler, state))
+
+            return wrapper
+
+        return decorator
+
+    def internal(self, resource_name, key_func=None):
+        """
+        Decorator for internal api methods, must be placed under `@as_internal()`.
+        Resource key is the name of requesting service by default.
+        """
+
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(api, *f_args, **f_kwargs):
+                if key_func is None:
+                    resource_key = f_kwargs.get('service') or ''
+                else:
+                    resource_key = key_func(api, *f_args, **f_kwargs)
+
+                def exceeded(state):
+                    raise RateLimitException(state, 'Rate limit exceeded')
+
+                return await self.limit(
+                    resource_name, str(resource_key),
+                    lambda: func(api, *f_args, **f_kwargs), exceeded)
+
+            return wrapper
+
+        return decorator
+
+    async def reset(self, storage_key):
+        """Reset limits by storage key."""
+        return await self.window.reset(storage_key)
+
+    async def reset_all(self):
+        """Reset all limits."""
+        return await self.window.reset_all()
+
+
+default_async_rate_limit = AsyncRateLimit(storage=cache)
@@ -1,5 +1,5 @@
 from anthill.framework.utils.decorators import method_decorator, retry
-from anthill.framework.utils.asynchronous import as_future, thread_pool_exec as future_exec
+from anthill.framework.utils.asynchronous import bounded_multi
 from anthill.framework.utils import timezone
 from anthill.framework.utils.geoip import GeoIP2
 from anthill.framework.core.servers import BaseService as _BaseService
@@ -11,9 +11,13 @@ from anthill.platform.api.internal import (
     JSONRPCInternalConnection, RequestTimeoutError, RequestError, as_internal)
 from socketio.exceptions import ConnectionError
 from tornado.ioloop import PeriodicCallback
+from tornado.gen import with_timeout
+from tornado.util import TimeoutError
 from functools import partial
 from tornado.web import url
+import datetime
 import logging
+import time
 
 logger = logging.getLogger('anthill.application')
 
@@ -49,7 +53,7 @@ class MasterRole:
     async def get_controllers(self):
         keys = await self.controllers_registry()
         storage = await self.storage()
-        res = await future_exec(storage.get_many, keys=keys)
+        res = await storage.aget_many(keys=keys)
         return list(res.keys())
 
     async def heartbeat_request(self):
@@ -69,7 +73,7 @@ class MasterRole:
         @as_internal()
         async def register_controller(api, controller, metadata, **options):
             storage = await api.service.storage()
-            await future_exec(storage.set, controller, metadata, timeout=None)
+            await storage.aset(controller, metadata, timeout=None)
             logger.info('Controller registered: %s' % controller)
 
     def setup(self):
@@ -315,37 +319,41 @@ class PlainService(BaseService):
 class AdminService(PlainService):
     update_services_meta_period = 5
     update_services_meta = True
+    services_meta_concurrency = 10
+    services_meta_timeout = 3
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if self.update_services_meta:
             self.services_meta_updater = PeriodicCallback(
-                self.set_services_meta, self.update_services_meta_period * 1000)
+                self.update_services_meta_callback, self.update_services_meta_period * 1000)
         else:
             self.services_meta_updater = None
+        self._services_meta_updating = False
 
     def setup(self) -> None:
         self.settings.update(services_meta={})
         self.settings.update(services_all_meta={})
         super().setup()
 
+    async def get_service_metadata(self, name):
+        try:
+            return await self.internal_request(
+                name, method='get_service_metadata', timeout=self.services_meta_timeout)
+        except RequestTimeoutError:
+            pass  # ¯\_(ツ)_/¯
+
     async def get_services_metadata(self, exclude_names=None):
-        services_metadata = []
         exclude_names = exclude_names or []
         try:
             services_names = await self.discovery_request('get_services_names')
         except RequestTimeoutError:
-            pass  # ¯\_(ツ)_/¯
-        else:
-            for name in services_names:
-                if name in exclude_names:
-                    continue
-                try:
-                    metadata = await self.internal_request(name, method='get_service_metadata')
-                    services_metadata.append(metadata)
-                except RequestTimeoutError:
-                    pass  # ¯\_(ツ)_/¯
-        return services_metadata
+            return []
+        services_metadata = await bounded_multi(
+            [partial(self.get_service_metadata, name)
+             for name in services_names if name not in exclude_names],
+            self.services_meta_concurrency)
+        return [metadata for metadata in services_metadata if metadata is not None]
 
     @method_decorator(retry(max_retries=0, delay=3, exception_types=(RequestError,),
                             on_exception=lambda func, e: logger.error('Cannot get services meta. Retry...'), ))
@@ -355,6 +363,16 @@ class AdminService(PlainService):
         self.settings.update(services_meta=services_meta)
         self.settings.update(services_all_meta=services_all_meta)
 
+    async def update_services_meta_callback(self):
+        if self._services_meta_updating:
+            logger.warning('Services meta update is not finished yet. Skipped.')
+            return
+        self._services_meta_updating = True
+        try:
+            await self.set_services_meta()
+        finally:
+            self._services_meta_updating = False
+
     async def on_start(self) -> None:
         await super().on_start()
         await self.set_services_meta()
@@ -377,6 +395,9 @@ class DiscoveryService(BaseService):
     ping_services = True
     ping_max_retries = 1
     ping_timeout = 1
+    # Deadline for all ping attempts to one service
+    ping_deadline = 3
+    ping_concurrency = 10
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -387,6 +408,9 @@ class DiscoveryService(BaseService):
             self.ping_monitor = None
         self.registry = self.app.registry
         self.storage = caches['services']
+        # Last ping latency (ms) per service, None if service is unreachable
+        self.ping_latency = {}
+        self._checking_services = False
 
     async def on_start(self) -> None:
         await super().on_start()
@@ -404,48 +428,69 @@ class DiscoveryService(BaseService):
     async def is_service_alive(self, name):
         internal_request = partial(self.internal_request, name)
         try:
-            response = await internal_request('ping', timeout=self.ping_timeout)
+            response = await internal_request('ping', timeout=self.ping_timeout, caching=False)
             return response['message'] == 'pong'
         except Exception as e:
             logger.error('Service `%s` is unreachable. %s' % (name, str(e)))
             raise
 
+    async def check_service(self, name, services):
+        start = time.time()
+        try:
+            alive = await with_timeout(
+                datetime.timedelta(seconds=self.ping_deadline), self.is_service_alive(name))
+        except TimeoutError:
+            logger.error('Service `%s` is unreachable. Ping deadline exceeded.' % name)
+            alive = False
+        if not alive:
+            self.ping_latency[name] = None
+            await self.remove_service(name)
+        else:
+            self.ping_latency[name] = int((time.time() - start) * 1000)
+            if name not in services:
+                await self.setup_service(name, self.registry[name])
+
     async def check_services(self):
-        for name in self.registry.keys():
-            if name == self.name:
-                # Prevent self pinging
-                continue
-            if not await self.is_service_alive(name):
-                await self.remove_service(name)
-            else:
-                if name not in await self.list_services():
-                    await self.setup_service(name, self.registry[name])
+        if self._checking_services:
+            logger.warning('Services check is not finished yet. Skipped.')
+            return
+        self._checking_services = True
+        try:
+            services = await self.list_services()
+            # Prevent self pinging
+            names = [name for name in self.registry.keys() if name != self.name]
+            await bounded_multi(
+                [partial(self.check_service, name, services) for name in names],
+                self.ping_concurrency)
+        finally:
+            self._checking_services = False
 
     async def setup_services(self, cleanup=False) -> None:
         if cleanup:
             await self.remove_services()
-        self.storage.set_many(self.registry, timeout=None)
+        await self.storage.aset_many(self.registry, timeout=None)
 
     async def remove_services(self) -> None:
-        self.storage.delete_many(keys=self.registry.keys())
+        await self.storage.adelete_many(keys=self.registry.keys())
 
     async def list_services(self) -> list:
         """Returns a list of services names."""
-        return list(self.storage.get_many(keys=self.registry.keys()).keys())
+        services = await self.storage.aget_many(keys=self.registry.keys())
+        return list(services.keys())
 
     async def setup_service(self, name: str, networks: dict) -> None:
-        self.storage.set(name, networks, timeout=None)
+        await self.storage.aset(name, networks, timeout=None)
 
     async def remove_service(self, name: str) -> None:
-        self.storage.delete(name)
+        await self.storage.adelete(name)
 
     async def is_service_exists(self, name: str) -> bool:
-        return name in self.storage
+        return await self.storage.ahas_key(name)
 
     async def get_service(self, name: str, networks: list = None) -> dict:
         if not await self.is_service_exists(name):
             raise ServiceDoesNotExist(name)
-        return dict_filter(self.storage.get(name), keys=networks)
+        return dict_filter(await self.storage.aget(name), keys=networks)
 
     async def get_services(self) -> dict:
-        return self.storage.get_many(keys=self.registry.keys())
+        return await self.storage.aget_many(keys=self.registry.keys())
@@ -49,3 +49,8 @@ async def set_service_bulk(api: InternalAPI, name: str, networks: dict, **option
 @as_internal()
 async def remove_service(api: InternalAPI, name: str, **options) -> None:
     await api.service.remove_service(name)
+
+
+@as_internal()
+async def get_services_ping_latency(api: InternalAPI, **options) -> dict:
+    return api.service.ping_latency
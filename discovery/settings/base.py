@@ -41,7 +41,7 @@ CACHES["default"]["LOCATION"] = "redis://localhost:6379/12"
 CACHES["default"]["KEY_PREFIX"] = "discovery.anthill"
 
 CACHES['services'] = {
-    "BACKEND": "anthill.framework.core.cache.backends.redis.cache.RedisCache",
+    "BACKEND": "anthill.framework.core.cache.backends.redis.cache.AsyncRedisCache",
     "LOCATION": "redis://localhost:6379/12",
     "OPTIONS": {
         "CLIENT_CLASS": "anthill.framework.core.cache.backends.redis.client.DefaultClient",
@@ -5,6 +5,7 @@ from anthill.framework.utils import timezone
 from anthill.framework.utils.asynchronous import as_future
 from anthill.framework.utils.translation import translate as _
 from anthill.platform.api.internal import InternalAPIMixin
+from anthill.platform.auth import RemoteUser
 from anthill.platform.core.celery import app as celery_app
 from anthill.platform.core.celery.beatsqlalchemy.models import PeriodicTask, CrontabSchedule
 from sqlalchemy_utils.types import JSONType, UUIDType, ChoiceType
@@ -114,25 +115,25 @@ class Event(db.Model):
         if self.finish_at >= timezone.now():
             return self.finish_at - timezone.now()
 
+    async def get_users(self) -> list:
+        users = await RemoteUser.load_many([p.user_id for p in self.participations])
+        return [user for user in users if user is not None]
+
     async def on_start(self) -> None:
-        # TODO: bulk get_users request
-        for p in self.participations:
-            user = await p.get_user()
-            msg = {
-                'type': EventStatus.STARTED.name,
-                'data': self.dumps()
-            }
+        msg = {
+            'type': EventStatus.STARTED.name,
+            'data': self.dumps()
+        }
+        for user in await self.get_users():
             await user.send_message(message=json.dumps(msg),
                                     content_type='application/json')
 
     async def on_finish(self) -> None:
-        # TODO: bulk get_users request
-        for p in self.participations:
-            user = await p.get_user()
-            msg = {
-                'type': EventStatus.FINISHED.name,
-                'data': self.dumps()
-            }
+        msg = {
+            'type': EventStatus.FINISHED.name,
+            'data': self.dumps()
+        }
+        for user in await self.get_users():
             await user.send_message(message=json.dumps(msg),
                                     content_type='application/json')
 
@@ -244,8 +245,8 @@ class EventParticipation(InternalAPIMixin, db.Model):
         await user.send_message(message=json.dumps(msg),
                                 content_type='application/json')
 
-    async def get_user(self):
-        return await self.internal_request('login', 'get_user', user_id=self.user_id)
+    async def get_user(self) -> RemoteUser:
+        return await RemoteUser.load(self.user_id)
 
 
 @listens_for(EventParticipation.status, 'set', active_history=True)
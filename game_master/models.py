@@ -82,8 +82,7 @@ class Player(InternalAPIMixin, db.Model):
     payload = db.Column(JSONType, nullable=False, default={})
 
     async def get_user(self) -> RemoteUser:
-        data = await self.internal_request('login', 'get_user', user_id=self.user_id)
-        return RemoteUser(**data)
+        return await RemoteUser.load(self.user_id)
 
 
 class GeoLocationRegion(db.Model):
@@ -28,10 +28,17 @@ def request_profile():
 @as_internal()
 async def get_user(api: InternalAPI, user_id: str, **options) -> Optional[dict]:
     query = User.query.filter_by(user_id=user_id)
-    user = await future_exec(query.one)
+    user = await thread_pool_exec(query.one)
     return user.dump()
 
 
+@as_internal()
+async def get_users(api: InternalAPI, user_ids: list, **options) -> list:
+    query = User.query.filter(User.id.in_(user_ids))
+    users = await thread_pool_exec(query.all)
+    return User.dump_many(users)
+
+
 @as_internal()
 async def authenticate(api: InternalAPI, credentials: dict, **options) -> dict:
     user = await _authenticate(request=None, **credentials)
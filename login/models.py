@@ -9,6 +9,16 @@ from anthill.platform.core.messenger.settings import messenger_settings
 
 class User(InternalAPIMixin, AbstractUser):
     __tablename__ = 'user'
+    # Changes are published to other services on every save.
+    publish_changes_on_save = True
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Make all services to drop cached remote user, so session
+        # verification is not done against outdated password hash.
+        self.internal_connection.broadcast_threadsafe(
+            'invalidate_remote_model', model_name='login.User', data=self.dump())
+        return self
 
     async def get_profile(self):
         return await self.internal_request('profile', 'get_profile', user_id=self.id)
@@ -88,8 +88,7 @@ class MessageStatus(InternalAPIMixin, db.Model):
         return partial(self.internal_request, 'login', 'get_user')
 
     async def get_receiver(self) -> RemoteUser:
-        data = await self.request_user(user_id=self.receiver_id)
-        return RemoteUser(**data)
+        return await RemoteUser.load(self.receiver_id)
 
 
 class MessageReaction(InternalAPIMixin, db.Model):
@@ -108,8 +107,7 @@ class MessageReaction(InternalAPIMixin, db.Model):
         return partial(self.internal_request, 'login', 'get_user')
 
     async def get_user(self) -> RemoteUser:
-        data = await self.request_user(user_id=self.user_id)
-        return RemoteUser(**data)
+        return await RemoteUser.load(self.user_id)
 
 
 class Message(InternalAPIMixin, db.Model):
@@ -136,8 +134,7 @@ class Message(InternalAPIMixin, db.Model):
         return partial(self.internal_request, 'login', 'get_user')
 
     async def get_sender(self) -> RemoteUser:
-        data = await self.request_user(user_id=self.sender_id)
-        return RemoteUser(**data)
+        return await RemoteUser.load(self.sender_id)
 
     @classmethod
     @as_future
@@ -247,8 +244,7 @@ class GroupMembership(InternalAPIMixin, db.Model):
         return partial(self.internal_request, 'login', 'get_user')
 
     async def get_receiver(self) -> RemoteUser:
-        data = await self.request_user(user_id=self.user_id)
-        return RemoteUser(**data)
+        return await RemoteUser.load(self.user_id)
 
 
 @as_future
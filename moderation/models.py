@@ -45,12 +45,10 @@ class BaseModerationAction(InternalAPIMixin, db.Model):
         return partial(self.internal_request, 'login', 'get_user')
 
     async def get_user(self) -> RemoteUser:
-        data = await self.request_user(user_id=self.user_id)
-        return RemoteUser(**data)
+        return await RemoteUser.load(self.user_id)
 
     async def get_moderator(self) -> RemoteUser:
-        data = await self.request_user(user_id=self.moderator_id)
-        return RemoteUser(**data)
+        return await RemoteUser.load(self.moderator_id)
 
     @as_future
     def turn_on(self, commit: bool = False) -> None: